@@ -1,7 +1,7 @@
 # C:\Users\SAMEER LOHANI\samaysudarshan-v2\backend\app.py
 # FINAL UPDATED VERSION (GA integrated via timetable_ga + JWT expiry + robust room-type)
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
 import mysql.connector
 from mysql.connector import Error
@@ -11,18 +11,52 @@ from flask_jwt_extended import (
     get_jwt, get_jwt_identity
 )
 from typing import Dict, Any
-from datetime import timedelta
+from datetime import datetime, timedelta
+import itertools
 import random
+import threading
+import time
 import os
 
 # --- DB connection helper ---
-from db_connector import get_db_connection
+from db_connector import (
+    get_db_connection, begin_request, request_write_time, recent_write, served_by_replica
+)
+
+# --- GA run history store ---
+from run_history import record_run, query_runs
 
 # --- Clean GA integration (NEW) ---
-from timetable_ga import (
-    run_ga, GAInput, Gene, Subject, Section, Room, Faculty, chromosome_to_rows
+from timetable_ga import run_ga, run_portfolio, chromosome_to_rows
+from timetable_ga.adaptive import summarize_trajectory
+from timetable_ga.encoder import chromosome_from_tuples
+from timetable_ga.fingerprint import input_fingerprint
+from timetable_ga.occupancy import build_occupancy
+from timetable_ga.presets import preset_for
+from services.ga_input import get_ga_input, invalidate_ga_input, probe_schema, GAInputError
+from services.bulk_import import (
+    ENTITIES, MAX_REPORTED_ERRORS, detect_format, iter_records, validate_rows, check_references,
+    insert_rows, normalize_room_type
+)
+from services.timetable_export import (
+    GROUPINGS, export_rows, stream_ndjson, stream_csv, stream_ical,
+    SECTION_TIMETABLE_SQL, DEPT_BATCH_TIMETABLE_SQL,
+)
+from migrations import apply_migrations
+from services.occupancy import occupancy_store, save_occupancy
+from services.timetable_grid import section_grids, GridError
+from services.timetable_versions import (
+    ensure_schema, create_version, write_entries, publish_version, published_version,
+    published_version_id, publishable, list_versions, gc_versions, GENERATE_LOCK_NAME,
 )
 
+# --- GA result cache ---
+from result_cache import cache_key, get_cached, put_cached
+
+# --- GET response cache ---
+from read_cache import read_cache, body_etag
+from single_flight import SingleFlight
+
 # -------------------------
 # APP INIT
 # -------------------------
@@ -44,6 +78,56 @@ app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=8)
 bcrypt = Bcrypt(app)
 jwt = JWTManager(app)
 
+# -------------------------
+# STARTUP SCHEMA PROBES
+# -------------------------
+_schema_ready = False
+_schema_lock = threading.Lock()
+SCHEMA_RETRY_SECONDS = float(os.environ.get("SCHEMA_RETRY_SECONDS", 5))
+_schema_next_try = 0.0
+
+def _ensure_migrated(lock_wait=120):
+    """
+    Run the optional-schema probes and pending migrations until they succeed once in
+    this process: at startup, then again before requests (at most every
+    SCHEMA_RETRY_SECONDS) if the DB was down or another worker held the lock.
+    """
+    global _schema_ready, _schema_next_try
+    if _schema_ready or time.monotonic() < _schema_next_try:
+        return
+    if not _schema_lock.acquire(blocking=False):
+        return   # another thread is already trying
+    conn = cursor = None
+    try:
+        _schema_next_try = time.monotonic() + SCHEMA_RETRY_SECONDS
+        conn = get_db_connection()
+        if conn is None:
+            return
+        cursor = conn.cursor(dictionary=True)
+        probe_schema(cursor)
+        apply_migrations(conn, lock_wait=lock_wait)   # versioned timetable tables + read indexes (migrations.py)
+        _schema_ready = True
+    except (Error, RuntimeError) as e:
+        print(f"Schema probe failed (will retry): {e}")
+    finally:
+        if cursor: cursor.close()
+        if conn: conn.close()
+        _schema_lock.release()
+
+_ensure_migrated()
+
+@app.before_request
+def _retry_migrations():
+    _ensure_migrated(lock_wait=5)   # no-op once migrated; short wait on the request path
+
+# Read-your-writes across worker processes (db_connector.py): the client echoes the
+# X-Last-Write time of its last write, so reads stay on the primary for the window.
+LAST_WRITE_HEADER = "X-Last-Write"
+
+@app.before_request
+def _read_your_writes():
+    begin_request(request.headers.get(LAST_WRITE_HEADER))
+
 # -------------------------
 # AUTH HELPERS
 # -------------------------
@@ -57,6 +141,44 @@ def check_admin_access():
     except Exception:
         return jsonify({"msg": "Authentication required."}), 401
 
+# -------------------------
+# READ CACHE HELPERS
+# -------------------------
+def _conditional_json(body, etag):
+    """200 JSON response with an ETag, or 304 Not Modified when If-None-Match already has it."""
+    resp = app.response_class(body, status=200, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "private, no-cache"   # clients keep it but revalidate each time
+    return resp.make_conditional(request)
+
+def _cached_json(namespace, key):
+    """Cached body as a conditional JSON response, or None on a miss (no DB work of its own)."""
+    if recent_write():
+        return None   # inside this client's read-your-writes window: the entry may predate its write
+    hit = read_cache.get(namespace, key)
+    if hit is None:
+        return None
+    return _conditional_json(*hit)
+
+def _json_cached(namespace, key, generation, payload, tag=""):
+    """
+    Serialize payload like jsonify, keep it for the next reader and answer conditionally.
+    Replica rows are only kept under a version tag (see _timetable_key): the replica
+    may lag behind writes made through other workers, which this process can't see.
+    """
+    body = jsonify(payload).get_data()
+    if served_by_replica() and not tag:
+        return _conditional_json(body, body_etag(body))   # answer, but don't keep it for others
+    return _conditional_json(body, read_cache.put(namespace, key, body, generation, tag))
+
+def _timetable_key(cursor, key):
+    """
+    (cache key, ETag tag) for a timetable entry, scoped to the published version read
+    through `cursor` (one primary-key read), so no worker serves a superseded timetable.
+    """
+    tag = f"v{published_version_id(cursor)}-"
+    return tag + key, tag
+
 # -------------------------
 # JWT ERROR CALLBACKS
 # -------------------------
@@ -190,6 +312,8 @@ def add_subject():
         """
         cursor.execute(insert_sql, (subject_code, subject_name, lecture_count, department_id, subj_type, contiguous_size))
         conn.commit()
+        invalidate_ga_input()
+        read_cache.invalidate("subjects")
         new_id = cursor.lastrowid
         return jsonify({"status": "success", "message": "Subject added successfully", "subject_id": new_id}), 201
 
@@ -236,6 +360,8 @@ def add_faculty():
         """
         cursor.execute(insert_sql, (faculty_name, faculty_id_code, designation, email, dept_id_str, max_load_int))
         conn.commit()
+        invalidate_ga_input()
+        read_cache.invalidate("faculty")
         return jsonify({"status": "success", "message": "Faculty added successfully", "faculty_id": cursor.lastrowid}), 201
 
     except Error as e:
@@ -268,14 +394,8 @@ def add_room():
     except (TypeError, ValueError):
         return jsonify({"msg": "capacity must be an integer."}), 422
 
-    # ✅ Robust room type normalization
-    rt_in = str(room_type or "").strip().upper()
-    if "LAB" in rt_in:
-        room_type_db = "LAB"
-    elif "LECTURE" in rt_in or "THEORY" in rt_in or "LEC" in rt_in:
-        room_type_db = "LECTURE"
-    else:
-        room_type_db = "LECTURE"
+    # ✅ Robust room type normalization (shared with bulk import)
+    room_type_db = normalize_room_type(room_type)
 
     is_available_db = 1 if bool(is_available) else 0
 
@@ -286,6 +406,7 @@ def add_room():
         sql_query = "INSERT INTO rooms_classroom (room_name, capacity, room_type, is_available) VALUES (%s, %s, %s, %s)"
         cursor.execute(sql_query, (room_name, capacity, room_type_db, is_available_db))
         conn.commit()
+        invalidate_ga_input()
         return jsonify({"status": "success", "message": f"Room '{room_name}' added!", "room_id": cursor.lastrowid}), 201
 
     except Error as e:
@@ -317,6 +438,8 @@ def add_section():
         query = "INSERT INTO sections (section_name, dept_id, student_count) VALUES (%s, %s, %s)"
         cursor.execute(query, (section_name, str(dept_id), int(student_count)))
         conn.commit()
+        invalidate_ga_input()
+        read_cache.invalidate("sections")
         return jsonify({"status": "success", "message": f"Section '{section_name}' added!"}), 201
     except Error as e:
         print(f"Section Add Error: {e}")
@@ -344,6 +467,7 @@ def assign_curriculum():
         query = "INSERT INTO curriculum (section_id, subject_id, faculty_id) VALUES (%s, %s, %s)"
         cursor.execute(query, (int(section_id), int(subject_id), int(faculty_id)))
         conn.commit()
+        invalidate_ga_input()
         return jsonify({"status": "success", "message": "Curriculum assigned successfully!"}), 201
     except Error as e:
         print(f"Curriculum Assign Error: {e}")
@@ -355,12 +479,83 @@ def assign_curriculum():
         if conn: conn.close()
 
 # --- Dropdown GETs ---
+# ---------------------------------------------
+# --- BULK IMPORT (CSV / NDJSON / JSON) ---
+# ---------------------------------------------
+# read-cache namespaces each import can change
+IMPORT_INVALIDATES = {"subjects": ("subjects",), "faculty": ("faculty",), "sections": ("sections",)}
+
+@app.route('/api/v1/import/<string:entity>', methods=['POST'])
+@jwt_required()
+def bulk_import(entity):
+    """
+    Import many subjects/faculty/rooms/sections/curriculum rows in one request.
+    Body: a multipart 'file' upload or the raw CSV / NDJSON / JSON array.
+    All-or-nothing by default: any invalid row -> 422 with per-row errors and
+    nothing written. ?partial=1 writes the valid rows anyway; ?dry_run=1 only validates.
+    """
+    auth_check = check_admin_access()
+    if auth_check: return auth_check
+    if entity not in ENTITIES:
+        return jsonify({"msg": f"Unknown import type '{entity}'. Use one of: {', '.join(ENTITIES)}."}), 404
+    partial = request.args.get('partial', '0').lower() in ('1', 'true', 'yes')
+    dry_run = request.args.get('dry_run', '0').lower() in ('1', 'true', 'yes')
+
+    upload = request.files.get('file')
+    if upload is not None:
+        stream, fmt = upload.stream, detect_format(upload.mimetype, upload.filename)
+    else:
+        stream, fmt = request.stream, detect_format(request.mimetype)
+    fmt = request.args.get('format', fmt)
+
+    t0 = time.monotonic()
+    try:
+        rows, errors, total = validate_rows(entity, iter_records(stream, fmt))
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({"status": "error", "msg": f"Could not parse {fmt.upper()} input: {e}"}), 400
+
+    conn = None; cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return jsonify({"msg": "Database connection failed."}), 500
+        cursor = conn.cursor()
+        rows, ref_errors = check_references(cursor, entity, rows)
+        errors = sorted(errors + ref_errors, key=lambda e: e["row"])
+        report = {
+            "entity": entity, "format": fmt, "rows": total, "valid": len(rows), "invalid": len(errors),
+            "errors": errors[:MAX_REPORTED_ERRORS], "errors_truncated": len(errors) > MAX_REPORTED_ERRORS,
+        }
+        if errors and not partial:
+            return jsonify({"status": "error", "msg": "Validation failed; nothing was imported.", **report}), 422
+        if dry_run or not rows:
+            return jsonify({"status": "success", "inserted": 0, "dry_run": dry_run, **report}), 200
+
+        inserted = insert_rows(cursor, entity, [values for _row, values in rows])
+        conn.commit()
+        invalidate_ga_input()
+        read_cache.invalidate(*IMPORT_INVALIDATES.get(entity, ()))
+        report["elapsed"] = round(time.monotonic() - t0, 3)
+        return jsonify({"status": "success", "inserted": inserted, **report}), 201
+    except Error as e:
+        if conn: conn.rollback()
+        print(f"Bulk Import Error ({entity}): {e}")
+        if getattr(e, "errno", None) == 1062:
+            return jsonify({"status": "error", "msg": f"Duplicate entry; nothing was imported. {e}"}), 409
+        return jsonify({"status": "error", "msg": f"Import failed and was rolled back. DB Error: {e}"}), 500
+    finally:
+        if cursor: cursor.close()
+        if conn: conn.close()
+
 @app.route('/api/v1/sections', methods=['GET'])
 @jwt_required()
 def get_sections():
+    cached = _cached_json("sections", "all")
+    if cached: return cached
+    generation = read_cache.generation("sections")
     conn = None; cursor = None
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor(dictionary=True)
         # ✅ dept_id bhi bhejo; DataGrid ke liye 'id' bhi set kar do
         cursor.execute("""
@@ -371,7 +566,7 @@ def get_sections():
         rows = cursor.fetchall()
         for r in rows:
             r['id'] = r['section_id']       # DataGrid friendly
-        return jsonify(rows), 200
+        return _json_cached("sections", "all", generation, rows)
     except Error as e:
         print(f"/api/v1/sections error: {e}")
         return jsonify({"message": f"DB Error: {e}"}), 500
@@ -382,9 +577,12 @@ def get_sections():
 @app.route('/api/v1/subjects', methods=['GET'])
 @jwt_required()
 def get_subjects():
+    cached = _cached_json("subjects", "all")
+    if cached: return cached
+    generation = read_cache.generation("subjects")
     conn = None; cursor = None
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor(dictionary=True)
         query = """
             SELECT 
@@ -403,7 +601,7 @@ def get_subjects():
         results = cursor.fetchall()
         for row in results:
             row['id'] = row['subject_id']
-        return jsonify(results)
+        return _json_cached("subjects", "all", generation, results)
     except Error as e:
         print(f"Get Subjects Error: {e}")
         return jsonify({"message": "Failed to fetch subjects"}), 500
@@ -414,30 +612,22 @@ def get_subjects():
 @app.route('/api/timetable/section/<int:section_id>', methods=['GET'])
 @jwt_required()
 def get_timetable_by_section(section_id):
+    """Flat rows, or ?format=grid for the pre-rendered weekly grid (services/timetable_grid.py)."""
     claims = get_jwt()
     if claims.get('role') not in ['Admin', 'Faculty', 'Student']:
         return jsonify({"msg": "Authorization failed. Role not permitted."}), 403
+    if request.args.get('format') == 'grid':
+        return _grid_response(section_id)
     conn = None; cursor = None
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor(dictionary=True)
-        sql = """
-        SELECT
-            TS.day_of_week,
-            TIME_FORMAT(TS.start_time, '%%H:%%i') AS start_time,
-            TIME_FORMAT(TS.end_time, '%%H:%%i') AS end_time,
-            SUB.subject_code, SUB.subject_name, FAC.name AS faculty_name,
-            CR.room_name, CR.room_type
-        FROM timetable_timetableentry AS TTE
-        JOIN timetable_subject AS SUB ON TTE.subject_id = SUB.subject_id
-        JOIN faculty_faculty AS FAC ON TTE.faculty_id = FAC.faculty_id
-        JOIN rooms_classroom AS CR ON TTE.classroom_id = CR.room_id
-        JOIN timetable_timeslot AS TS ON TTE.time_slot_id = TS.slot_id
-        WHERE TTE.student_batch_id = %s
-        ORDER BY FIELD(TS.day_of_week,'MONDAY','TUESDAY','WEDNESDAY','THURSDAY','FRIDAY','SATURDAY'), TS.start_time;
-        """
-        cursor.execute(sql, (section_id,))
-        return jsonify(cursor.fetchall()), 200
+        key, tag = _timetable_key(cursor, f"section/{section_id}")
+        cached = _cached_json("timetable", key)
+        if cached: return cached
+        generation = read_cache.generation("timetable")
+        cursor.execute(SECTION_TIMETABLE_SQL, (section_id,))
+        return _json_cached("timetable", key, generation, cursor.fetchall(), tag)
     except Error as e:
         print(f"Timetable fetch error: {e}")
         return jsonify({"error": "Failed to fetch timetable data"}), 500
@@ -445,16 +635,173 @@ def get_timetable_by_section(section_id):
         if cursor: cursor.close()
         if conn: conn.close()
 
+def _grid_response(section_id, dept_id=None):
+    """Cached weekly grid for one section (warmed for every section by generate_timetable)."""
+    conn = None; cursor = None
+    try:
+        conn = get_db_connection(read_only=True)
+        if conn is None:
+            return jsonify({"error": "Database connection failed"}), 500
+        cursor = conn.cursor(dictionary=True)
+        key, tag = _timetable_key(
+            cursor, f"grid/section/{section_id}" if dept_id is None else f"grid/{dept_id}/{section_id}")
+        cached = _cached_json("timetable", key)
+        if cached: return cached
+        generation = read_cache.generation("timetable")
+        grid = section_grids(cursor, section_id=section_id, dept_id=dept_id)[int(section_id)]
+        return _json_cached("timetable", key, generation, grid, tag)
+    except GridError as e:
+        return jsonify({"error": str(e)}), 503
+    except Error as e:
+        print(f"Timetable grid error: {e}")
+        return jsonify({"error": "Failed to fetch timetable data"}), 500
+    finally:
+        if cursor: cursor.close()
+        if conn: conn.close()
+
+# ---------------------------------------------
+# --- FACULTY / ROOM OCCUPANCY (services/occupancy.py) ---
+# ---------------------------------------------
+def _occupancy_view():
+    """(view, None) for the published timetable, or (None, error response)."""
+    claims = get_jwt()
+    if claims.get('role') not in ['Admin', 'Faculty', 'Student']:
+        return None, (jsonify({"msg": "Authorization failed. Role not permitted."}), 403)
+    generation = read_cache.generation("timetable")
+    view = occupancy_store.fresh(generation)
+    if view is not None:
+        return view, None
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return None, (jsonify({"error": "Database connection failed"}), 500)
+        ensure_schema(conn)
+        view = occupancy_store.load(conn, generation)
+        if view is None:
+            return None, (jsonify({"msg": "No timetable has been published yet."}), 404)
+        return view, None
+    except (Error, ValueError) as e:
+        print(f"Occupancy load error: {e}")
+        return None, (jsonify({"error": "Failed to load timetable occupancy"}), 500)
+    finally:
+        if conn: conn.close()
+
+@app.route('/api/v1/timetable/faculty/<int:faculty_id>', methods=['GET'])
+@jwt_required()
+def get_faculty_timetable(faculty_id):
+    """Where a faculty member teaches this week (published timetable), in day/period order."""
+    view, err = _occupancy_view()
+    if err: return err
+    return jsonify(view.faculty_timetable(faculty_id)), 200
+
+@app.route('/api/v1/timetable/room/<int:room_id>', methods=['GET'])
+@jwt_required()
+def get_room_timetable(room_id):
+    """What runs in a room this week (published timetable), in day/period order."""
+    view, err = _occupancy_view()
+    if err: return err
+    return jsonify(view.room_timetable(room_id)), 200
+
+@app.route('/api/v1/rooms/free', methods=['GET'])
+@jwt_required()
+def get_free_rooms():
+    """
+    Rooms with nothing scheduled at ?day= (name like TUESDAY, or 1-based number) and
+    ?period= (1-based) for ?span= consecutive periods (default 1). Optional ?type=LAB|LECTURE
+    and ?min_capacity=. Smallest fitting room first.
+    """
+    view, err = _occupancy_view()
+    if err: return err
+    try:
+        day = view.day_index(request.args['day'])
+        period = int(request.args['period']) - 1
+        span = int(request.args.get('span', 1))
+        min_capacity = int(request.args.get('min_capacity', 0))
+    except (KeyError, ValueError):
+        return jsonify({"msg": "day and period are required; period, span and min_capacity must be integers."}), 422
+    if day is None:
+        return jsonify({"msg": f"Unknown day. Use one of {view.day_names} or 1-{len(view.day_names)}."}), 422
+    rtype = normalize_room_type(request.args['type']) if request.args.get('type') else None
+    rooms = view.free_rooms(day, period, span, rtype, min_capacity)
+    return jsonify({"day_of_week": view.day_names[day] if 0 <= day < len(view.day_names) else None,
+                    "period": period + 1, "span": span, "version_id": view.version_id,
+                    "count": len(rooms), "rooms": rooms}), 200
+
+# ---------------------------------------------
+# --- WHOLE-CAMPUS EXPORT (streamed) ---
+# ---------------------------------------------
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv", "ics": "text/calendar"}
+
+@app.route('/api/v1/export/timetable', methods=['GET'])
+@jwt_required()
+def export_timetable():
+    """
+    Published timetable for every section (or ?by=faculty / ?by=room), read in keyset
+    pages and streamed chunk by chunk. ?format=ndjson|csv|ics, optional ?id= for a single
+    entity, ?week_of=YYYY-MM-DD anchors the iCalendar events (default: this week).
+    """
+    claims = get_jwt()
+    if claims.get('role') not in ['Admin', 'Faculty', 'Student']:
+        return jsonify({"msg": "Authorization failed. Role not permitted."}), 403
+    fmt = request.args.get('format', 'ndjson').lower()
+    by = request.args.get('by', 'section').lower()
+    if fmt not in EXPORT_MIMETYPES or by not in GROUPINGS:
+        return jsonify({"msg": f"format must be one of {sorted(EXPORT_MIMETYPES)} and by one of {sorted(GROUPINGS)}."}), 422
+    try:
+        entity_id = int(request.args['id']) if request.args.get('id') else None
+        week_of = request.args.get('week_of')
+        anchor = datetime.strptime(week_of, "%Y-%m-%d").date() if week_of else datetime.utcnow().date()
+    except ValueError:
+        return jsonify({"msg": "id must be an integer and week_of a YYYY-MM-DD date."}), 422
+    week_start = anchor - timedelta(days=anchor.weekday())
+
+    def connect():
+        conn = get_db_connection(read_only=True)
+        if conn is None:
+            raise Error("Database connection failed")
+        return conn
+
+    # one short query per FETCH_CHUNK rows, each on a freshly borrowed connection
+    rows = export_rows(connect, by, entity_id)
+    try:
+        first = next(rows, None)   # surface DB errors as a 500 before the response starts
+    except Error as e:
+        print(f"Export query error: {e}")
+        return jsonify({"error": "Failed to export timetable data"}), 500
+    if first is not None:
+        rows = itertools.chain([first], rows)
+
+    if fmt == "ndjson":
+        body = stream_ndjson(rows)
+    elif fmt == "csv":
+        body = stream_csv(rows)
+    else:
+        body = stream_ical(rows, by, week_start, datetime.utcnow().strftime("%Y%m%dT%H%M%SZ"))
+
+    def generate():
+        try:
+            yield from body
+        except Error as e:
+            print(f"Export stream error: {e}")
+
+    filename = f"timetable-{by}{'-' + str(entity_id) if entity_id is not None else ''}.{fmt}"
+    return Response(stream_with_context(generate()), mimetype=EXPORT_MIMETYPES[fmt],
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
 @app.route('/api/v1/faculty', methods=['GET'])
 @jwt_required()
 def get_faculty():
+    cached = _cached_json("faculty", "all")
+    if cached: return cached
+    generation = read_cache.generation("faculty")
     conn = None; cursor = None
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor(dictionary=True)
         cursor.execute("SELECT faculty_id, name, faculty_id_code FROM faculty_faculty ORDER BY name")
         results = cursor.fetchall()
-        return jsonify(results)
+        return _json_cached("faculty", "all", generation, results)
     except Error as e:
         return jsonify({"message": f"DB Error: {e}"}), 500
     finally:
@@ -464,273 +811,370 @@ def get_faculty():
 # ---------------------------------------------
 # --- GA TIMETABLE GENERATION ---
 # ---------------------------------------------
+# Concurrent generate calls with the same input, solver params and seed share one
+# run and one response (single flight, per process). Every run, in any worker, holds
+# the MySQL named lock GENERATE_LOCK_NAME while it solves and saves; a different
+# run arriving meanwhile waits up to queue_wait seconds (body option, default
+# GA_GENERATE_QUEUE_WAIT = 0) for it and is then rejected with 409.
+generate_flight = SingleFlight()
+# upper bounds for the body options portfolio_runs and queue_wait (seconds)
+MAX_PORTFOLIO_RUNS = int(os.environ.get("GA_MAX_PORTFOLIO_RUNS", 8))
+MAX_QUEUE_WAIT = float(os.environ.get("GA_MAX_QUEUE_WAIT", 300))
+
 @app.route('/api/v1/generate_timetable', methods=['POST'])
 @jwt_required()
 def generate_timetable():
     auth_check = check_admin_access()
     if auth_check:
         return auth_check
+
+    # Optional solver options (body may be empty: frontend posts {})
+    opts = request.get_json(silent=True) or {}
+    try:
+        portfolio_runs = int(opts.get("portfolio_runs") or os.environ.get("GA_PORTFOLIO_RUNS", 1))
+        time_limit = opts.get("time_limit") or os.environ.get("GA_TIME_LIMIT")
+        time_limit = float(time_limit) if time_limit else None
+        seed = int(opts["seed"]) if opts.get("seed") is not None else None
+        queue_wait = float(opts.get("queue_wait") or os.environ.get("GA_GENERATE_QUEUE_WAIT", 0))
+    except (TypeError, ValueError):
+        return jsonify({"msg": "portfolio_runs and seed must be integers, time_limit and queue_wait numbers (seconds)."}), 422
+    # request-supplied knobs are bounded: each portfolio run is a process, and a waiting
+    # request holds a worker thread (and the lock connection) for queue_wait seconds
+    portfolio_runs = min(max(1, portfolio_runs), MAX_PORTFOLIO_RUNS)
+    queue_wait = min(max(0.0, queue_wait), MAX_QUEUE_WAIT)
+    # force=true (body) or ?force=1 skips the result cache and always reruns the GA
+    force = str(opts.get("force") or request.args.get("force", "")).lower() in ("1", "true", "yes")
+
     conn = None
     cursor = None
+    t_start = time.monotonic()
     try:
         conn = get_db_connection()
         if conn is None:
             return jsonify({"msg": "GA Error: Database connection failed."}), 500
         cursor = conn.cursor(dictionary=True)
+        try:
+            data = get_ga_input(cursor)   # process-level cache, see services/ga_input.py
+        except GAInputError as e:
+            return jsonify({"status": "error", "msg": str(e)}), 400
+    except Error as e:
+        print(f"GA Generation Failed (MySQL Error): {e}")
+        return jsonify({"status": "error", "msg": f"Timetable generation failed. DB Error: {e}"}), 500
+    finally:
+        # callers that end up waiting on another run must not hold a pooled connection meanwhile
+        if cursor: cursor.close()
+        if conn: conn.close()
 
-        # ----------------------------
-        # sections
-        # ----------------------------
-        cursor.execute("SELECT section_id, section_name, student_count FROM sections")
-        sec_rows = cursor.fetchall()
-        sections = {
-            r['section_id']: Section(r['section_id'], r['section_name'], int(r['student_count']))
-            for r in sec_rows
-        }
-
-        # ----------------------------
-        # subjects (derive type + block if missing)
-        # ----------------------------
-        cursor.execute("""
-            SELECT 
-                subject_id,
-                COALESCE(lecture_count, 0) AS lecture_count,
-                UPPER(COALESCE(subject_code, '')) AS s_code,
-                UPPER(COALESCE(subject_name, '')) AS s_name,
-                UPPER(COALESCE(type, '')) AS s_type,
-                COALESCE(contiguous_block_size, 0) AS csize
-            FROM timetable_subject
-        """)
-        sub_rows = cursor.fetchall()
-
-        LAB_HINTS = ("LAB", "PRACTICAL", "PRAC", "PR", "WORKSHOP", "WS")
-
-        def _derive(sub):
-            if sub["s_type"] == "LAB":
-                dtype = "LAB"
-            elif sub["s_type"] == "THEORY":
-                dtype = "THEORY"
-            else:
-                text = f'{sub["s_code"]} {sub["s_name"]}'
-                if any(h in text for h in LAB_HINTS) or int(sub["csize"] or 0) >= 2:
-                    dtype = "LAB"
-                else:
-                    dtype = "THEORY"
-            csize = int(sub["csize"] or 0)
-            if csize <= 0:
-                csize = 2 if dtype == "LAB" else 1
-            return dtype, csize
-
-        subjects = {}
-        for r in sub_rows:
-            dtype, csize = _derive(r)
-            subjects[r["subject_id"]] = Subject(
-                subject_id=r["subject_id"],
-                lecture_count=int(r["lecture_count"]),
-                subj_type=dtype,
-                contiguous_block_size=int(csize)
-            )
-
-        # LAB feasibility quick check
-        for s in subjects.values():
-            if s.subj_type == 'LAB' and (s.lecture_count % s.contiguous_block_size != 0):
-                return jsonify({
-                    "status": "error",
-                    "msg": (
-                        f"Invalid LAB config for subject_id={s.subject_id}: "
-                        f"lecture_count ({s.lecture_count}) must be multiple of "
-                        f"contiguous_block_size ({s.contiguous_block_size})."
-                    )
-                }), 400
-
-        # ----------------------------
-        # rooms
-        # ----------------------------
-        cursor.execute("""
-            SELECT room_id, UPPER(room_type) AS room_type, capacity
-            FROM rooms_classroom
-            WHERE is_available = 1
-        """)
-        room_rows = cursor.fetchall()
-
-        def _norm_room(rt: str) -> str:
-            if not rt:
-                return 'LECTURE'
-            u = rt.upper()
-            return 'LAB' if 'LAB' in u else 'LECTURE'
-
-        rooms = {
-            r['room_id']: Room(r['room_id'], _norm_room(r['room_type']), int(r['capacity']))
-            for r in room_rows
-        }
-
-        # ----------------------------
-        # faculty
-        # ----------------------------
-        cursor.execute("SELECT faculty_id, COALESCE(max_load,16) AS max_load FROM faculty_faculty")
-        f_rows = cursor.fetchall()
-        faculty = {r['faculty_id']: Faculty(r['faculty_id'], int(r['max_load'])) for r in f_rows}
-
-        # ----------------------------
-        # curriculum
-        # ----------------------------
-        cursor.execute("SELECT section_id, subject_id, faculty_id FROM curriculum")
-        curriculum = [
-            (int(r['section_id']), int(r['subject_id']), int(r['faculty_id']))
-            for r in cursor.fetchall()
-        ]
-
-        # ----------------------------
-        # timeslots (ordered + usable)
-        # ----------------------------
-        cursor.execute("""
-            SELECT slot_id, day_of_week,
-                   TIME_FORMAT(start_time,'%H:%i') AS st
-            FROM timetable_timeslot
-            ORDER BY FIELD(day_of_week,'MONDAY','TUESDAY','WEDNESDAY','THURSDAY','FRIDAY','SATURDAY','SUNDAY'),
-                     start_time
-        """)
-        ts_rows = cursor.fetchall()
-
-        # slot order
-        cursor.execute("""
-            SELECT slot_id, TIME_FORMAT(start_time,'%H:%i') AS st
-            FROM timetable_timeslot
-            ORDER BY FIELD(day_of_week,'MONDAY','TUESDAY','WEDNESDAY','THURSDAY','FRIDAY','SATURDAY','SUNDAY'),
-                     start_time
-        """)
-        slot_rows = cursor.fetchall()
-        slot_order = [int(r["slot_id"]) for r in slot_rows]
-
-        # periods/day and days
-        first_day = ts_rows[0]['day_of_week'] if ts_rows else None
-        periods_per_day = sum(1 for r in ts_rows if r['day_of_week'] == first_day) if first_day else 0
-        days = len({r['day_of_week'] for r in ts_rows})
-
-        # usable set
-        cursor.execute("SHOW COLUMNS FROM timetable_timeslot LIKE 'is_usable'")
-        has_is_usable = cursor.fetchone() is not None
-        if has_is_usable:
-            cursor.execute("SELECT slot_id FROM timetable_timeslot WHERE is_usable=1")
-            usable = {int(r['slot_id']) for r in cursor.fetchall()}
-        else:
-            usable = set(slot_order)  # all slots usable by default
-
-        # ----------------------------
-        # compute lunch window slots (10:50 - 13:55) across all days
-        # ----------------------------
-        # NOTE: times in DB are expected as HH:MM (24h). We compare lexicographically.
-        LUNCH_START = "10:50"
-        LUNCH_END = "13:55"
-        lunch_window_slots = set()
-        # we already fetched slot_rows with start times
-        for r in slot_rows:
-            st = r.get("st") or ""
-            try:
-                sid = int(r.get("slot_id"))
-            except Exception:
-                continue
-            if LUNCH_START <= st <= LUNCH_END:
-                lunch_window_slots.add(sid)
-
-        # ----------------------------
-        # faculty unavailability
-        # ----------------------------
-        cursor.execute("SHOW TABLES LIKE 'faculty_unavailability'")
-        if cursor.fetchone():
-            cursor.execute("SELECT faculty_id, slot_id FROM faculty_unavailability")
-            fu_rows = cursor.fetchall()
-            fac_unavail = {}
-            for r in fu_rows:
-                fid = int(r['faculty_id']); sid = int(r['slot_id'])
-                fac_unavail.setdefault(fid, set()).add(sid)
+    # ----------------------------
+    # Run GA
+    # ----------------------------
+    print(f"--- Starting Genetic Timetable Algorithm ---")
+    # IMPORTANT: use parameters matching timetable_ga.run_ga(...) signature.
+    # population_size/generations/tournament_k/crossover_rate/mutate_rate/elitism_fraction
+    # are left out on purpose: run_ga picks them from the size-aware preset
+    # (timetable_ga/presets.py, tuned via `python -m timetable_ga.tuning`).
+    ga_params = dict(
+        init_strategy="constructive",
+        graded_hard=True,
+        adaptive=True,        # preset crossover/mutate rates are starting values
+        init_workers=int(os.environ.get("GA_INIT_WORKERS", 1)),
+        init_cache_dir=os.environ.get("GA_SEED_POOL_DIR") or None,
+        checkpoint_path=os.environ.get("GA_CHECKPOINT_PATH") or None   # resume with timetable_ga.resume_ga
+    )
+
+    # Result cache: same input + solver params (incl. the resolved preset) + seed -> stored rows
+    key = cache_key(data, {
+        "init_strategy": ga_params["init_strategy"], "graded_hard": ga_params["graded_hard"],
+        "adaptive": ga_params["adaptive"], "portfolio_runs": portfolio_runs, "time_limit": time_limit,
+        "preset": preset_for(data)["params"],
+    }, seed)
+    t_loaded = time.monotonic()
+
+    run = dict(data=data, ga_params=ga_params, key=key, portfolio_runs=portfolio_runs, time_limit=time_limit,
+               seed=seed, force=force, queue_wait=queue_wait, t_start=t_start, t_loaded=t_loaded)
+    (payload, status), shared = generate_flight.do(f"{key}:force" if force else key, lambda: _run_generation(**run))
+    if shared and "meta" in payload:
+        print(f"--- Generate request joined the run in flight for {key[:12]} ---")
+        payload = {**payload, "meta": {**payload["meta"], "coalesced": True}}
+    return jsonify(payload), status
+
+def _trajectory_summary(trajectory):
+    # result-cache entries written before summaries hold the full list
+    return summarize_trajectory(trajectory) if isinstance(trajectory, list) else (trajectory or {})
+
+def _run_generation(data, ga_params, key, portfolio_runs, time_limit, seed, force, queue_wait, t_start, t_loaded):
+    """
+    Solve (or reuse the cached result), save and publish under GENERATE_LOCK_NAME.
+    Returns (payload, status) so generate_flight can hand it to every coalesced caller.
+    """
+    lock_conn = None
+    conn = None
+    cursor = None
+    try:
+        lock_conn = get_db_connection()
+        if lock_conn is None:
+            return {"msg": "GA Error: Database connection failed."}, 500
+        lock_cursor = lock_conn.cursor()
+        lock_cursor.execute("SELECT GET_LOCK(%s, %s)", (GENERATE_LOCK_NAME, queue_wait))
+        got_lock = lock_cursor.fetchone()[0] == 1
+        lock_cursor.close()
+        if not got_lock:
+            return {"status": "error",
+                    "msg": "Another timetable generation is running. Try again when it has finished."}, 409
+        t_locked = time.monotonic()
+
+        cached = None if force else get_cached(key)
+        if cached:
+            print(f"--- Result cache hit {key[:12]} (run {cached.get('run_id')}) ---")
+            result = cached
+            rows = cached["rows"]
+        elif portfolio_runs > 1:
+            # K seeds in a process pool under one shared deadline, best-of
+            result = run_portfolio(data, runs=portfolio_runs, time_limit=time_limit, seed=seed, **ga_params)
         else:
-            fac_unavail = {}
-
-        if not sections or not subjects or not rooms or not curriculum or not usable:
-            return jsonify({"msg": "Error: Database is empty! Please add Curriculum, Rooms, and Time Slots first."}), 400
-
-        # ----------------------------
-        # GAInput — FINAL (include lunch_slots)
-        # ----------------------------
-        # NOTE: timetable_ga.models.GAInput must be updated to accept lunch_slots parameter (set of slot_ids)
-        data = GAInput(
-            sections=sections,
-            subjects=subjects,
-            curriculum=curriculum,
-            rooms=rooms,
-            faculty=faculty,
-            faculty_unavailability=fac_unavail,
-            timeslots_usable=usable,
-            periods_per_day=periods_per_day,
-            days=days,
-            slot_order=slot_order,
-            lunch_slots=lunch_window_slots,   # <-- pass lunch window to GA
-        )
-
-        # ----------------------------
-        # Run GA
-        # ----------------------------
-        print(f"--- Starting Genetic Timetable Algorithm ---")
-        # IMPORTANT: use parameters matching timetable_ga.run_ga(...) signature
-        result = run_ga(
-            data,
-            population_size=80,
-            generations=300,
-            tournament_k=3,
-            crossover_rate=0.9,   # use crossover_rate if your ga.py expects it
-            mutate_rate=0.05,     # rename/adjust to match your ga.py (mutate_rate used in latest ga.py)
-            elitism_fraction=0.08,
-            seed=None
-        )
+            result = run_ga(data, seed=seed, time_limit=time_limit, **ga_params)
+        t_solved = time.monotonic()
 
         fitness = result["fitness"]
         eval_bd = result["eval"]
-        best = result["best_chromosome"]
+        hard = (eval_bd or {}).get("hard_breakdown") or {}
 
         # encode rows to DB
-        rows = chromosome_to_rows(best)
+        if not cached:
+            rows = chromosome_to_rows(result["best_chromosome"])
         values = [
             (int(r["subject_id"]), int(r["faculty_id"]), int(r["room_id"]), int(r["slot_id"]), int(r["section_id"]))
             for r in rows
         ]
 
-        save_cursor = conn.cursor()
-        save_cursor.execute("DELETE FROM timetable_timetableentry")
-
-        insert_query = """
-            INSERT INTO timetable_timetableentry 
-            (subject_id, faculty_id, classroom_id, time_slot_id, student_batch_id) 
-            VALUES (%s, %s, %s, %s, %s)
-        """
-        save_cursor.executemany(insert_query, values)
-        conn.commit()
-
-        return jsonify({
-            "status": "success",
-            "msg": f"Timetable generated and saved! {len(values)} lectures scheduled.",
+        # Versioned save: rows go in under a new version id while readers keep the
+        # published one, then a single pointer update makes the new timetable live.
+        # The save connection is taken only now: queued callers and the solve itself
+        # hold no pool slot beyond the lock connection.
+        conn = get_db_connection()
+        if conn is None:
+            return {"msg": "GA Error: Database connection failed."}, 500
+        cursor = conn.cursor(dictionary=True)
+        fingerprint = input_fingerprint(data)
+        ensure_schema(conn)
+        live = published_version(cursor) if cached else None
+        if (live and live["version_id"] == cached.get("version_id")
+                and live["fingerprint"] == fingerprint):
+            # repeat click on unchanged input: the cached rows are already live, store nothing
+            version_id = live["version_id"]
+            t_saved = time.monotonic()
+        else:
+            version_id = create_version(conn, fitness=fitness, fingerprint=fingerprint)
+            write_entries(conn, version_id, values)
+            # faculty/room occupancy matrix for the occupancy endpoints, from the same genes
+            try:
+                chrom = result["best_chromosome"] if not cached else chromosome_from_tuples(
+                    [[r["section_id"], r["subject_id"], r["faculty_id"], r["room_id"], r["slot_id"], r["duration"]]
+                     for r in rows], data)
+                save_occupancy(conn, version_id, build_occupancy(data, chrom))
+            except Error as e:
+                print(f"Occupancy save failed (rebuilt on first read): {e}")
+            if publishable(hard):
+                publish_version(conn, version_id)
+                read_cache.invalidate("timetable")
+                # pre-render every section's weekly grid once (one query) for ?format=grid
+                try:
+                    grid_generation = read_cache.generation("timetable")
+                    tag = f"v{version_id}-"
+                    for section_id, grid in section_grids(cursor).items():
+                        read_cache.put("timetable", f"{tag}grid/section/{section_id}", jsonify(grid).get_data(),
+                                       grid_generation, tag)
+                except (Error, GridError) as e:
+                    print(f"Timetable grid warm-up failed: {e}")
+                try:
+                    gc_versions(conn)
+                except Error as e:
+                    print(f"Timetable version GC failed: {e}")
+            t_saved = time.monotonic()
+
+        # Run history + result cache (best-effort: never fail a saved generation because of them)
+        run_id = cached.get("run_id") if cached else None
+        if not cached:
+            try:
+                run_id = record_run({
+                    "fingerprint": fingerprint,
+                    "version_id": version_id,
+                    "params": {**(result.get("params") or ga_params), "portfolio_runs": portfolio_runs, "time_limit": time_limit},
+                    "size": {"sections": len(data.sections), "curriculum": len(data.curriculum), "genes": len(values),
+                             "rooms": len(data.rooms), "faculty": len(data.faculty), "slots": len(data.timeslots_usable)},
+                    "fitness": fitness,
+                    "generations": result.get("generations"),
+                    "phases": {
+                        "load": round(t_loaded - t_start, 3),
+                        "queue": round(t_locked - t_loaded, 3),
+                        "solve": round(t_solved - t_locked, 3),
+                        "save": round(t_saved - t_solved, 3),
+                        **{f"ga_{k}": v for k, v in (result.get("phases") or {}).items()},
+                    },
+                    "hard_breakdown": eval_bd.get("hard_breakdown", {}) if eval_bd else {},
+                    "soft_breakdown": eval_bd.get("soft_breakdown", {}) if eval_bd else {},
+                    "init": result.get("init", {}),
+                    "portfolio": result.get("portfolio"),
+                    "curve": result.get("curve", []),
+                    "rate_trajectory": result.get("rate_trajectory", []),
+                })
+            except Exception as e:
+                print(f"Run history write failed: {e}")
+            # only feasible timetables are cached; an infeasible one is worth retrying
+            if publishable(hard):
+                try:
+                    put_cached(key, {
+                        "run_id": run_id, "version_id": version_id, "fitness": fitness, "eval": eval_bd, "rows": rows,
+                        "generations": result.get("generations"), "init": result.get("init", {}),
+                        "rate_trajectory": summarize_trajectory(result.get("rate_trajectory") or []),
+                        "portfolio": result.get("portfolio"),
+                    })
+                except OSError as e:
+                    print(f"Result cache write failed: {e}")
+
+        if publishable(hard):
+            status, msg, code = "success", f"Timetable generated and saved! {len(values)} lectures scheduled.", 200
+        else:
+            # same rule as manage.py solve_timetable: kept for inspection, the live timetable stays
+            status, msg, code = "error", (f"Timetable has hard violations {hard}; saved as version {version_id} "
+                                          f"but not published."), 422
+        return {
+            "status": status,
+            "msg": msg,
             "meta": {
                 "fitness": fitness,
                 "generations": result.get("generations"),
                 "violations_found": sum(eval_bd.get("soft_breakdown", {}).values()) if eval_bd else None,
-                "hard_violations": eval_bd.get("hard_breakdown", {}) if eval_bd else {}
+                "hard_violations": hard,
+                "init": result.get("init", {}),
+                # summary only; the per-generation trajectory is in run history (GET /api/v1/ga_runs?curve=1)
+                "rate_trajectory": _trajectory_summary(result.get("rate_trajectory")),
+                "portfolio": result.get("portfolio"),
+                "run_id": run_id,
+                "cached": bool(cached),
+                "version_id": version_id,
+                "cache_key": key
             },
             "timetable_json": rows,
             # optionally return the lunch window slots so frontend can show lunch cards
-            "lunch_slots": sorted(list(lunch_window_slots))
-        }), 200
+            "lunch_slots": sorted(list(data.lunch_slots))
+        }, code
 
     except Error as e:
         if conn: conn.rollback()
         print(f"GA Generation Failed (MySQL Error): {e}")
-        return jsonify({"status": "error", "msg": f"Timetable generation failed. DB Error: {e}"}), 500
+        return {"status": "error", "msg": f"Timetable generation failed. DB Error: {e}"}, 500
     except Exception as e:
         print(f"GA Generation Failed (Python Error): {e}")
-        return jsonify({"status": "error", "msg": f"A server error occurred: {e}"}), 500
+        return {"status": "error", "msg": f"A server error occurred: {e}"}, 500
+    finally:
+        if cursor: cursor.close()
+        if conn: conn.close()
+        if lock_conn:
+            try:
+                lock_cursor = lock_conn.cursor()
+                lock_cursor.execute("SELECT RELEASE_LOCK(%s)", (GENERATE_LOCK_NAME,))
+                lock_cursor.fetchone()
+                lock_cursor.close()
+            except Error as e:
+                print(f"Generate lock release failed (freed when the session ends): {e}")
+            lock_conn.close()
+
+# ---------------------------------------------
+# --- GA RUN HISTORY ---
+# ---------------------------------------------
+@app.route('/api/v1/ga_runs', methods=['GET'])
+@jwt_required()
+def get_ga_runs():
+    """Newest-first generate runs; ?fingerprint=, ?run_id=, ?limit=, ?curve=1 to include convergence curves."""
+    auth_check = check_admin_access()
+    if auth_check: return auth_check
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), 500))
+    except (TypeError, ValueError):
+        return jsonify({"msg": "limit must be an integer."}), 422
+    include_curve = request.args.get('curve', '0').lower() in ('1', 'true', 'yes')
+    try:
+        runs = query_runs(
+            fingerprint=request.args.get('fingerprint'),
+            run_id=request.args.get('run_id'),
+            limit=limit,
+            include_curve=include_curve,
+        )
+        return jsonify(runs), 200
+    except OSError as e:
+        print(f"Run history read error: {e}")
+        return jsonify({"msg": "Failed to read run history"}), 500
+
+# ---------------------------------------------
+# --- TIMETABLE VERSIONS (publish / rollback / GC) ---
+# ---------------------------------------------
+@app.route('/api/v1/timetable_versions', methods=['GET'])
+@jwt_required()
+def get_timetable_versions():
+    """Newest-first saved timetable versions; is_live marks the published one."""
+    auth_check = check_admin_access()
+    if auth_check: return auth_check
+    conn = None; cursor = None
+    try:
+        conn = get_db_connection()
+        ensure_schema(conn)
+        cursor = conn.cursor(dictionary=True)
+        versions = list_versions(cursor, limit=max(1, min(int(request.args.get('limit', 50)), 500)))
+        for v in versions:
+            v['is_live'] = bool(v['is_live'])
+        return jsonify(versions), 200
+    except (TypeError, ValueError):
+        return jsonify({"msg": "limit must be an integer."}), 422
+    except Error as e:
+        print(f"Timetable versions error: {e}")
+        return jsonify({"message": f"DB Error: {e}"}), 500
     finally:
         if cursor: cursor.close()
         if conn: conn.close()
 
+@app.route('/api/v1/timetable_versions/<int:version_id>/publish', methods=['POST'])
+@jwt_required()
+def publish_timetable_version(version_id):
+    """Make an existing version live (rollback = publish an older one)."""
+    auth_check = check_admin_access()
+    if auth_check: return auth_check
+    conn = None
+    try:
+        conn = get_db_connection()
+        ensure_schema(conn)
+        previous = publish_version(conn, version_id)
+        read_cache.invalidate("timetable")
+        return jsonify({"status": "success", "version_id": version_id, "previous_version_id": previous}), 200
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 404
+    except Error as e:
+        print(f"Publish version error: {e}")
+        return jsonify({"status": "error", "message": f"DB Error: {e}"}), 500
+    finally:
+        if conn: conn.close()
+
+@app.route('/api/v1/timetable_versions/gc', methods=['POST'])
+@jwt_required()
+def gc_timetable_versions():
+    """Delete old versions, keeping ?keep= (default TIMETABLE_KEEP_VERSIONS) plus the live one."""
+    auth_check = check_admin_access()
+    if auth_check: return auth_check
+    conn = None
+    try:
+        keep = int(request.args['keep']) if 'keep' in request.args else None
+        conn = get_db_connection()
+        ensure_schema(conn)
+        removed = gc_versions(conn) if keep is None else gc_versions(conn, keep=max(1, keep))
+        return jsonify({"status": "success", "removed": removed}), 200
+    except ValueError:
+        return jsonify({"msg": "keep must be an integer."}), 422
+    except Error as e:
+        print(f"Version GC error: {e}")
+        return jsonify({"status": "error", "message": f"DB Error: {e}"}), 500
+    finally:
+        if conn: conn.close()
+
 # -------------------------
 # CRUD ROUTES (UPDATE/DELETE)
 # -------------------------
@@ -760,6 +1204,8 @@ def update_subject(subject_id):
         """
         cursor.execute(query, (subject_name, subject_code, int(lecture_count), subj_type, contiguous_size, subject_id))
         conn.commit()
+        invalidate_ga_input()
+        read_cache.invalidate("subjects", "timetable")   # names appear in timetable rows
         if cursor.rowcount == 0:
             return jsonify({"status": "error", "message": "Subject not found"}), 404
         return jsonify({"status": "success", "message": "Subject updated successfully"}), 200
@@ -788,6 +1234,8 @@ def delete_subject(subject_id):
         query = "DELETE FROM timetable_subject WHERE subject_id = %s"
         cursor.execute(query, (subject_id,))
         conn.commit()
+        invalidate_ga_input()
+        read_cache.invalidate("subjects", "timetable")
         if cursor.rowcount == 0:
             return jsonify({"status": "error", "message": "Subject not found"}), 404
         return jsonify({"status": "success", "message": "Subject deleted successfully"}), 200
@@ -807,31 +1255,22 @@ def get_timetable_data(dept_id, batch_id):
     claims = get_jwt()
     if claims.get('role') not in ['Admin', 'Faculty', 'Student']:
         return jsonify({"msg": "Authorization failed. Role not permitted."}), 403
+    if request.args.get('format') == 'grid':
+        if not batch_id.isdigit():
+            return jsonify({"msg": "batch_id must be a section id."}), 422
+        return _grid_response(int(batch_id), dept_id)
     conn = None; cursor = None
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         if conn is None:
             return jsonify({"error": "Database connection failed"}), 500
         cursor = conn.cursor(dictionary=True)
-        sql_query = """
-    SELECT
-    TS.day_of_week,
-    TIME_FORMAT(TS.start_time, '%H:%i') AS start_time,
-    TIME_FORMAT(TS.end_time,   '%H:%i') AS end_time,
-    SUB.subject_code, SUB.subject_name, FAC.name AS faculty_name,
-    CR.room_name, CR.room_type
-    FROM timetable_timetableentry AS TTE
-    JOIN timetable_subject AS SUB ON TTE.subject_id = SUB.subject_id
-    JOIN faculty_faculty AS FAC ON TTE.faculty_id = FAC.faculty_id
-    JOIN rooms_classroom AS CR ON TTE.classroom_id = CR.room_id
-    JOIN timetable_timeslot AS TS ON TTE.time_slot_id = TS.slot_id
-    JOIN sections AS SEC ON TTE.student_batch_id = SEC.section_id
-    WHERE SEC.dept_id = %s AND TTE.student_batch_id = %s
-    ORDER BY FIELD(TS.day_of_week,'MONDAY','TUESDAY','WEDNESDAY','THURSDAY','FRIDAY','SATURDAY'),
-         TS.start_time;
-"""
-        cursor.execute(sql_query, (dept_id, batch_id))
-        return jsonify(cursor.fetchall()), 200
+        key, tag = _timetable_key(cursor, f"{dept_id}/{batch_id}")
+        cached = _cached_json("timetable", key)
+        if cached: return cached
+        generation = read_cache.generation("timetable")
+        cursor.execute(DEPT_BATCH_TIMETABLE_SQL, (dept_id, batch_id))
+        return _json_cached("timetable", key, generation, cursor.fetchall(), tag)
     except Error as e:
         print("--- DATABASE CONNECTION/QUERY ERROR ---")
         print(f"Error Details: {e}")
@@ -851,20 +1290,37 @@ if __name__ == '__main__':
 
 @app.route("/db-check")
 def db_check():
+    """?read_only=1 routes like the GET endpoints do; "server" shows which instance answered."""
     from db_connector import get_db_connection
-    conn = get_db_connection()
+    read_only = request.args.get("read_only", "0").lower() in ("1", "true", "yes")
+    conn = get_db_connection(read_only=read_only)
     if not conn:
         return {"status": "DB FAILED"}, 500
 
     cur = conn.cursor()
-    cur.execute("SHOW TABLES;")
-    tables = [t[0] for t in cur.fetchall()]
-    return {"status": "OK", "tables": tables}
+    try:
+        cur.execute("SHOW TABLES;")
+        tables = [t[0] for t in cur.fetchall()]
+        if getattr(conn, "dialect", "mysql") == "sqlite":
+            cur.execute("PRAGMA query_only")
+            host, port, server_read_only = conn.path, None, cur.fetchone()[0]
+        else:
+            cur.execute("SELECT @@hostname, @@port, @@read_only")
+            host, port, server_read_only = cur.fetchone()
+    finally:
+        cur.close()
+        conn.close()  # returns the connection to the pool
+    return {"status": "OK", "tables": tables, "role": getattr(conn, "role", "primary"),
+            "server": {"hostname": host, "port": port, "read_only": bool(server_read_only)}}
 
 
 @app.after_request
 def after_request(response):
     response.headers["Access-Control-Allow-Origin"] = "*"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+    response.headers["Access-Control-Allow-Headers"] = f"Content-Type, Authorization, {LAST_WRITE_HEADER}"
     response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
+    response.headers["Access-Control-Expose-Headers"] = LAST_WRITE_HEADER
+    wrote = request_write_time()
+    if wrote is not None:
+        response.headers[LAST_WRITE_HEADER] = f"{wrote:.3f}"
     return response
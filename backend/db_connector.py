@@ -1,18 +1,375 @@
+import contextvars
+import itertools
 import mysql.connector
 import os
+import queue
+import threading
+import time
 
-def get_db_connection():
+import sqlite_backend
+
+# -------------------------
+# CONNECTION POOL
+# -------------------------
+# A bounded pool of MySQL connections so requests stop paying a TCP + TLS handshake
+# and authentication each. Connections handed out by get_db_connection() are
+# wrappers whose close() returns them to the pool, so existing callers need no change.
+#
+# Env vars (besides DB_HOST/DB_PORT/DB_USER/DB_PASSWORD/DB_NAME):
+#   DB_POOL_SIZE          max open connections per process (default 8; 0 disables pooling)
+#   DB_POOL_TIMEOUT       seconds to wait for a free connection (default 10)
+#   DB_POOL_MAX_LIFETIME  seconds before a connection is recycled (default 1800)
+#   DB_POOL_PING_AFTER    ping connections idle longer than this before reuse (default 30)
+#
+# READ REPLICAS
+# get_db_connection(read_only=True) (the GET listing / timetable routes) is served by
+# a read replica when DB_REPLICAS is set; everything else stays on the primary.
+# Read-your-writes: a commit on a primary connection opens a window during which the
+# client that made it is read from the primary too, so it never reads a replica that
+# has not caught up with its own write. The window travels with the client, so it
+# holds whichever worker process serves the next request: app.py returns the commit
+# time in an X-Last-Write response header, the frontend echoes it on later requests,
+# and begin_request() hands it to this module. Outside a request (scripts, CLI) the
+# window is this process's own last commit.
+#
+#   DB_REPLICAS           comma-separated host[:port] list (same DB_USER/DB_PASSWORD/DB_NAME);
+#                         empty = no replicas. Any MySQL-compatible server works, e.g. a
+#                         second local instance: DB_REPLICAS=127.0.0.1:3307
+#   DB_READ_YOUR_WRITES   seconds after a primary commit that reads stay on the primary (default 5)
+#   DB_REPLICA_RETRY      seconds a replica that failed to connect is skipped (default 30)
+#   DB_REPLICA_WAIT       seconds to wait for a free connection in a replica pool before
+#                         trying the next replica / the primary (default 0.05)
+#
+# Replica sessions are SET TRANSACTION READ ONLY, so a write routed there by mistake
+# fails loudly instead of diverging from the primary.
+# app.py keeps replica rows in its read cache only under version-pinned keys
+# (served_by_replica()), since a replica may lag behind other workers' writes.
+#
+# STORAGE BACKENDS
+#   DB_BACKEND            mysql (default) or sqlite: an embedded database file
+#                         (sqlite_backend.py, DB_SQLITE_PATH) with the same schema and
+#                         queries, for local benchmarking and single-node deployments.
+#                         Pooling works the same; read_only connections come from a
+#                         second, query_only pool (WAL readers run alongside the writer,
+#                         so there is no replica lag and no read-your-writes window).
+
+
+def _connect(host=None, port=None, read_only=False):
+    conn = mysql.connector.connect(
+        host=host or os.environ["DB_HOST"],
+        port=int(port or os.environ["DB_PORT"]),
+        user=os.environ["DB_USER"],
+        password=os.environ["DB_PASSWORD"],
+        database=os.environ["DB_NAME"],
+        ssl_disabled=False
+    )
+    if read_only:
+        cur = conn.cursor()
+        try:
+            cur.execute("SET SESSION TRANSACTION READ ONLY")
+        finally:
+            cur.close()
+    return conn
+
+
+_last_write = 0.0   # wall clock (time.time()) of the newest write this process knows of
+# per-request read-your-writes state: {"client": echoed last write, "wrote": commit time}
+_request_state = contextvars.ContextVar("db_request_state", default=None)
+
+
+def _window():
+    return float(os.environ.get("DB_READ_YOUR_WRITES", 5))
+
+
+def begin_request(client_last_write=None):
+    """
+    Reset the per-request state (worker threads are reused). client_last_write is the
+    X-Last-Write value the client echoed back; junk or out-of-window values are ignored.
+    """
+    global _last_write
+    now = time.time()
+    try:
+        client = float(client_last_write or 0)
+    except ValueError:
+        client = 0.0
+    if abs(now - client) >= _window():   # allows rounding / clock skew between hosts
+        client = 0.0
+    _request_state.set({"client": client, "wrote": None, "replica": False})
+    _last_write = max(_last_write, client)
+
+
+def request_write_time():
+    """Wall-clock time of this request's last primary commit, or None (for X-Last-Write)."""
+    state = _request_state.get()
+    return state["wrote"] if state else None
+
+
+def mark_write():
+    """Start the read-your-writes window (called on every primary commit)."""
+    global _last_write
+    _last_write = now = time.time()
+    state = _request_state.get()
+    if state is not None:
+        state["wrote"] = now
+
+
+def recent_write():
+    """Inside the read-your-writes window of this client (or, outside a request, this process)."""
+    state = _request_state.get()
+    last = max(state["client"], state["wrote"] or 0.0) if state else _last_write
+    return time.time() - last < _window()
+
+
+def served_by_replica():
+    """
+    This request read from a replica. Its rows may predate writes made through
+    other worker processes (this one can't know about those), so callers only
+    cache them under keys that pin what was read, like the published version.
+    """
+    state = _request_state.get()
+    return bool(state and state["replica"])
+
+
+class PooledConnection:
+    """
+    Proxy around a raw connection; close() hands it back to the pool (or disconnects
+    when pooling is off). role is "primary" or "replica <host>:<port>".
+    """
+
+    def __init__(self, pool, raw, created_at, role="primary"):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._closed = False
+        self.role = role
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def commit(self):
+        self._raw.commit()
+        if self.role == "primary":
+            mark_write()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._pool is None:
+            _quiet_close(self._raw)
+        else:
+            self._pool._release(self._raw, self._created_at)
+
+    def __del__(self):
+        # a caller that forgot close() must not leak a pool slot forever
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ConnectionPool:
+    def __init__(self, size, timeout, max_lifetime, ping_after, connect=_connect, role="primary"):
+        self.role = role
+        self.size = size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+        self._connect = connect
+        self._idle = queue.LifoQueue()            # (raw, created_at, released_at); LIFO keeps hot connections hot
+        self._slots = threading.BoundedSemaphore(size)
+        self._pid = os.getpid()
+
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"no free DB connection within {timeout}s (pool size {self.size})")
+        try:
+            now = time.monotonic()
+            while True:
+                try:
+                    raw, created_at, released_at = self._idle.get_nowait()
+                except queue.Empty:
+                    return PooledConnection(self, self._connect(), time.monotonic(), self.role)
+                if now - created_at > self.max_lifetime:
+                    _quiet_close(raw)
+                    continue
+                if now - released_at > self.ping_after and not _healthy(raw):
+                    _quiet_close(raw)
+                    continue
+                return PooledConnection(self, raw, created_at, self.role)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, raw, created_at):
+        try:
+            if os.getpid() != self._pid:
+                return  # inherited across fork: never share a socket between processes
+            try:
+                if raw.in_transaction:
+                    raw.rollback()  # leave no open transaction behind for the next borrower
+            except Exception:
+                _quiet_close(raw)
+                return
+            if time.monotonic() - created_at > self.max_lifetime:
+                _quiet_close(raw)
+            else:
+                self._idle.put((raw, created_at, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def close_all(self):
+        while True:
+            try:
+                raw, _c, _r = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _quiet_close(raw)
+
+
+def _healthy(raw):
+    try:
+        raw.ping(reconnect=False)
+        return True
+    except Exception:
+        return False
+
+
+def _quiet_close(raw):
+    try:
+        raw.close()
+    except Exception:
+        pass
+
+
+_pool = None
+_replica_pools = []
+_pool_lock = threading.Lock()
+_replica_down_until = {}
+_round_robin = itertools.count()
+
+
+def _pool_settings():
+    return dict(
+        timeout=float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        max_lifetime=float(os.environ.get("DB_POOL_MAX_LIFETIME", 1800)),
+        ping_after=float(os.environ.get("DB_POOL_PING_AFTER", 30)),
+    )
+
+
+def get_pool():
+    """Process-wide primary pool (re-created after fork), or None when DB_POOL_SIZE=0."""
+    global _pool
+    size = int(os.environ.get("DB_POOL_SIZE", 8))
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None or _pool._pid != os.getpid():
+            _pool = ConnectionPool(size=size, **_pool_settings())
+        return _pool
+
+
+def replica_targets():
+    """[(host, port)] from DB_REPLICAS; port defaults to DB_PORT."""
+    targets = []
+    for item in os.environ.get("DB_REPLICAS", "").split(","):
+        item = item.strip()
+        if item:
+            host, _sep, port = item.partition(":")
+            targets.append((host, int(port or os.environ["DB_PORT"])))
+    return targets
+
+
+def get_replica_pools():
+    """One pool per replica target (same size and timeouts as the primary pool), [] when unpooled."""
+    global _replica_pools
+    size = int(os.environ.get("DB_POOL_SIZE", 8))
+    if size <= 0:
+        return []
+    with _pool_lock:
+        if not _replica_pools or _replica_pools[0]._pid != os.getpid():
+            _replica_pools = [
+                ConnectionPool(size=size, connect=lambda h=host, p=port: _connect(h, p, read_only=True),
+                               role=f"replica {host}:{port}", **_pool_settings())
+                for host, port in replica_targets()
+            ]
+        return _replica_pools
+
+
+def _replica_connection():
+    """A connection to the next healthy replica (round-robin), or None to fall back to the primary."""
+    targets = replica_targets()
+    if not targets:
+        return None
+    pools = get_replica_pools()
+    start = next(_round_robin)
+    for k in range(len(targets)):
+        i = (start + k) % len(targets)
+        if _replica_down_until.get(i, 0) > time.monotonic():
+            continue
+        host, port = targets[i]
+        try:
+            if pools:
+                # a saturated replica falls through to the next one (or the primary) at once
+                return pools[i].acquire(timeout=float(os.environ.get("DB_REPLICA_WAIT", 0.05)))
+            return PooledConnection(None, _connect(host, port, read_only=True), time.monotonic(),
+                                    f"replica {host}:{port}")
+        except TimeoutError:
+            continue  # pool busy, not down: try the next replica
+        except Exception as e:
+            retry = float(os.environ.get("DB_REPLICA_RETRY", 30))
+            print(f"⚠️ Replica {host}:{port} unavailable, skipping it for {retry:.0f}s: {e}")
+            _replica_down_until[i] = time.monotonic() + retry
+    return None
+
+
+def storage_backend():
+    return os.environ.get("DB_BACKEND", "mysql").strip().lower()
+
+
+_sqlite_pools = {}
+
+
+def _sqlite_connection(read_only):
+    role = "reader" if read_only else "primary"
+    size = int(os.environ.get("DB_POOL_SIZE", 8))
+    if size <= 0:
+        return PooledConnection(None, sqlite_backend.connect(read_only), time.monotonic(), role)
+    with _pool_lock:
+        pool = _sqlite_pools.get(role)
+        if pool is None or pool._pid != os.getpid():
+            pool = _sqlite_pools[role] = ConnectionPool(
+                size=size, connect=lambda: sqlite_backend.connect(read_only), role=role, **_pool_settings())
+    return pool.acquire()
+
+
+def get_db_connection(read_only=False):
+    """
+    Primary connection, or with read_only=True a replica one when replicas are
+    configured, healthy and this client made no write within DB_READ_YOUR_WRITES.
+    With DB_BACKEND=sqlite, a connection to the local database file.
+    """
     try:
-        conn = mysql.connector.connect(
-            host=os.environ["DB_HOST"],
-            port=int(os.environ["DB_PORT"]),
-            user=os.environ["DB_USER"],
-            password=os.environ["DB_PASSWORD"],
-            database=os.environ["DB_NAME"],
-            ssl_disabled=False
-        )
-        print("✅ DB CONNECTED SUCCESSFULLY")
-        return conn
+        if storage_backend() == "sqlite":
+            return _sqlite_connection(read_only)
+        if read_only and not recent_write():
+            conn = _replica_connection()
+            if conn is not None:
+                state = _request_state.get()
+                if state is not None:
+                    state["replica"] = True
+                return conn
+        pool = get_pool()
+        if pool is None:
+            return PooledConnection(None, _connect(), time.monotonic())
+        return pool.acquire()
     except Exception as e:
         print("❌ DB CONNECTION ERROR:", e)
         return None
@@ -0,0 +1,47 @@
+# export_snapshot.py
+# Dumps the database's current GA problem (exactly what /api/v1/generate_timetable
+# would solve) to a portable snapshot file for the offline solver:
+#
+#   python export_snapshot.py --out prod-2026-10.json.gz
+#   python -m timetable_ga solve prod-2026-10.json.gz --out result.json
+#
+# DB credentials come from the same env vars as db_connector (DB_HOST, DB_PORT, ...).
+
+import argparse
+import os
+import time
+
+from mysql.connector import Error
+
+from db_connector import get_db_connection
+from services.ga_input import load_ga_input, GAInputError
+from timetable_ga.snapshot import save_snapshot
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Export the GA problem from MySQL to a snapshot file.")
+    ap.add_argument("--out", required=True, help="snapshot path (.json or .json.gz)")
+    args = ap.parse_args()
+
+    conn = get_db_connection()
+    if conn is None:
+        print("❌ Database connection failed.")
+        return
+    cursor = conn.cursor(dictionary=True)
+    try:
+        t0 = time.monotonic()
+        data = load_ga_input(cursor)
+        fp = save_snapshot(data, args.out, meta={"source": "mysql", "db_host": os.environ.get("DB_HOST")})
+        print(f"✅ {len(data.sections)} sections, {len(data.curriculum)} curriculum rows, "
+              f"{len(data.rooms)} rooms -> {args.out} ({fp[:12]}) in {time.monotonic() - t0:.2f}s")
+    except GAInputError as e:
+        print(f"❌ {e}")
+    except Error as e:
+        print(f"❌ Export failed: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
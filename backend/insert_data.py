@@ -88,7 +88,7 @@ def insert_data_into_db():
 
         # TimeSlots
         for tid, day, start, end in DATA['timeslots']:
-            cursor.execute(f"INSERT IGNORE INTO timetable_timeslot VALUES ('{tid}', '{day}', '{start}', '{end}')")
+            cursor.execute(f"INSERT IGNORE INTO timetable_timeslot (slot_id, day_of_week, start_time, end_time) VALUES ('{tid}', '{day}', '{start}', '{end}')")
 
         # Subjects
         for sid, code, name, credits, lec, lab, dept_id in DATA['subjects']:
@@ -0,0 +1,199 @@
+# load_test.py
+# Concurrent read/write load test of the storage backend: the API's hot queries
+# (section / department timetable, section grid, solver input load) plus a small
+# write (insert + delete a subject) run from several threads through db_connector,
+# so one run works unchanged against MySQL and the embedded SQLite backend.
+#
+#   python seed_synthetic.py --sections 400 --truncate
+#   python load_test.py --seconds 20 --threads 8 --make-timetable
+#
+#   DB_BACKEND=sqlite DB_SQLITE_PATH=/tmp/load.db python seed_synthetic.py --sections 400 --truncate
+#   DB_BACKEND=sqlite DB_SQLITE_PATH=/tmp/load.db python load_test.py --seconds 20 --threads 8 --make-timetable
+#
+# The read paths need a published timetable. --make-timetable publishes a made-up
+# one when there is none (random slots and rooms, one entry per lecture; not a valid
+# timetable, so only for load-test databases).
+# DB credentials come from the same env vars as db_connector (DB_HOST, DB_PORT, ...).
+
+import argparse
+import random
+import threading
+import time
+import uuid
+from typing import Dict, List
+
+from mysql.connector import Error
+
+from db_connector import get_db_connection, storage_backend
+from services.ga_input import load_ga_input
+from services.timetable_export import SECTION_TIMETABLE_SQL, DEPT_BATCH_TIMETABLE_SQL
+from services.timetable_grid import section_grids, GridError
+from services.timetable_versions import (
+    ensure_schema, create_version, write_entries, publish_version, published_version_id,
+)
+
+# operation -> weight in the mix
+DEFAULT_MIX = {"section_timetable": 50, "dept_timetable": 15, "section_grid": 25,
+               "ga_input": 2, "subject_write": 8}
+
+
+def ensure_published(conn, make: bool = False, seed: int = 0) -> int:
+    """The published version id; with `make`, a made-up timetable is published first if there is none."""
+    ensure_schema(conn)
+    cursor = conn.cursor()
+    try:
+        version_id = published_version_id(cursor)
+        if version_id is not None:
+            return version_id
+        if not make:
+            raise RuntimeError("no published timetable (generate one, or pass --make-timetable)")
+        cursor.execute("""
+            SELECT C.section_id, C.subject_id, C.faculty_id, SUB.lecture_count
+            FROM curriculum AS C JOIN timetable_subject AS SUB ON SUB.subject_id = C.subject_id
+        """)
+        curriculum = cursor.fetchall()
+        cursor.execute("SELECT slot_id FROM timetable_timeslot")
+        slots = [r[0] for r in cursor.fetchall()]
+        cursor.execute("SELECT room_id FROM rooms_classroom")
+        rooms = [r[0] for r in cursor.fetchall()]
+    finally:
+        cursor.close()
+    if not (curriculum and slots and rooms):
+        raise RuntimeError("no curriculum, timeslots or rooms: seed the database first (seed_synthetic.py)")
+    rnd = random.Random(seed)
+    values = [(sub, fac, rnd.choice(rooms), rnd.choice(slots), sec)
+              for sec, sub, fac, lectures in curriculum for _ in range(max(1, int(lectures or 1)))]
+    version_id = create_version(conn, fitness=None, fingerprint="load-test")
+    write_entries(conn, version_id, values)
+    publish_version(conn, version_id)
+    return version_id
+
+
+def _targets(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT section_id, dept_id FROM sections")
+        return [(int(sid), str(dept)) for sid, dept in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def _run_op(op: str, section_id: int, dept_id: str) -> None:
+    conn = get_db_connection(read_only=(op != "subject_write"))
+    if conn is None:
+        raise RuntimeError("database connection failed")
+    cursor = conn.cursor(dictionary=True)
+    try:
+        if op == "section_timetable":
+            cursor.execute(SECTION_TIMETABLE_SQL, (section_id,))
+            cursor.fetchall()
+        elif op == "dept_timetable":
+            cursor.execute(DEPT_BATCH_TIMETABLE_SQL, (dept_id, section_id))
+            cursor.fetchall()
+        elif op == "section_grid":
+            section_grids(cursor, section_id=section_id)
+        elif op == "ga_input":
+            load_ga_input(cursor)
+        elif op == "subject_write":
+            code = f"LT-{uuid.uuid4().hex[:12]}"
+            cursor.execute("INSERT INTO timetable_subject (subject_code, subject_name, lecture_count) "
+                           "VALUES (%s, %s, %s)", (code, "load test", 1))
+            conn.commit()
+            cursor.execute("DELETE FROM timetable_subject WHERE subject_code = %s", (code,))
+            conn.commit()
+        else:
+            raise ValueError(f"unknown operation {op!r}")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _percentile(sorted_ms: List[float], q: float) -> float:
+    return sorted_ms[min(len(sorted_ms) - 1, int(len(sorted_ms) * q))] if sorted_ms else 0.0
+
+
+def run_load(seconds: float = 10.0, threads: int = 8, mix: Dict[str, int] = None, seed: int = 0,
+             make_timetable: bool = False) -> Dict:
+    """
+    Run the mix for `seconds` from `threads` threads. Returns per-operation count,
+    errors, p50/p95/p99 (ms) and overall throughput.
+    """
+    mix = dict(mix or DEFAULT_MIX)
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError("database connection failed")
+    try:
+        ensure_published(conn, make_timetable, seed)
+        targets = _targets(conn)
+    finally:
+        conn.close()
+
+    ops, weights = list(mix), list(mix.values())
+    samples = {op: [] for op in ops}
+    errors = {op: 0 for op in ops}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker(k):
+        rnd = random.Random(seed * 1000 + k)
+        local = {op: [] for op in ops}
+        failed = {op: 0 for op in ops}
+        while time.monotonic() < deadline:
+            op = rnd.choices(ops, weights)[0]
+            section_id, dept_id = rnd.choice(targets)
+            t0 = time.perf_counter()
+            try:
+                _run_op(op, section_id, dept_id)
+            except (Error, GridError, RuntimeError, TimeoutError) as e:
+                failed[op] += 1
+                if failed[op] == 1:
+                    print(f"  {op} failed: {e}")
+                continue
+            local[op].append((time.perf_counter() - t0) * 1000)
+        with lock:
+            for op in ops:
+                samples[op].extend(local[op])
+                errors[op] += failed[op]
+
+    t_start = time.monotonic()
+    pool = [threading.Thread(target=worker, args=(k,), daemon=True) for k in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.monotonic() - t_start
+
+    report = {"backend": storage_backend(), "threads": threads, "seconds": round(elapsed, 2), "ops": {}}
+    for op in ops:
+        ms = sorted(samples[op])
+        report["ops"][op] = {"count": len(ms), "errors": errors[op],
+                             "p50": round(_percentile(ms, 0.50), 2), "p95": round(_percentile(ms, 0.95), 2),
+                             "p99": round(_percentile(ms, 0.99), 2)}
+    total = sum(r["count"] for r in report["ops"].values())
+    report["throughput"] = round(total / elapsed, 1) if elapsed > 0 else 0.0
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Concurrent read/write load test of the storage backend.")
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--make-timetable", action="store_true",
+                    help="publish a made-up timetable if none is published (load-test databases only)")
+    args = ap.parse_args()
+
+    try:
+        report = run_load(args.seconds, args.threads, seed=args.seed, make_timetable=args.make_timetable)
+    except (Error, RuntimeError) as e:
+        print(f"❌ Load test failed: {e}")
+        return
+    print(f"{report['backend']}: {args.threads} threads, {report['seconds']}s, "
+          f"{report['throughput']} ops/s")
+    print(f"  {'operation':<18} {'count':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for op, r in report["ops"].items():
+        print(f"  {op:<18} {r['count']:>7} {r['errors']:>6} {r['p50']:>8} {r['p95']:>8} {r['p99']:>8}")
+
+
+if __name__ == "__main__":
+    main()
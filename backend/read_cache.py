@@ -0,0 +1,105 @@
+# read_cache.py
+# In-process cache of serialized GET responses (timetables and reference lists).
+# Entries live in namespaces ("timetable", "sections", "subjects", "faculty");
+# write routes invalidate exactly the namespaces whose source tables they touch.
+# Bounded by entry count and total bytes (LRU) plus a TTL, which also caps how
+# long another worker process can serve data this process already invalidated.
+# Timetable entries don't depend on that: their keys and ETags carry the published
+# version_id, read from the DB per request, so a publish in any worker switches all
+# of them over at once.
+#
+# Each entry carries a content-derived ETag (hash of the body, optionally prefixed
+# with a tag such as the version), so conditional GETs agree across worker processes.
+#
+# Env vars: READ_CACHE_MAX_ENTRIES (default 2048), READ_CACHE_MAX_BYTES
+# (default 64 MiB), READ_CACHE_TTL seconds (default 300; 0 disables the cache).
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class ReadCache:
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bytes, str, float]]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def generation(self, namespace: str) -> int:
+        """Counter bumped by every invalidate(namespace); read it before querying, pass it to put()."""
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[bytes, str]]:
+        """(body, etag) or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None or entry[2] < time.monotonic():
+                if entry is not None:
+                    self._drop((namespace, key))
+                self.misses += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, namespace: str, key: str, body: bytes, generation: int, tag: str = "") -> str:
+        """
+        Store `body` unless `namespace` was invalidated since `generation` was read
+        (stale query). Returns the body's ETag (prefixed with `tag`) either way.
+        """
+        etag = body_etag(body, tag)
+        if not self.enabled or len(body) > self.max_bytes:
+            return etag
+        with self._lock:
+            if self._generations.get(namespace, 0) != generation:
+                return etag
+            if (namespace, key) in self._entries:
+                self._drop((namespace, key))
+            self._entries[(namespace, key)] = (body, etag, time.monotonic() + self.ttl)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+        return etag
+
+    def invalidate(self, *namespaces: str) -> None:
+        with self._lock:
+            for ns in namespaces:
+                self._generations[ns] = self._generations.get(ns, 0) + 1
+                for k in [k for k in self._entries if k[0] == ns]:
+                    self._drop(k)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits,
+                    "misses": self.misses, "generations": dict(self._generations)}
+
+    def _drop(self, k) -> None:
+        body, _etag, _exp = self._entries.pop(k)
+        self._bytes -= len(body)
+
+
+def body_etag(body: bytes, tag: str = "") -> str:
+    return tag + hashlib.sha256(body).hexdigest()[:32]
+
+
+read_cache = ReadCache(
+    max_entries=int(os.environ.get("READ_CACHE_MAX_ENTRIES", 2048)),
+    max_bytes=int(os.environ.get("READ_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    ttl=float(os.environ.get("READ_CACHE_TTL", 300)),
+)
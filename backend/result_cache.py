@@ -0,0 +1,103 @@
+# result_cache.py
+# Cache of solved timetables (local directory store, one JSON file per entry).
+# Key = input fingerprint + solver parameters + seed, so pressing Generate again
+# without changing any data returns the stored rows instead of rerunning the GA.
+# Path: GA_RESULT_CACHE_DIR env var; size bound: GA_RESULT_CACHE_MAX (entries).
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from timetable_ga.fingerprint import input_fingerprint
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ga_result_cache")
+DEFAULT_MAX_ENTRIES = 64
+
+_lock = threading.Lock()
+
+
+def cache_dir() -> str:
+    return os.environ.get("GA_RESULT_CACHE_DIR") or DEFAULT_DIR
+
+
+def cache_key(data, params: Dict[str, Any], seed: Optional[int] = None) -> str:
+    """SHA-256 over the canonical GAInput mixed with the solver parameters and seed."""
+    return input_fingerprint(data, extra={"params": params, "seed": seed})
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(cache_dir(), f"{key}.json")
+
+
+def get_cached(key: str) -> Optional[Dict[str, Any]]:
+    """Stored payload for `key`, or None (missing or unreadable entries count as misses)."""
+    path = _entry_path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            entry = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)  # LRU: a hit refreshes the entry
+    except OSError:
+        pass
+    return entry
+
+
+def put_cached(key: str, payload: Dict[str, Any]) -> None:
+    """Store `payload` under `key` (atomic replace), then evict the least recently used entries."""
+    entry = dict(payload)
+    entry.setdefault("cached_at", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+    directory = cache_dir()
+    with _lock:
+        os.makedirs(directory, exist_ok=True)
+        # a private temp file: the CLI, a second app instance or another host sharing
+        # the directory may be writing the same key right now
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=f"{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(entry, fh, separators=(",", ":"), default=str)
+            os.replace(tmp, _entry_path(key))
+        except BaseException:
+            _discard(tmp)
+            raise
+        _evict(directory, int(os.environ.get("GA_RESULT_CACHE_MAX", DEFAULT_MAX_ENTRIES)))
+
+
+def _discard(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _evict(directory: str, max_entries: int) -> None:
+    files = [os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".json")]
+    if len(files) <= max_entries:
+        return
+    files.sort(key=lambda p: os.path.getmtime(p))
+    for path in files[:len(files) - max_entries]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def clear_cache() -> int:
+    """Remove every cached result; returns how many entries were dropped."""
+    directory = cache_dir()
+    if not os.path.isdir(directory):
+        return 0
+    n = 0
+    with _lock:
+        for f in os.listdir(directory):
+            if f.endswith(".json"):
+                try:
+                    os.remove(os.path.join(directory, f))
+                    n += 1
+                except OSError:
+                    pass
+    return n
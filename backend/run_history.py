@@ -0,0 +1,67 @@
+# run_history.py
+# Persistent GA run history (local JSON-lines file store).
+# One line per generate run: parameters, input fingerprint, convergence curve,
+# phase timings and final breakdowns. Path: GA_RUN_HISTORY_PATH env var.
+
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ga_run_history.jsonl")
+
+_lock = threading.Lock()
+
+
+def history_path() -> str:
+    return os.environ.get("GA_RUN_HISTORY_PATH") or DEFAULT_PATH
+
+
+def record_run(entry: Dict[str, Any]) -> str:
+    """Append one run record; returns its run_id."""
+    record = dict(entry)
+    record.setdefault("run_id", uuid.uuid4().hex)
+    record.setdefault("created_at", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+    line = json.dumps(record, separators=(",", ":"), default=str)
+    path = history_path()
+    with _lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+    return record["run_id"]
+
+
+def query_runs(fingerprint: Optional[str] = None,
+               run_id: Optional[str] = None,
+               limit: int = 50,
+               include_curve: bool = False) -> List[Dict[str, Any]]:
+    """
+    Newest-first run records, optionally filtered by input fingerprint or run_id.
+    Curves (convergence and rate trajectory) are dropped unless include_curve
+    (they dominate the record size).
+    """
+    path = history_path()
+    if not os.path.exists(path):
+        return []
+    out: List[Dict[str, Any]] = []
+    with _lock:
+        with open(path, "r", encoding="utf-8") as fh:
+            lines = fh.readlines()
+    for line in reversed(lines):
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue  # tolerate a torn last line
+        if fingerprint and rec.get("fingerprint") != fingerprint:
+            continue
+        if run_id and rec.get("run_id") != run_id:
+            continue
+        if not include_curve:
+            rec.pop("curve", None)
+            rec.pop("rate_trajectory", None)
+        out.append(rec)
+        if len(out) >= limit:
+            break
+    return out
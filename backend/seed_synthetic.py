@@ -0,0 +1,132 @@
+# seed_synthetic.py
+# Bulk seeder for load tests: generates a synthetic campus (timetable_ga.synthetic)
+# and loads it into the same tables app.py queries, using batched parameterized
+# inserts inside one transaction.
+#
+#   python seed_synthetic.py --departments 8 --sections 2000 --lab-ratio 0.3 --truncate
+#   python seed_synthetic.py --sections 200 --dry-run
+#
+# DB credentials come from the same env vars as db_connector (DB_HOST, DB_PORT, ...).
+# DB_BACKEND=sqlite seeds the embedded database instead (DB_SQLITE_PATH), so the
+# same load test (load_test.py) runs against both backends:
+#
+#   DB_BACKEND=sqlite DB_SQLITE_PATH=/tmp/load.db python seed_synthetic.py --sections 2000 --truncate
+
+import argparse
+import time
+
+from mysql.connector import Error
+
+from db_connector import get_db_connection
+from timetable_ga.synthetic import synthetic_campus
+
+# table -> (columns, campus key). Order respects foreign keys.
+TABLES = [
+    ("faculty_department", ("dept_id", "dept_name"), "departments"),
+    ("timetable_timeslot", ("slot_id", "day_of_week", "start_time", "end_time"), "timeslots"),
+    ("sections", ("section_id", "section_name", "dept_id", "student_count"), "sections"),
+    ("timetable_subject", ("subject_id", "subject_code", "subject_name", "lecture_count",
+                           "department_id", "type", "contiguous_block_size"), "subjects"),
+    ("faculty_faculty", ("faculty_id", "name", "faculty_id_code", "designation", "email",
+                         "department_id", "max_load"), "faculty"),
+    ("rooms_classroom", ("room_id", "room_name", "capacity", "room_type", "is_available"), "rooms"),
+    ("curriculum", ("section_id", "subject_id", "faculty_id"), "curriculum"),
+    ("faculty_unavailability", ("faculty_id", "slot_id"), "faculty_unavailability"),
+]
+
+# cleared child-first when --truncate is given
+TRUNCATE_ORDER = [
+    "timetable_publish", "timetable_version", "timetable_occupancy",
+    "timetable_timetableentry", "faculty_unavailability", "curriculum", "rooms_classroom",
+    "faculty_faculty", "timetable_subject", "sections", "timetable_timeslot", "faculty_department",
+]
+
+
+def _table_exists(cursor, table: str) -> bool:
+    cursor.execute("SHOW TABLES LIKE %s", (table,))
+    return cursor.fetchone() is not None
+
+
+def bulk_insert(cursor, table: str, columns, rows, batch_size: int) -> int:
+    """executemany in batches; mysql-connector rewrites each batch into one multi-row INSERT."""
+    if not rows:
+        return 0
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    values = [tuple(r[c] for c in columns) for r in rows]
+    for i in range(0, len(values), batch_size):
+        cursor.executemany(sql, values[i:i + batch_size])
+    return len(values)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate and bulk-load a synthetic campus.")
+    ap.add_argument("--departments", type=int, default=4)
+    ap.add_argument("--sections", type=int, default=40)
+    ap.add_argument("--subjects-per-section", type=int, default=7)
+    ap.add_argument("--lab-ratio", type=float, default=0.25)
+    ap.add_argument("--faculty-per-department", type=int, default=None)
+    ap.add_argument("--lecture-rooms", type=int, default=None)
+    ap.add_argument("--lab-rooms", type=int, default=None)
+    ap.add_argument("--days", type=int, default=5)
+    ap.add_argument("--periods-per-day", type=int, default=7)
+    ap.add_argument("--unavailability-rate", type=float, default=0.1)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--batch-size", type=int, default=1000)
+    ap.add_argument("--truncate", action="store_true", help="clear the target tables first")
+    ap.add_argument("--dry-run", action="store_true", help="generate and print counts only")
+    args = ap.parse_args()
+
+    t0 = time.monotonic()
+    campus = synthetic_campus(
+        departments=args.departments, sections=args.sections,
+        subjects_per_section=args.subjects_per_section, lab_ratio=args.lab_ratio,
+        faculty_per_department=args.faculty_per_department,
+        lecture_rooms=args.lecture_rooms, lab_rooms=args.lab_rooms,
+        days=args.days, periods_per_day=args.periods_per_day,
+        unavailability_rate=args.unavailability_rate, seed=args.seed,
+    )
+    print(f"Generated campus in {time.monotonic() - t0:.2f}s: " +
+          ", ".join(f"{key}={len(campus[key])}" for _t, _c, key in TABLES))
+    if args.dry_run:
+        return
+
+    conn = get_db_connection()
+    if conn is None:
+        print("❌ Database connection failed.")
+        return
+    cursor = conn.cursor()
+    try:
+        t1 = time.monotonic()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        if args.truncate:
+            for table in TRUNCATE_ORDER:
+                if _table_exists(cursor, table):
+                    cursor.execute(f"DELETE FROM {table}")
+        else:
+            # generated ids start at 1, so refuse to mix with existing rows
+            for table, _c, _k in TABLES:
+                if _table_exists(cursor, table):
+                    cursor.execute(f"SELECT 1 FROM {table} LIMIT 1")
+                    if cursor.fetchone():
+                        print(f"❌ {table} already has rows; re-run with --truncate to replace the data.")
+                        conn.rollback()
+                        return
+        for table, columns, key in TABLES:
+            if not _table_exists(cursor, table):
+                print(f"  skip {table}: table does not exist")
+                continue
+            n = bulk_insert(cursor, table, columns, campus[key], args.batch_size)
+            print(f"  {table}: {n} rows")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        conn.commit()
+        print(f"✅ Seeded in {time.monotonic() - t1:.2f}s")
+    except Error as e:
+        conn.rollback()
+        print(f"❌ Seeding failed (rolled back): {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# services/bulk_import.py
+# Bulk import of reference data (subjects, faculty, rooms, sections, curriculum)
+# from CSV, NDJSON or a JSON array. Rows are parsed as a stream where the format
+# allows it, validated with the same rules as the single-row add_* routes, checked
+# against the DB in a handful of set queries (not one query per row), and written
+# with batched executemany inserts inside one transaction.
+
+import csv
+import io
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+INSERT_BATCH = 1000
+MAX_REPORTED_ERRORS = 200
+
+
+class RowError(ValueError):
+    """A single input row failed validation."""
+
+
+def normalize_room_type(value) -> str:
+    """LAB / LECTURE from free text, same rules as /api/v1/add_room."""
+    rt_in = str(value or "").strip().upper()
+    if "LAB" in rt_in:
+        return "LAB"
+    return "LECTURE"
+
+
+def _required(rec: Dict, *names):
+    """First non-empty value among `names` (aliases), else RowError."""
+    for n in names:
+        v = rec.get(n)
+        if v is not None and str(v).strip() != "":
+            return v.strip() if isinstance(v, str) else v
+    raise RowError(f"{names[0]} is required")
+
+
+def _optional(rec: Dict, name: str, default=None):
+    v = rec.get(name)
+    if v is None or (isinstance(v, str) and v.strip() == ""):
+        return default
+    return v.strip() if isinstance(v, str) else v
+
+
+def _int(value, name: str) -> int:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        raise RowError(f"{name} must be an integer")
+
+
+def _bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in ("0", "false", "no", "n", "")
+    return bool(value)
+
+
+def _subject(rec: Dict) -> Tuple:
+    block = _int(_optional(rec, "contiguous_block_size", 1), "contiguous_block_size")
+    subj_type = str(_optional(rec, "type", "THEORY")).upper()
+    lecture_count = _int(_required(rec, "lecture_count"), "lecture_count")
+    if subj_type == "LAB" and block > 0 and lecture_count % block != 0:
+        raise RowError("lecture_count must be a multiple of contiguous_block_size for LAB subjects")
+    return (str(_required(rec, "subject_code")), str(_required(rec, "subject_name")), lecture_count,
+            str(_required(rec, "department_id", "dept_id")), subj_type, block)
+
+
+def _faculty(rec: Dict) -> Tuple:
+    return (str(_required(rec, "faculty_name", "name")), str(_required(rec, "faculty_id_code")),
+            _optional(rec, "designation"), _optional(rec, "email"),
+            str(_required(rec, "department_id", "dept_id")), _int(_required(rec, "max_load"), "max_load"))
+
+
+def _room(rec: Dict) -> Tuple:
+    return (str(_required(rec, "room_name")), _int(_required(rec, "room_capacity", "capacity"), "capacity"),
+            normalize_room_type(_optional(rec, "room_type", "LECTURE")),
+            1 if _bool(_optional(rec, "is_available", True)) else 0)
+
+
+def _section(rec: Dict) -> Tuple:
+    return (str(_required(rec, "section_name")), str(_required(rec, "dept_id", "department_id")),
+            _int(_required(rec, "student_count"), "student_count"))
+
+
+def _curriculum(rec: Dict) -> Tuple:
+    return (_int(_required(rec, "section_id"), "section_id"), _int(_required(rec, "subject_id"), "subject_id"),
+            _int(_required(rec, "faculty_id"), "faculty_id"))
+
+
+# entity -> table, insert columns, row normalizer, unique key (indexes into the tuple)
+# checked within the file and, through "existing" (one set query), against the table
+ENTITIES: Dict[str, Dict] = {
+    "subjects": {"table": "timetable_subject",
+                 "columns": ("subject_code", "subject_name", "lecture_count", "department_id", "type", "contiguous_block_size"),
+                 "normalize": _subject, "unique": (0,),
+                 "existing": "SELECT subject_code FROM timetable_subject"},
+    "faculty": {"table": "faculty_faculty",
+                "columns": ("name", "faculty_id_code", "designation", "email", "department_id", "max_load"),
+                "normalize": _faculty, "unique": (1,),
+                "existing": "SELECT faculty_id_code FROM faculty_faculty"},
+    "rooms": {"table": "rooms_classroom",
+              "columns": ("room_name", "capacity", "room_type", "is_available"),
+              "normalize": _room, "unique": (0,),
+              "existing": "SELECT room_name FROM rooms_classroom"},
+    "sections": {"table": "sections",
+                 "columns": ("section_name", "dept_id", "student_count"),
+                 "normalize": _section, "unique": (0,),
+                 "existing": "SELECT section_name FROM sections"},
+    "curriculum": {"table": "curriculum",
+                   "columns": ("section_id", "subject_id", "faculty_id"),
+                   "normalize": _curriculum, "unique": (0, 1)},
+}
+
+
+def iter_records(stream, fmt: str) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yield (row_no, record) from a binary stream. fmt: 'csv' (header row required),
+    'ndjson' (one object per line) — both parsed incrementally — or 'json' (an array,
+    or an object with a 'rows' array). row_no is what errors report: the file line a
+    record starts on for CSV (the header is line 1) and NDJSON, the 1-based array
+    position for JSON.
+    """
+    if fmt == "csv":
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        line = 1                        # next record starts after the header...
+        for rec in reader:
+            yield line + 1, rec
+            line = reader.line_num      # ...or after the last line of the previous one (quoted newlines)
+    elif fmt == "ndjson":
+        for line_no, line in enumerate(io.TextIOWrapper(stream, encoding="utf-8"), start=1):
+            if line.strip():
+                yield line_no, json.loads(line)
+    else:
+        payload = json.load(io.TextIOWrapper(stream, encoding="utf-8"))
+        if isinstance(payload, dict):
+            payload = payload.get("rows", [])
+        if not isinstance(payload, list):
+            raise ValueError("JSON import must be an array of objects (or {\"rows\": [...]})")
+        yield from enumerate(payload, start=1)
+
+
+def detect_format(mimetype: str, filename: Optional[str] = None) -> str:
+    name = (filename or "").lower()
+    mt = (mimetype or "").lower()
+    if name.endswith(".csv") or "csv" in mt:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in mt or "jsonlines" in mt:
+        return "ndjson"
+    return "json"
+
+
+def _fold(value):
+    # MySQL's default collations compare case-insensitively and ignore trailing spaces
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+def _unique_key(spec: Dict, values: Tuple) -> Tuple:
+    return tuple(_fold(values[i]) for i in spec["unique"])
+
+
+def validate_rows(entity: str, records: Iterable[Tuple[int, Dict]]) -> Tuple[List[Tuple[int, Tuple]], List[Dict], int]:
+    """Normalize every (row_no, record) from iter_records. Returns ([(row_no, values)], errors, total_rows)."""
+    spec = ENTITIES[entity]
+    normalize: Callable = spec["normalize"]
+    good: List[Tuple[int, Tuple]] = []
+    errors: List[Dict] = []
+    seen = {}
+    total = 0
+    for row_no, rec in records:
+        total += 1
+        try:
+            if not isinstance(rec, dict):
+                raise RowError("row must be an object")
+            values = normalize(rec)
+            key = _unique_key(spec, values)
+            if key in seen:
+                raise RowError(f"duplicate of row {seen[key]}")
+            seen[key] = row_no
+            good.append((row_no, values))
+        except RowError as e:
+            errors.append({"row": row_no, "error": str(e)})
+    return good, errors, total
+
+
+def check_references(cursor, entity: str, rows: List[Tuple[int, Tuple]]) -> Tuple[List[Tuple[int, Tuple]], List[Dict]]:
+    """
+    DB-level checks with one set query per table: names / codes must not exist
+    already; curriculum ids must exist and (section, subject) pairs must not be
+    assigned already.
+    """
+    if not rows:
+        return rows, []
+    if entity != "curriculum":
+        spec = ENTITIES[entity]
+        cursor.execute(spec["existing"])
+        existing = {tuple(_fold(v) for v in r) for r in cursor.fetchall()}
+        ok, errors = [], []
+        for row_no, values in rows:
+            if _unique_key(spec, values) in existing:
+                errors.append({"row": row_no, "error": f"{spec['columns'][spec['unique'][0]]} "
+                                                       f"{values[spec['unique'][0]]!r} already exists"})
+            else:
+                ok.append((row_no, values))
+        return ok, errors
+    cursor.execute("SELECT section_id FROM sections")
+    sections = {r[0] for r in cursor.fetchall()}
+    cursor.execute("SELECT subject_id FROM timetable_subject")
+    subjects = {r[0] for r in cursor.fetchall()}
+    cursor.execute("SELECT faculty_id FROM faculty_faculty")
+    faculty = {r[0] for r in cursor.fetchall()}
+    cursor.execute("SELECT section_id, subject_id FROM curriculum")
+    assigned = {(r[0], r[1]) for r in cursor.fetchall()}
+    ok, errors = [], []
+    for row_no, (sec, sub, fac) in rows:
+        if sec not in sections:
+            errors.append({"row": row_no, "error": f"unknown section_id {sec}"})
+        elif sub not in subjects:
+            errors.append({"row": row_no, "error": f"unknown subject_id {sub}"})
+        elif fac not in faculty:
+            errors.append({"row": row_no, "error": f"unknown faculty_id {fac}"})
+        elif (sec, sub) in assigned:
+            errors.append({"row": row_no, "error": "this subject is already assigned to this section"})
+        else:
+            ok.append((row_no, (sec, sub, fac)))
+    return ok, errors
+
+
+def insert_rows(cursor, entity: str, values: List[Tuple], batch_size: int = INSERT_BATCH) -> int:
+    """Batched executemany (multi-row INSERTs); the caller owns the transaction."""
+    spec = ENTITIES[entity]
+    sql = (f"INSERT INTO {spec['table']} ({', '.join(spec['columns'])}) "
+           f"VALUES ({', '.join(['%s'] * len(spec['columns']))})")
+    for i in range(0, len(values), batch_size):
+        cursor.executemany(sql, values[i:i + batch_size])
+    return len(values)
@@ -39,7 +39,7 @@ def fetch_all_ga_constraints_from_db() -> Dict[str, Any]:
         constraints['rooms'] = cursor.fetchall() 
 
         # --- D. Fetch Time Slots Data (GA's available timeline) ---
-        cursor.execute("SELECT slot_id, day_of_week, TIME_FORMAT(start_time, '%%H:%%i') as start_time, TIME_FORMAT(end_time, '%%H:%%i') as end_time FROM timetable_timeslot;")
+        cursor.execute("SELECT slot_id, day_of_week, TIME_FORMAT(start_time, '%H:%i') as start_time, TIME_FORMAT(end_time, '%H:%i') as end_time FROM timetable_timeslot;")
         constraints['slots'] = cursor.fetchall()
 
         # --- E. Fetch Batch Data (Batch size/Lunch Time Constraint) ---
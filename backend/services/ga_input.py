@@ -0,0 +1,277 @@
+# services/ga_input.py
+# Builds the GA's GAInput from the MySQL tables. Shared by the generate endpoint,
+# the snapshot export (export_snapshot.py) and anything else that needs the
+# solver's view of the database.
+#
+# get_ga_input() keeps the assembled GAInput in a process-level cache. It is
+# dropped by invalidate_ga_input() (called by the write endpoints) and, for
+# writes from other workers or tools, by a data version check: one aggregate
+# query hashing the GA-relevant columns of every source table.
+
+import os
+import threading
+from typing import Dict, Optional
+
+from timetable_ga.models import GAInput, Section, Subject, Room, Faculty
+
+_lock = threading.Lock()
+_schema: Optional[Dict[str, bool]] = None
+_cache: Dict[str, object] = {"data": None, "version": None, "generation": 0}
+
+# table -> GA-relevant columns hashed by data_version()
+VERSION_COLUMNS = {
+    "sections": ("section_id", "section_name", "student_count"),
+    "timetable_subject": ("subject_id", "subject_code", "subject_name", "lecture_count", "type", "contiguous_block_size"),
+    "rooms_classroom": ("room_id", "room_type", "capacity", "is_available"),
+    "faculty_faculty": ("faculty_id", "max_load"),
+    "curriculum": ("section_id", "subject_id", "faculty_id"),
+    "timetable_timeslot": ("slot_id", "day_of_week", "start_time"),
+}
+
+
+# slots starting inside this window (HH:MM, compared as strings) form the lunch window
+LUNCH_START = "10:50"
+LUNCH_END = "13:55"
+
+
+class GAInputError(ValueError):
+    """The DB contents cannot be turned into a solvable GAInput (bad LAB config, empty tables)."""
+
+
+def probe_schema(cursor, refresh: bool = False) -> Dict[str, bool]:
+    """Optional-schema probes (is_usable column, faculty_unavailability table); run once per process."""
+    global _schema
+    if _schema is not None and not refresh:
+        return _schema
+    cursor.execute("SHOW COLUMNS FROM timetable_timeslot LIKE 'is_usable'")
+    has_is_usable = cursor.fetchone() is not None
+    cursor.execute("SHOW TABLES LIKE 'faculty_unavailability'")
+    has_fu = cursor.fetchone() is not None
+    _schema = {"has_is_usable": has_is_usable, "has_faculty_unavailability": has_fu}
+    return _schema
+
+
+def data_version(cursor) -> str:
+    """
+    Cheap signature of everything load_ga_input reads: row count and BIT_XOR of
+    per-row CRC32s for each table, in a single round trip.
+    """
+    schema = probe_schema(cursor)
+    tables = dict(VERSION_COLUMNS)
+    if schema["has_is_usable"]:
+        tables["timetable_timeslot"] = tables["timetable_timeslot"] + ("is_usable",)
+    if schema["has_faculty_unavailability"]:
+        tables["faculty_unavailability"] = ("faculty_id", "slot_id")
+    parts = [
+        f"(SELECT CONCAT(COUNT(*), ':', COALESCE(BIT_XOR(CRC32(CONCAT_WS('|', {', '.join(cols)}))), 0)) FROM {table})"
+        for table, cols in tables.items()
+    ]
+    cursor.execute("SELECT CONCAT_WS('/', " + ", ".join(parts) + ") AS v")
+    row = cursor.fetchone()
+    return str(row["v"] if isinstance(row, dict) else row[0])
+
+
+def get_ga_input(cursor) -> GAInput:
+    """
+    Cached load_ga_input(). With GA_INPUT_VERSION_CHECK=0 the version query is
+    skipped and only invalidate_ga_input() refreshes the cache (single-worker deploys).
+    The returned GAInput is shared: callers must not mutate it.
+    """
+    check = os.environ.get("GA_INPUT_VERSION_CHECK", "1").lower() not in ("0", "false", "no")
+    version = data_version(cursor) if check else None
+    with _lock:
+        data = _cache["data"]
+        if data is not None and (not check or version == _cache["version"]):
+            return data
+        generation = _cache["generation"]
+    data = load_ga_input(cursor)
+    with _lock:
+        # don't store a build that raced with an invalidation
+        if _cache["generation"] == generation:
+            _cache["data"] = data
+            _cache["version"] = version
+    return data
+
+
+def invalidate_ga_input() -> None:
+    """Drop the cached GAInput (call after any write to the tables it is built from)."""
+    with _lock:
+        _cache["data"] = None
+        _cache["version"] = None
+        _cache["generation"] += 1
+
+
+def load_ga_input(cursor) -> GAInput:
+    """Read sections, subjects, rooms, faculty, curriculum, timeslots and
+    unavailability through a dictionary cursor and return the GAInput."""
+    schema = probe_schema(cursor)
+    # ----------------------------
+    # sections
+    # ----------------------------
+    cursor.execute("SELECT section_id, section_name, student_count FROM sections")
+    sec_rows = cursor.fetchall()
+    sections = {
+        r['section_id']: Section(r['section_id'], r['section_name'], int(r['student_count']))
+        for r in sec_rows
+    }
+
+    # ----------------------------
+    # subjects (derive type + block if missing)
+    # ----------------------------
+    cursor.execute("""
+        SELECT 
+            subject_id,
+            COALESCE(lecture_count, 0) AS lecture_count,
+            UPPER(COALESCE(subject_code, '')) AS s_code,
+            UPPER(COALESCE(subject_name, '')) AS s_name,
+            UPPER(COALESCE(type, '')) AS s_type,
+            COALESCE(contiguous_block_size, 0) AS csize
+        FROM timetable_subject
+    """)
+    sub_rows = cursor.fetchall()
+
+    LAB_HINTS = ("LAB", "PRACTICAL", "PRAC", "PR", "WORKSHOP", "WS")
+
+    def _derive(sub):
+        if sub["s_type"] == "LAB":
+            dtype = "LAB"
+        elif sub["s_type"] == "THEORY":
+            dtype = "THEORY"
+        else:
+            text = f'{sub["s_code"]} {sub["s_name"]}'
+            if any(h in text for h in LAB_HINTS) or int(sub["csize"] or 0) >= 2:
+                dtype = "LAB"
+            else:
+                dtype = "THEORY"
+        csize = int(sub["csize"] or 0)
+        if csize <= 0:
+            csize = 2 if dtype == "LAB" else 1
+        return dtype, csize
+
+    subjects = {}
+    for r in sub_rows:
+        dtype, csize = _derive(r)
+        subjects[r["subject_id"]] = Subject(
+            subject_id=r["subject_id"],
+            lecture_count=int(r["lecture_count"]),
+            subj_type=dtype,
+            contiguous_block_size=int(csize)
+        )
+
+    # LAB feasibility quick check
+    for s in subjects.values():
+        if s.subj_type == 'LAB' and (s.lecture_count % s.contiguous_block_size != 0):
+            raise GAInputError(
+                f"Invalid LAB config for subject_id={s.subject_id}: "
+                f"lecture_count ({s.lecture_count}) must be multiple of "
+                f"contiguous_block_size ({s.contiguous_block_size})."
+            )
+
+    # ----------------------------
+    # rooms
+    # ----------------------------
+    cursor.execute("""
+        SELECT room_id, UPPER(room_type) AS room_type, capacity
+        FROM rooms_classroom
+        WHERE is_available = 1
+    """)
+    room_rows = cursor.fetchall()
+
+    def _norm_room(rt: str) -> str:
+        if not rt:
+            return 'LECTURE'
+        u = rt.upper()
+        return 'LAB' if 'LAB' in u else 'LECTURE'
+
+    rooms = {
+        r['room_id']: Room(r['room_id'], _norm_room(r['room_type']), int(r['capacity']))
+        for r in room_rows
+    }
+
+    # ----------------------------
+    # faculty
+    # ----------------------------
+    cursor.execute("SELECT faculty_id, COALESCE(max_load,16) AS max_load FROM faculty_faculty")
+    f_rows = cursor.fetchall()
+    faculty = {r['faculty_id']: Faculty(r['faculty_id'], int(r['max_load'])) for r in f_rows}
+
+    # ----------------------------
+    # curriculum
+    # ----------------------------
+    cursor.execute("SELECT section_id, subject_id, faculty_id FROM curriculum")
+    curriculum = [
+        (int(r['section_id']), int(r['subject_id']), int(r['faculty_id']))
+        for r in cursor.fetchall()
+    ]
+
+    # ----------------------------
+    # timeslots (ordered + usable) — one query gives order, days/periods, usable set and start times
+    # ----------------------------
+    usable_col = ", is_usable" if schema["has_is_usable"] else ""
+    cursor.execute(f"""
+        SELECT slot_id, day_of_week,
+               TIME_FORMAT(start_time,'%H:%i') AS st{usable_col}
+        FROM timetable_timeslot
+        ORDER BY FIELD(day_of_week,'MONDAY','TUESDAY','WEDNESDAY','THURSDAY','FRIDAY','SATURDAY','SUNDAY'),
+                 start_time
+    """)
+    ts_rows = cursor.fetchall()
+    slot_rows = ts_rows
+    slot_order = [int(r["slot_id"]) for r in slot_rows]
+
+    # periods/day and days
+    first_day = ts_rows[0]['day_of_week'] if ts_rows else None
+    periods_per_day = sum(1 for r in ts_rows if r['day_of_week'] == first_day) if first_day else 0
+    days = len({r['day_of_week'] for r in ts_rows})
+
+    # usable set
+    if schema["has_is_usable"]:
+        usable = {int(r['slot_id']) for r in ts_rows if int(r.get('is_usable') or 0) == 1}
+    else:
+        usable = set(slot_order)  # all slots usable by default
+
+    # ----------------------------
+    # compute lunch window slots (10:50 - 13:55) across all days
+    # ----------------------------
+    # NOTE: times in DB are expected as HH:MM (24h). We compare lexicographically.
+    lunch_window_slots = set()
+    # we already fetched slot_rows with start times
+    for r in slot_rows:
+        st = r.get("st") or ""
+        try:
+            sid = int(r.get("slot_id"))
+        except Exception:
+            continue
+        if LUNCH_START <= st <= LUNCH_END:
+            lunch_window_slots.add(sid)
+
+    # ----------------------------
+    # faculty unavailability
+    # ----------------------------
+    fac_unavail = {}
+    if schema["has_faculty_unavailability"]:
+        cursor.execute("SELECT faculty_id, slot_id FROM faculty_unavailability")
+        for r in cursor.fetchall():
+            fid = int(r['faculty_id']); sid = int(r['slot_id'])
+            fac_unavail.setdefault(fid, set()).add(sid)
+
+    if not sections or not subjects or not rooms or not curriculum or not usable:
+        raise GAInputError("Error: Database is empty! Please add Curriculum, Rooms, and Time Slots first.")
+
+    # ----------------------------
+    # GAInput — FINAL (include lunch_slots)
+    # ----------------------------
+    # NOTE: timetable_ga.models.GAInput must be updated to accept lunch_slots parameter (set of slot_ids)
+    return GAInput(
+        sections=sections,
+        subjects=subjects,
+        curriculum=curriculum,
+        rooms=rooms,
+        faculty=faculty,
+        faculty_unavailability=fac_unavail,
+        timeslots_usable=usable,
+        periods_per_day=periods_per_day,
+        days=days,
+        slot_order=slot_order,
+        lunch_slots=lunch_window_slots,   # <-- pass lunch window to GA
+    )
@@ -0,0 +1,188 @@
+# services/occupancy.py
+# Faculty / room timetables and free-room search served from the occupancy matrix
+# (timetable_ga/occupancy.py) instead of the entries table.
+#
+# generate_timetable materializes the matrix for every saved version into
+# timetable_occupancy (zlib-compressed JSON, one row per version). Each worker keeps
+# the published version's matrix in memory together with the display names it
+# needs; a request only touches the DB when the "timetable" read-cache namespace
+# was invalidated or OCCUPANCY_RECHECK seconds (default 5) have passed, and then
+# only to confirm the published version id.
+
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from timetable_ga.encoder import chromosome_from_tuples
+from timetable_ga.models import GAInput
+from timetable_ga.occupancy import Occupancy, build_occupancy
+from services.ga_input import get_ga_input
+from services.timetable_versions import published_version_id
+
+RECHECK_SECONDS = float(os.environ.get("OCCUPANCY_RECHECK", 5))
+
+
+def save_occupancy(conn, version_id: int, occ: Occupancy) -> None:
+    payload = zlib.compress(json.dumps(occ.to_dict(), separators=(",", ":")).encode("utf-8"))
+    cursor = conn.cursor()
+    try:
+        cursor.execute("REPLACE INTO timetable_occupancy (version_id, payload) VALUES (%s, %s)",
+                       (version_id, payload))
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def load_occupancy(cursor, version_id: int) -> Optional[Occupancy]:
+    """Stored matrix for version_id (dictionary cursor), or None if missing or unreadable."""
+    cursor.execute("SELECT payload FROM timetable_occupancy WHERE version_id = %s", (version_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    try:
+        return Occupancy.from_dict(json.loads(zlib.decompress(bytes(row["payload"]))))
+    except (ValueError, KeyError, zlib.error):
+        return None   # older/unreadable format: caller rebuilds it from the entries
+
+
+def occupancy_from_entries(cursor, data: GAInput, version_id: int) -> Occupancy:
+    """
+    Rebuild the matrix of a version saved without one (e.g. before this table
+    existed). Entries store a lab's first slot, so block sizes come from the subject.
+    """
+    cursor.execute("""
+        SELECT TTE.student_batch_id, TTE.subject_id, TTE.faculty_id, TTE.classroom_id, TTE.time_slot_id
+        FROM timetable_timetableentry AS TTE
+        WHERE TTE.version_id = %s
+    """, (version_id,))
+    genes = []
+    for r in cursor.fetchall():
+        sub = data.subjects.get(int(r["subject_id"]))
+        block = int(sub.contiguous_block_size or 1) if sub is not None and sub.kind() == "LAB" else 1
+        genes.append([r["student_batch_id"], r["subject_id"], r["faculty_id"], r["classroom_id"],
+                      r["time_slot_id"], block])
+    return build_occupancy(data, chromosome_from_tuples(genes, data))
+
+
+def _labels(cursor) -> Dict[str, Dict]:
+    """Display names for everything a cell references, one query per table."""
+    cursor.execute("SELECT section_id, section_name FROM sections")
+    sections = {int(r["section_id"]): r["section_name"] for r in cursor.fetchall()}
+    cursor.execute("SELECT subject_id, subject_code, subject_name FROM timetable_subject")
+    subjects = {int(r["subject_id"]): (r["subject_code"], r["subject_name"]) for r in cursor.fetchall()}
+    cursor.execute("SELECT faculty_id, name FROM faculty_faculty")
+    faculty = {int(r["faculty_id"]): r["name"] for r in cursor.fetchall()}
+    cursor.execute("SELECT room_id, room_name FROM rooms_classroom")
+    rooms = {int(r["room_id"]): r["room_name"] for r in cursor.fetchall()}
+    cursor.execute("""
+        SELECT slot_id, day_of_week, TIME_FORMAT(start_time, '%H:%i') AS start_time,
+               TIME_FORMAT(end_time, '%H:%i') AS end_time
+        FROM timetable_timeslot
+    """)
+    slots = {int(r["slot_id"]): (r["day_of_week"], r["start_time"], r["end_time"]) for r in cursor.fetchall()}
+    return {"sections": sections, "subjects": subjects, "faculty": faculty, "rooms": rooms, "slots": slots}
+
+
+class OccupancyView:
+    """The published version's matrix plus names, shaped into API payloads."""
+
+    def __init__(self, version_id: int, occ: Occupancy, labels: Dict[str, Dict]):
+        self.version_id = version_id
+        self.occ = occ
+        self.labels = labels
+        pday = occ.periods_per_day
+        self.day_names = [labels["slots"].get(occ.slot_at(d * pday), (None,))[0] or str(d + 1)
+                          for d in range(occ.days)]
+
+    def day_index(self, day: str) -> Optional[int]:
+        """0-based day from a name (TUESDAY) or a 1-based number."""
+        day = str(day).strip().upper()
+        if day.isdigit():
+            return int(day) - 1
+        return self.day_names.index(day) if day in self.day_names else None
+
+    def _cell(self, pos: int, section_id: int, subject_id: int) -> Dict:
+        slot_id = self.occ.slot_at(pos)
+        dow, start, end = self.labels["slots"].get(slot_id, (None, None, None))
+        code, name = self.labels["subjects"].get(subject_id, (None, None))
+        return {"day_of_week": dow, "period": pos % self.occ.periods_per_day + 1, "slot_id": slot_id,
+                "start_time": start, "end_time": end, "section_id": section_id,
+                "section_name": self.labels["sections"].get(section_id),
+                "subject_code": code, "subject_name": name}
+
+    def faculty_timetable(self, faculty_id: int) -> Dict:
+        cells = []
+        for pos, sec, sub, room in self.occ.faculty_week(faculty_id):
+            c = self._cell(pos, sec, sub)
+            c.update(room_id=room, room_name=self.labels["rooms"].get(room))
+            cells.append(c)
+        return {"faculty_id": faculty_id, "name": self.labels["faculty"].get(faculty_id),
+                "version_id": self.version_id, "periods": len(cells), "cells": cells}
+
+    def room_timetable(self, room_id: int) -> Dict:
+        cells = []
+        for pos, sec, sub, fac in self.occ.room_week(room_id):
+            c = self._cell(pos, sec, sub)
+            c.update(faculty_id=fac, faculty_name=self.labels["faculty"].get(fac))
+            cells.append(c)
+        return {"room_id": room_id, "room_name": self.labels["rooms"].get(room_id),
+                "version_id": self.version_id, "periods": len(cells), "cells": cells}
+
+    def free_rooms(self, day: int, period: int, span: int = 1, rtype: Optional[str] = None,
+                   min_capacity: int = 0) -> List[Dict]:
+        """day and period 0-based."""
+        return [{"room_id": rid, "room_name": self.labels["rooms"].get(rid),
+                 "room_type": self.occ.room_meta[rid][0], "capacity": self.occ.room_meta[rid][1]}
+                for rid in self.occ.free_rooms(day, period, span, rtype, min_capacity)]
+
+
+class OccupancyStore:
+    """Per-process holder of the published version's OccupancyView."""
+
+    def __init__(self, recheck: float = RECHECK_SECONDS):
+        self.recheck = recheck
+        self._lock = threading.Lock()
+        self._view: Optional[OccupancyView] = None
+        self._generation = None
+        self._checked = 0.0
+
+    def fresh(self, generation: int) -> Optional[OccupancyView]:
+        """The held view if nothing was invalidated and it was confirmed recently (no DB work)."""
+        with self._lock:
+            if (self._view is not None and self._generation == generation
+                    and time.monotonic() - self._checked < self.recheck):
+                return self._view
+        return None
+
+    def load(self, conn, generation: int) -> Optional[OccupancyView]:
+        """
+        Confirm the published version and (re)load its matrix and names if needed.
+        Versions without a stored matrix are rebuilt from their entries once and saved.
+        None when nothing is published.
+        """
+        cursor = conn.cursor(dictionary=True)
+        try:
+            version_id = published_version_id(cursor)
+            with self._lock:
+                view = self._view
+                if view is not None and view.version_id == version_id and self._generation == generation:
+                    self._checked = time.monotonic()
+                    return view
+            if version_id is None:
+                return None
+            occ = load_occupancy(cursor, version_id)
+            if occ is None:
+                occ = occupancy_from_entries(cursor, get_ga_input(cursor), version_id)
+                save_occupancy(conn, version_id, occ)
+            view = OccupancyView(version_id, occ, _labels(cursor))
+            with self._lock:
+                self._view, self._generation, self._checked = view, generation, time.monotonic()
+            return view
+        finally:
+            cursor.close()
+
+
+occupancy_store = OccupancyStore()
@@ -0,0 +1,266 @@
+# services/timetable_export.py
+# Whole-campus export of the published timetable as NDJSON, CSV or iCalendar.
+# Rows are read in keyset pages of FETCH_CHUNK (WHERE (entity, day, start, entry) >
+# last row ... LIMIT FETCH_CHUNK), each on a connection borrowed for that one query
+# and returned before the page is formatted and yielded, so memory stays flat and a
+# slow download never pins a pooled connection. Every page reads the version that
+# was published when the export started.
+
+import csv
+import datetime
+import io
+import json
+import os
+from typing import Callable, Dict, Iterator, Optional
+from zoneinfo import ZoneInfo
+
+from services.timetable_grid import slot_layout, block_end
+from services.timetable_versions import published_version_id
+
+FETCH_CHUNK = 1000
+
+# iCalendar events are local times in this zone (TZID + VTIMEZONE), not floating
+EXPORT_TZ = os.environ.get("TIMETABLE_TZ", "Asia/Kolkata")
+
+# by -> (id column, name column) in the export query
+GROUPINGS = {
+    "section": ("section_id", "section_name"),
+    "faculty": ("faculty_id", "faculty_name"),
+    "room": ("room_id", "room_name"),
+}
+
+CSV_COLUMNS = ("section_id", "section_name", "day_of_week", "start_time", "end_time", "subject_code",
+               "subject_name", "faculty_id", "faculty_name", "room_id", "room_name", "room_type")
+
+DAY_OFFSET = {"MONDAY": 0, "TUESDAY": 1, "WEDNESDAY": 2, "THURSDAY": 3, "FRIDAY": 4, "SATURDAY": 5, "SUNDAY": 6}
+ICAL_DAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+_GROUP_SQL = {"section": "SEC.section_id", "faculty": "FAC.faculty_id", "room": "CR.room_id"}
+
+# Per-section timetable reads (see migrations.py 0001/0002). STRAIGHT_JOIN drives the
+# join from the timeslots in idx_slot_day_start (day_index, start_time) order and
+# probes idx_tte_section_cover per slot, so rows come out sorted with no filesort.
+# Nothing derived is stored, so timeslots written by any tool sort correctly.
+# mysql-connector only substitutes %s, so TIME_FORMAT patterns use a single %.
+_TIMETABLE_SELECT = """
+    SELECT STRAIGHT_JOIN
+        TS.day_of_week,
+        TIME_FORMAT(TS.start_time, '%H:%i') AS start_time,
+        TIME_FORMAT(TS.end_time, '%H:%i') AS end_time,
+        SUB.subject_code, SUB.subject_name, FAC.name AS faculty_name,
+        CR.room_name, CR.room_type
+    FROM timetable_publish AS PUB
+    JOIN timetable_timeslot AS TS
+    JOIN timetable_timetableentry AS TTE
+         ON TTE.version_id = PUB.version_id AND TTE.time_slot_id = TS.slot_id
+    JOIN timetable_subject AS SUB ON TTE.subject_id = SUB.subject_id
+    JOIN faculty_faculty AS FAC ON TTE.faculty_id = FAC.faculty_id
+    JOIN rooms_classroom AS CR ON TTE.classroom_id = CR.room_id
+"""
+
+SECTION_TIMETABLE_SQL = _TIMETABLE_SELECT + """
+    WHERE PUB.id = 1 AND TTE.student_batch_id = %s
+    ORDER BY TS.day_index, TS.start_time
+"""
+
+DEPT_BATCH_TIMETABLE_SQL = _TIMETABLE_SELECT + """
+    JOIN sections AS SEC ON TTE.student_batch_id = SEC.section_id
+    WHERE PUB.id = 1 AND SEC.dept_id = %s AND TTE.student_batch_id = %s
+    ORDER BY TS.day_index, TS.start_time
+"""
+
+
+def export_query(by: str, version_id: int, entity_id: Optional[int] = None, after: Optional[tuple] = None):
+    """
+    (sql, params) for one page of `version_id` ordered by entity, day, start time:
+    the FETCH_CHUNK rows after the `after` keyset (page_key, page_day, start_time,
+    page_entry of the previous page's last row), or the first page.
+    """
+    key = _GROUP_SQL[by]
+    where, params = ["TTE.version_id = %s"], [version_id]
+    if entity_id is not None:
+        where.append(f"{key} = %s")
+        params.append(entity_id)
+    if after is not None:
+        where.append(f"({key}, TS.day_index, TS.start_time, TTE.entry_id) > (%s, %s, %s, %s)")
+        params.extend(after)
+    sql = f"""
+        SELECT SEC.section_id, SEC.section_name,
+               FAC.faculty_id, FAC.name AS faculty_name,
+               CR.room_id, CR.room_name, CR.room_type,
+               SUB.subject_code, SUB.subject_name,
+               TS.day_of_week, TS.start_time, TS.end_time,
+               {key} AS page_key, TS.day_index AS page_day, TTE.entry_id AS page_entry,
+               TTE.time_slot_id AS page_slot, SUB.contiguous_block_size AS page_block
+        FROM timetable_timetableentry AS TTE
+        JOIN sections AS SEC ON TTE.student_batch_id = SEC.section_id
+        JOIN timetable_subject AS SUB ON TTE.subject_id = SUB.subject_id
+        JOIN faculty_faculty AS FAC ON TTE.faculty_id = FAC.faculty_id
+        JOIN rooms_classroom AS CR ON TTE.classroom_id = CR.room_id
+        JOIN timetable_timeslot AS TS ON TTE.time_slot_id = TS.slot_id
+        WHERE {" AND ".join(where)}
+        ORDER BY {key}, TS.day_index, TS.start_time, TTE.entry_id
+        LIMIT {int(FETCH_CHUNK)}
+    """
+    return sql, tuple(params)
+
+
+def export_rows(connect: Callable, by: str, entity_id: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Published rows in export order. connect() returns a connection (raising if none is
+    available); it is called once per page and the connection closed right after.
+    A lab block is stored once, at its first slot; its end_time is that of the slot
+    contiguous_block_size - 1 periods later the same day (as in the weekly grid).
+    """
+    version_id, after, layout = None, None, None
+    while True:
+        conn = connect()
+        try:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                if version_id is None:
+                    version_id = published_version_id(cursor)
+                    if version_id is None:
+                        return
+                    layout = slot_layout(cursor)
+                cursor.execute(*export_query(by, version_id, entity_id, after))
+                page = cursor.fetchall()
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+        for r in page:
+            after = (r.pop("page_key"), r.pop("page_day"), r["start_time"], r.pop("page_entry"))
+            slot, block = r.pop("page_slot"), int(r.pop("page_block") or 1)
+            r["start_time"] = _hhmm(r["start_time"])
+            r["end_time"] = _hhmm(r["end_time"])
+            if block > 1:
+                r["end_time"] = block_end(layout, slot, block) or r["end_time"]
+            yield r
+        if len(page) < FETCH_CHUNK:
+            return
+
+
+def _hhmm(value) -> str:
+    # TIME columns come back as timedelta from mysql-connector
+    if isinstance(value, datetime.timedelta):
+        minutes = int(value.total_seconds()) // 60
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+    return str(value)[:5]
+
+
+def stream_ndjson(rows: Iterator[Dict]) -> Iterator[str]:
+    buf = []
+    for r in rows:
+        buf.append(json.dumps(r, default=str))
+        if len(buf) >= FETCH_CHUNK:
+            yield "\n".join(buf) + "\n"
+            buf = []
+    if buf:
+        yield "\n".join(buf) + "\n"
+
+
+def stream_csv(rows: Iterator[Dict]) -> Iterator[str]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    n = 0
+    for r in rows:
+        writer.writerow([r[c] for c in CSV_COLUMNS])
+        n += 1
+        if n % FETCH_CHUNK == 0:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue()
+
+
+def _ical_escape(text) -> str:
+    return (str(text or "").replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """RFC 5545 3.1: content lines longer than 75 octets continue on lines starting with a space."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(raw):
+        end = min(start + limit, len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:
+            end -= 1   # never split a UTF-8 sequence
+        parts.append(raw[start:end].decode("utf-8"))
+        start, limit = end, 74   # continuation lines spend one octet on the leading space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _offset(delta: datetime.timedelta) -> str:
+    minutes = int(delta.total_seconds()) // 60
+    sign = "-" if minutes < 0 else "+"
+    return f"{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+
+def _vtimezone(tzid: str, around: datetime.date) -> str:
+    """VTIMEZONE with every UTC-offset change from a year before `around` to two years after."""
+    tz = ZoneInfo(tzid)
+    utc = datetime.timezone.utc
+    t = datetime.datetime(around.year - 1, 1, 1, tzinfo=utc)
+    end = datetime.datetime(around.year + 3, 1, 1, tzinfo=utc)
+    first = t.astimezone(tz)
+    comps = [("DAYLIGHT" if first.dst() else "STANDARD", "19700101T000000",
+              first.utcoffset(), first.utcoffset(), first.tzname())]
+    prev = first.utcoffset()
+    while t < end:
+        nxt = t + datetime.timedelta(days=1)
+        if nxt.astimezone(tz).utcoffset() != prev:
+            while t.astimezone(tz).utcoffset() == prev:   # the hour of the change
+                t += datetime.timedelta(hours=1)
+            local = t.astimezone(tz)
+            comps.append(("DAYLIGHT" if local.dst() else "STANDARD",
+                          (t + prev).strftime("%Y%m%dT%H%M%S"), prev, local.utcoffset(), local.tzname()))
+            prev = local.utcoffset()
+            nxt = t
+        t = nxt
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{tzid}"]
+    for kind, start, frm, to, name in comps:
+        lines += [f"BEGIN:{kind}", f"DTSTART:{start}", f"TZOFFSETFROM:{_offset(frm)}",
+                  f"TZOFFSETTO:{_offset(to)}", f"TZNAME:{name}", f"END:{kind}"]
+    lines.append("END:VTIMEZONE")
+    return "".join(_fold(line) for line in lines)
+
+
+def stream_ical(rows: Iterator[Dict], by: str, week_start: datetime.date, stamp: str,
+                tzid: str = EXPORT_TZ) -> Iterator[str]:
+    """
+    One VCALENDAR; every entry is a weekly recurring VEVENT anchored in the week of
+    `week_start` (a Monday), in local time of `tzid`. CATEGORIES carries the grouping
+    entity's name so a whole-campus feed can be split client-side; with ?id= it is a
+    single entity's feed.
+    """
+    _id_col, name_col = GROUPINGS[by]
+    yield ("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//SamaySudarshan//Timetable Export//EN\r\n"
+           f"CALSCALE:GREGORIAN\r\nX-WR-CALNAME:Timetable by {by}\r\n") + _vtimezone(tzid, week_start)
+    lines = []
+    n = 0
+    for r in rows:
+        offset = DAY_OFFSET.get((r["day_of_week"] or "").upper(), 0)
+        day = (week_start + datetime.timedelta(days=offset)).strftime("%Y%m%d")
+        lines.extend(_fold(line) for line in (
+            "BEGIN:VEVENT",
+            f"UID:{r['section_id']}-{r['day_of_week']}-{r['start_time'].replace(':', '')}-{r['subject_code']}@samaysudarshan",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;TZID={tzid}:{day}T{r['start_time'].replace(':', '')}00",
+            f"DTEND;TZID={tzid}:{day}T{r['end_time'].replace(':', '')}00",
+            f"RRULE:FREQ=WEEKLY;BYDAY={ICAL_DAYS[offset]}",
+            f"SUMMARY:{_ical_escape(r['subject_code'])} {_ical_escape(r['subject_name'])}",
+            f"LOCATION:{_ical_escape(r['room_name'])}",
+            f"DESCRIPTION:{_ical_escape(r['section_name'])} / {_ical_escape(r['faculty_name'])}",
+            f"CATEGORIES:{_ical_escape(r[name_col])}",
+            "END:VEVENT",
+        ))
+        n += 1
+        if n % FETCH_CHUNK == 0:
+            yield "".join(lines)
+            lines = []
+    yield "".join(lines) + "END:VCALENDAR\r\n"
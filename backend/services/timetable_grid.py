@@ -0,0 +1,162 @@
+# services/timetable_grid.py
+# Pre-rendered weekly grid for the timetable views (?format=grid).
+#
+# Instead of one flat row per entry with the subject / faculty / room strings
+# repeated, a grid carries each string once in small lookup tables and a
+# days x periods matrix of indexes into them:
+#
+#   {"format": "grid", "days": ["MONDAY", ...],
+#    "day_periods": [[{"start": "09:00", "end": "09:55", "lunch_window": false}, ...] per day],
+#    "periods": the shared column headers when every day has the same period times, else null,
+#    "subjects": [[code, name, "LAB"|"THEORY"], ...], "faculty": [name, ...],
+#    "rooms": [[name, room_type], ...],
+#    "cells": [[cell, ...] per period] per day, "entries": n}
+#
+# Periods are positions within the day by start_time, so slots added later by any
+# tool land in the right column. cell: null (free), "L" (the section's lunch break
+# that day), "<" (covered by the lab block to its left) or a list of
+# [subject, faculty, room, span] where span is the number of periods the session
+# covers (labs > 1).
+#
+# Grids for every section are built in one query after generation and kept in the
+# read cache; other workers build a single section's grid on first request.
+
+from typing import Dict, List, Optional, Tuple
+
+from services.ga_input import LUNCH_START, LUNCH_END
+
+LUNCH = "L"
+COVERED = "<"
+
+_GRID_SQL = """
+    SELECT PUB.version_id, TTE.student_batch_id AS section_id, TTE.time_slot_id,
+           SUB.subject_code, SUB.subject_name, SUB.type, SUB.contiguous_block_size,
+           FAC.name AS faculty_name, CR.room_name, CR.room_type
+    FROM timetable_publish AS PUB
+    JOIN timetable_timetableentry AS TTE ON TTE.version_id = PUB.version_id
+    JOIN timetable_timeslot AS TS ON TTE.time_slot_id = TS.slot_id
+    JOIN timetable_subject AS SUB ON TTE.subject_id = SUB.subject_id
+    JOIN faculty_faculty AS FAC ON TTE.faculty_id = FAC.faculty_id
+    JOIN rooms_classroom AS CR ON TTE.classroom_id = CR.room_id
+"""
+
+
+def _minutes(hhmm: str) -> int:
+    h, m = hhmm.split(":")[:2]
+    return int(h) * 60 + int(m)
+
+
+class GridError(ValueError):
+    """An entry's slot is not in the layout (timeslots changed between the two queries)."""
+
+
+def slot_layout(cursor) -> Dict:
+    """Days, per-day period times and slot_id -> (day, period) from timetable_timeslot (dictionary cursor)."""
+    cursor.execute("""
+        SELECT slot_id, day_of_week, day_index,
+               TIME_FORMAT(start_time, '%H:%i') AS start_time, TIME_FORMAT(end_time, '%H:%i') AS end_time
+        FROM timetable_timeslot
+        ORDER BY day_index, timetable_timeslot.start_time, slot_id
+    """)
+    days: List[str] = []
+    day_periods: List[List[Dict]] = []
+    slot_pos: Dict[int, Tuple[int, int]] = {}
+    last_day = object()
+    for r in cursor.fetchall():
+        if r["day_index"] != last_day:
+            last_day = r["day_index"]
+            days.append(r["day_of_week"])
+            day_periods.append([])
+        slot_pos[int(r["slot_id"])] = (len(days) - 1, len(day_periods[-1]))
+        day_periods[-1].append({
+            "start": r["start_time"], "end": r["end_time"],
+            "lunch_window": LUNCH_START <= (r["start_time"] or "") <= LUNCH_END,
+        })
+    uniform = all(dp == day_periods[0] for dp in day_periods)
+    return {"days": days, "day_periods": day_periods, "slot_pos": slot_pos,
+            "periods": day_periods[0] if day_periods and uniform else None}
+
+
+def block_end(layout: Dict, slot_id: int, block: int) -> Optional[str]:
+    """End time of a `block`-period session starting at slot_id (clamped to its day), None if unknown."""
+    pos = layout["slot_pos"].get(int(slot_id))
+    if pos is None:
+        return None
+    d, p = pos
+    periods = layout["day_periods"][d]
+    return periods[min(p + max(1, block) - 1, len(periods) - 1)]["end"]
+
+
+def _lunch_period(day_cells: List, periods: List[Dict]) -> Optional[int]:
+    """The free lunch-window period nearest the middle of the window, if any."""
+    mid = (_minutes(LUNCH_START) + _minutes(LUNCH_END)) / 2
+    free = [p for p, info in enumerate(periods) if info["lunch_window"] and day_cells[p] is None]
+    if not free:
+        return None
+    return min(free, key=lambda p: abs(_minutes(periods[p]["start"]) - mid))
+
+
+def build_grid(layout: Dict, rows: List[Dict]) -> Dict:
+    """Grid payload for one section from its entry rows (see _GRID_SQL)."""
+    cells: List[List] = [[None] * len(dp) for dp in layout["day_periods"]]
+    subjects, faculty, rooms = [], [], []
+    s_idx, f_idx, r_idx = {}, {}, {}
+
+    def index(table, lookup, key):
+        if key not in lookup:
+            lookup[key] = len(table)
+            table.append(list(key) if isinstance(key, tuple) else key)
+        return lookup[key]
+
+    for r in rows:
+        pos = layout["slot_pos"].get(int(r["time_slot_id"]))
+        if pos is None:
+            raise GridError(f"Timeslot {r['time_slot_id']} is missing from the slot layout; retry.")
+        d, p = pos
+        kind = "LAB" if (r["type"] or "").upper() == "LAB" or int(r["contiguous_block_size"] or 1) > 1 else "THEORY"
+        span = min(int(r["contiguous_block_size"] or 1) if kind == "LAB" else 1, len(cells[d]) - p)
+        entry = [index(subjects, s_idx, (r["subject_code"], r["subject_name"], kind)),
+                 index(faculty, f_idx, r["faculty_name"]),
+                 index(rooms, r_idx, (r["room_name"], r["room_type"])),
+                 span]
+        if not isinstance(cells[d][p], list):
+            cells[d][p] = []
+        cells[d][p].append(entry)
+        for k in range(1, span):
+            if cells[d][p + k] is None:
+                cells[d][p + k] = COVERED
+
+    for day_cells, periods in zip(cells, layout["day_periods"]):
+        lunch = _lunch_period(day_cells, periods)
+        if lunch is not None:
+            day_cells[lunch] = LUNCH
+
+    return {"format": "grid", "version_id": rows[0]["version_id"] if rows else None,
+            "days": layout["days"], "day_periods": layout["day_periods"], "periods": layout["periods"],
+            "subjects": subjects, "faculty": faculty, "rooms": rooms, "cells": cells, "entries": len(rows)}
+
+
+def section_grids(cursor, section_id: Optional[int] = None, dept_id: Optional[str] = None) -> Dict[int, Dict]:
+    """
+    section_id -> grid for the published timetable: every section (one query, used
+    to warm the cache after generation) or just `section_id`, optionally checked
+    against `dept_id`. A requested section with no entries gets an empty grid.
+    """
+    layout = slot_layout(cursor)
+    sql, params = _GRID_SQL, []
+    if dept_id is not None:
+        sql += " JOIN sections AS SEC ON TTE.student_batch_id = SEC.section_id"
+    sql += " WHERE PUB.id = 1"
+    if section_id is not None:
+        sql += " AND TTE.student_batch_id = %s"
+        params.append(section_id)
+    if dept_id is not None:
+        sql += " AND SEC.dept_id = %s"
+        params.append(dept_id)
+    cursor.execute(sql + " ORDER BY TTE.student_batch_id, TS.day_index, TS.start_time", tuple(params) or None)
+    by_section: Dict[int, List[Dict]] = {}
+    for r in cursor.fetchall():
+        by_section.setdefault(int(r["section_id"]), []).append(r)
+    if section_id is not None:
+        by_section.setdefault(int(section_id), [])
+    return {sid: build_grid(layout, rows) for sid, rows in by_section.items()}
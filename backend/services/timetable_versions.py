@@ -0,0 +1,271 @@
+# services/timetable_versions.py
+# Versioned timetable storage. Each generation writes its rows under a new
+# version_id (batched multi-row inserts, small commits) while readers keep seeing
+# the published version; publishing is a single-row pointer update, so the switch
+# is atomic and readers never see an empty or half-written timetable. Older
+# versions stay available for rollback until gc_versions() removes them.
+#
+# Readers select the live rows with:
+#   JOIN timetable_publish AS PUB ON PUB.id = 1 AND TTE.version_id = PUB.version_id
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+ENTRY_COLUMNS = ("subject_id", "faculty_id", "classroom_id", "time_slot_id", "student_batch_id")
+
+# versions kept (published one included) before gc_versions() deletes older ones
+DEFAULT_KEEP = int(os.environ.get("TIMETABLE_KEEP_VERSIONS", 5))
+INSERT_BATCH = int(os.environ.get("TIMETABLE_INSERT_BATCH", 1000))
+# a version still 'building' this long after created_at belongs to a save that died
+# (worker killed, connection lost) and is reaped by gc_versions()
+BUILDING_TTL = float(os.environ.get("TIMETABLE_BUILDING_TTL", 3600))
+
+# MySQL named lock held by whoever is solving + saving a new version (the
+# generate endpoint, manage.py solve_timetable), so runs never overlap
+GENERATE_LOCK_NAME = "samaysudarshan_generate"
+
+_schema_ready = False
+
+
+def ensure_schema(conn) -> None:
+    """
+    Create the version tables and the timetable_timetableentry.version_id column if
+    missing. Rows saved before versioning become the first (published) version.
+    Idempotent; runs its probes once per process.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS timetable_version (
+                version_id INT AUTO_INCREMENT PRIMARY KEY,
+                status VARCHAR(16) NOT NULL DEFAULT 'building',
+                entry_count INT NOT NULL DEFAULT 0,
+                fitness DOUBLE NULL,
+                fingerprint CHAR(64) NULL,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                published_at DATETIME NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS timetable_publish (
+                id TINYINT PRIMARY KEY,
+                version_id INT NULL,
+                published_at DATETIME NULL
+            )
+        """)
+        # per-version faculty/room occupancy matrix (services/occupancy.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS timetable_occupancy (
+                version_id INT PRIMARY KEY,
+                payload MEDIUMBLOB NOT NULL
+            )
+        """)
+        cursor.execute("SHOW COLUMNS FROM timetable_timetableentry LIKE 'version_id'")
+        if cursor.fetchone() is None:
+            cursor.execute("ALTER TABLE timetable_timetableentry ADD COLUMN version_id INT NULL, "
+                           "ADD INDEX idx_tte_version_batch (version_id, student_batch_id)")
+        cursor.execute("SELECT version_id FROM timetable_publish WHERE id = 1")
+        if cursor.fetchone() is None:
+            cursor.execute("SELECT COUNT(*) FROM timetable_timetableentry WHERE version_id IS NULL")
+            legacy = cursor.fetchone()[0]
+            version_id = None
+            if legacy:
+                cursor.execute("INSERT INTO timetable_version (status, entry_count, published_at) "
+                               "VALUES ('published', %s, NOW())", (legacy,))
+                version_id = cursor.lastrowid
+                cursor.execute("UPDATE timetable_timetableentry SET version_id = %s WHERE version_id IS NULL",
+                               (version_id,))
+            cursor.execute("INSERT INTO timetable_publish (id, version_id, published_at) VALUES (1, %s, NOW())",
+                           (version_id,))
+        conn.commit()
+        _schema_ready = True
+    finally:
+        cursor.close()
+
+
+def create_version(conn, fitness: Optional[float] = None, fingerprint: Optional[str] = None) -> int:
+    """Register a new (unpublished) version and return its id."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("INSERT INTO timetable_version (status, fitness, fingerprint) VALUES ('building', %s, %s)",
+                       (fitness, fingerprint))
+        version_id = cursor.lastrowid
+        conn.commit()
+        return version_id
+    finally:
+        cursor.close()
+
+
+def write_entries(conn, version_id: int, values: Sequence[tuple], batch_size: int = INSERT_BATCH) -> int:
+    """
+    Insert (subject_id, faculty_id, classroom_id, time_slot_id, student_batch_id)
+    rows under version_id. executemany turns each batch into one multi-row INSERT;
+    committing per batch keeps transactions (and undo) small. Nothing is visible to
+    readers until publish_version().
+    """
+    sql = (f"INSERT INTO timetable_timetableentry ({', '.join(ENTRY_COLUMNS)}, version_id) "
+           f"VALUES ({', '.join(['%s'] * (len(ENTRY_COLUMNS) + 1))})")
+    cursor = conn.cursor()
+    try:
+        for i in range(0, len(values), batch_size):
+            cursor.executemany(sql, [tuple(v) + (version_id,) for v in values[i:i + batch_size]])
+            conn.commit()
+        mark_ready(conn, version_id, len(values))
+        return len(values)
+    except Exception:
+        conn.rollback()
+        mark_failed(conn, version_id)
+        raise
+    finally:
+        cursor.close()
+
+
+def mark_ready(conn, version_id: int, entry_count: int) -> None:
+    """All rows of version_id are written; it can be published."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("UPDATE timetable_version SET status = 'ready', entry_count = %s WHERE version_id = %s",
+                       (entry_count, version_id))
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def mark_failed(conn, version_id: int) -> None:
+    """Best-effort: flag a build that died half-way so gc_versions() removes it."""
+    _mark(conn, version_id, "failed")
+
+
+def publishable(hard_breakdown: Optional[Dict]) -> bool:
+    """
+    Whether a freshly solved timetable may go live: only with no hard violations.
+    Used by the generate endpoint and manage.py solve_timetable alike; an infeasible
+    one is saved unpublished and can still be published by hand after inspection.
+    """
+    return not hard_breakdown
+
+
+def publish_version(conn, version_id: int) -> Optional[int]:
+    """
+    Atomically point readers at version_id (one transaction: pointer row + statuses).
+    Returns the previously published version id. Raises ValueError for unknown or
+    unfinished versions.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT status FROM timetable_version WHERE version_id = %s", (version_id,))
+        row = cursor.fetchone()
+        if row is None or row[0] not in ("ready", "published", "archived"):
+            raise ValueError(f"Timetable version {version_id} is not available for publishing.")
+        cursor.execute("SELECT version_id FROM timetable_publish WHERE id = 1 FOR UPDATE")
+        prev = cursor.fetchone()
+        prev_id = prev[0] if prev else None
+        cursor.execute("INSERT INTO timetable_publish (id, version_id, published_at) VALUES (1, %s, NOW()) "
+                       "ON DUPLICATE KEY UPDATE version_id = VALUES(version_id), published_at = NOW()", (version_id,))
+        if prev_id is not None and prev_id != version_id:
+            cursor.execute("UPDATE timetable_version SET status = 'archived' WHERE version_id = %s", (prev_id,))
+        cursor.execute("UPDATE timetable_version SET status = 'published', published_at = NOW() WHERE version_id = %s",
+                       (version_id,))
+        conn.commit()
+        return prev_id
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def published_version_id(cursor) -> Optional[int]:
+    cursor.execute("SELECT version_id FROM timetable_publish WHERE id = 1")
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row["version_id"] if isinstance(row, dict) else row[0]
+
+
+def published_version(cursor) -> Optional[Dict]:
+    """The live version's id and input fingerprint (dictionary cursor), or None."""
+    cursor.execute("""
+        SELECT V.version_id, V.fingerprint
+        FROM timetable_publish AS PUB
+        JOIN timetable_version AS V ON V.version_id = PUB.version_id
+        WHERE PUB.id = 1
+    """)
+    return cursor.fetchone()
+
+
+def list_versions(cursor, limit: int = 50) -> List[Dict]:
+    """Newest-first versions (dictionary cursor)."""
+    cursor.execute("""
+        SELECT V.version_id, V.status, V.entry_count, V.fitness, V.fingerprint,
+               V.created_at, V.published_at, (PUB.version_id IS NOT NULL) AS is_live
+        FROM timetable_version AS V
+        LEFT JOIN timetable_publish AS PUB ON PUB.id = 1 AND PUB.version_id = V.version_id
+        ORDER BY V.version_id DESC
+        LIMIT %s
+    """, (int(limit),))
+    return cursor.fetchall()
+
+
+def gc_versions(conn, keep: int = DEFAULT_KEEP, batch_size: int = 5000,
+                building_ttl: float = BUILDING_TTL) -> List[int]:
+    """
+    Delete all but the newest `keep` finished versions (never the published one),
+    plus failed builds and builds stuck in 'building' for over building_ttl seconds.
+    Rows go in LIMITed batches so no single statement holds locks for long.
+    Returns the removed version ids.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT version_id FROM timetable_publish WHERE id = 1")
+        row = cursor.fetchone()
+        live = row[0] if row else None
+        cursor.execute("SELECT NOW()")   # the DB clock that stamped created_at
+        stale_before = _as_datetime(cursor.fetchone()[0]) - timedelta(seconds=building_ttl)
+        cursor.execute("SELECT version_id, status, created_at FROM timetable_version ORDER BY version_id DESC")
+        versions = cursor.fetchall()
+        kept, doomed = 0, []
+        for vid, status, created_at in versions:
+            if vid == live:
+                kept += 1
+                continue
+            if status == "building":
+                if _as_datetime(created_at) < stale_before:
+                    doomed.append(vid)  # abandoned save
+                continue  # otherwise may be another worker's save in progress
+            if status == "failed" or kept >= keep:
+                doomed.append(vid)
+            else:
+                kept += 1
+        for vid in doomed:
+            while True:
+                cursor.execute("DELETE FROM timetable_timetableentry WHERE version_id = %s LIMIT %s", (vid, batch_size))
+                conn.commit()
+                if cursor.rowcount < batch_size:
+                    break
+            cursor.execute("DELETE FROM timetable_occupancy WHERE version_id = %s", (vid,))
+            cursor.execute("DELETE FROM timetable_version WHERE version_id = %s", (vid,))
+            conn.commit()
+        return doomed
+    finally:
+        cursor.close()
+
+
+def _as_datetime(value) -> datetime:
+    # mysql.connector returns DATETIME columns as datetime, the SQLite backend as text
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+
+def _mark(conn, version_id: int, status: str) -> None:
+    cursor = conn.cursor()
+    try:
+        cursor.execute("UPDATE timetable_version SET status = %s WHERE version_id = %s", (status, version_id))
+        conn.commit()
+    except Exception:
+        pass
+    finally:
+        cursor.close()
@@ -0,0 +1,56 @@
+# single_flight.py
+# Request coalescing for expensive calls (timetable generation). Concurrent
+# do(key, fn) calls with the same key run fn once: the first caller runs it, the
+# others block until it finishes and get the same result (or exception).
+# Scope is one process; generate_timetable pairs it with a MySQL named lock
+# (GENERATE_LOCK_NAME) so runs in different workers never overlap either.
+
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(result, shared): shared is True when this caller joined a run already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> Dict[str, int]:
+        """key -> number of callers waiting on it."""
+        with self._lock:
+            return {k: c.waiters for k, c in self._calls.items()}
@@ -0,0 +1,466 @@
+# sqlite_backend.py
+# Embedded SQLite storage for the API and the solver (DB_BACKEND=sqlite, see
+# db_connector.py): no MySQL server, one database file, low-latency local reads.
+#
+# Connections look like mysql.connector ones to the rest of the backend:
+# cursor(dictionary=True), %s parameters, commit/rollback, lastrowid, and errors
+# raised as mysql.connector.Error subclasses (errno 1062 for duplicate keys), so
+# app.py and services/ run their existing queries unchanged. translate() rewrites
+# the MySQL-only syntax they use (SHOW ..., ON DUPLICATE KEY UPDATE, DELETE ...
+# LIMIT, STRAIGHT_JOIN / FORCE INDEX hints, ...) and each connection registers the
+# MySQL functions they call (TIME_FORMAT, FIELD, GET_LOCK, CRC32, BIT_XOR, ...).
+#
+# Statements are prepared once per connection: translate() is memoized, so a query
+# always maps to the same SQLite text and hits the connection's statement cache, and
+# pooled connections keep that cache warm. Databases run in WAL mode, so readers
+# never block the writer or each other. The tables (SCHEMA) are created on first
+# connect; their read indexes come from migrations.py like on MySQL (applied at app
+# startup, or python migrations.py).
+#
+# Env vars:
+#   DB_SQLITE_PATH             database file (default backend/samay_sudarshan.db)
+#   DB_SQLITE_BUSY_TIMEOUT     seconds a writer waits for the write lock (default 10)
+#   DB_SQLITE_STATEMENT_CACHE  prepared statements kept per connection (default 256)
+#
+# Needs SQLite 3.35+ (upserts without a conflict target).
+
+import datetime
+import functools
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from mysql.connector import errors
+
+try:
+    import fcntl
+except ImportError:   # Windows: GET_LOCK only excludes threads of this process
+    fcntl = None
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "samay_sudarshan.db")
+
+# MySQL's FIELD(day_of_week, 'MONDAY', ...) - 1, as a CASE so the file stays readable
+# by plain sqlite3 tools (they don't have our functions)
+_DAY_INDEX = ("CASE day_of_week WHEN 'MONDAY' THEN 0 WHEN 'TUESDAY' THEN 1 WHEN 'WEDNESDAY' THEN 2 "
+              "WHEN 'THURSDAY' THEN 3 WHEN 'FRIDAY' THEN 4 WHEN 'SATURDAY' THEN 5 WHEN 'SUNDAY' THEN 6 END")
+
+# Same keys and constraints as the MySQL tables, including their UNIQUE columns
+# (NOCASE like MySQL's default case-insensitive collations), so duplicates fail
+# with errno 1062 on both backends.
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    hashed_password TEXT NOT NULL,
+    role TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS faculty_department (
+    dept_id TEXT PRIMARY KEY,
+    dept_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timetable_timeslot (
+    slot_id INTEGER PRIMARY KEY,
+    day_of_week TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    is_usable INTEGER NOT NULL DEFAULT 1,
+    day_index INTEGER GENERATED ALWAYS AS ({_DAY_INDEX}) STORED
+);
+CREATE TABLE IF NOT EXISTS sections (
+    section_id INTEGER PRIMARY KEY,
+    section_name TEXT NOT NULL,
+    dept_id TEXT NOT NULL,
+    student_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timetable_subject (
+    subject_id INTEGER PRIMARY KEY,
+    subject_code TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    subject_name TEXT NOT NULL,
+    lecture_count INTEGER NOT NULL DEFAULT 0,
+    department_id TEXT NULL,
+    type TEXT NULL,
+    contiguous_block_size INTEGER NULL
+);
+CREATE TABLE IF NOT EXISTS faculty_faculty (
+    faculty_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    faculty_id_code TEXT NULL UNIQUE COLLATE NOCASE,
+    designation TEXT NULL,
+    email TEXT NULL,
+    department_id TEXT NULL,
+    max_load INTEGER NULL
+);
+CREATE TABLE IF NOT EXISTS rooms_classroom (
+    room_id INTEGER PRIMARY KEY,
+    room_name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    capacity INTEGER NOT NULL,
+    room_type TEXT NOT NULL,
+    is_available INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS curriculum (
+    section_id INTEGER NOT NULL,
+    subject_id INTEGER NOT NULL,
+    faculty_id INTEGER NOT NULL,
+    UNIQUE (section_id, subject_id)
+);
+CREATE INDEX IF NOT EXISTS idx_curriculum_subject ON curriculum (subject_id);
+CREATE TABLE IF NOT EXISTS faculty_unavailability (
+    faculty_id INTEGER NOT NULL,
+    slot_id INTEGER NOT NULL,
+    PRIMARY KEY (faculty_id, slot_id)
+);
+CREATE TABLE IF NOT EXISTS timetable_timetableentry (
+    entry_id INTEGER PRIMARY KEY,
+    subject_id INTEGER NOT NULL,
+    faculty_id INTEGER NOT NULL,
+    classroom_id INTEGER NOT NULL,
+    time_slot_id INTEGER NOT NULL,
+    student_batch_id INTEGER NOT NULL,
+    version_id INTEGER NULL
+);
+CREATE TABLE IF NOT EXISTS timetable_version (
+    version_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'building',
+    entry_count INTEGER NOT NULL DEFAULT 0,
+    fitness REAL NULL,
+    fingerprint TEXT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    published_at TEXT NULL
+);
+CREATE TABLE IF NOT EXISTS timetable_publish (
+    id INTEGER PRIMARY KEY,
+    version_id INTEGER NULL,
+    published_at TEXT NULL
+);
+CREATE TABLE IF NOT EXISTS timetable_occupancy (
+    version_id INTEGER PRIMARY KEY,
+    payload BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    id TEXT PRIMARY KEY,
+    applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# (pattern, replacement), applied in order
+_REWRITES = [
+    (re.compile(r"^\s*SHOW\s+TABLES\s+LIKE\s+(\S+?);?\s*$", re.I | re.S),
+     r"SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE \1"),
+    (re.compile(r"^\s*SHOW\s+TABLES\s*;?\s*$", re.I | re.S),
+     "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"),
+    (re.compile(r"^\s*SHOW\s+COLUMNS\s+FROM\s+(\w+)\s+LIKE\s+(\S+?);?\s*$", re.I | re.S),
+     r"SELECT name AS Field FROM pragma_table_xinfo('\1') WHERE name LIKE \2"),
+    (re.compile(r"^\s*SHOW\s+INDEX\s+FROM\s+(\w+)\s+WHERE\s+Key_name\s*=\s*(\S+?);?\s*$", re.I | re.S),
+     r"SELECT name AS Key_name FROM pragma_index_list('\1') WHERE name = \2"),
+    (re.compile(r"^\s*SET\s+FOREIGN_KEY_CHECKS\s*=\s*(\d)\s*;?\s*$", re.I | re.S), r"PRAGMA foreign_keys = \1"),
+    # DELETE ... LIMIT n (batched deletes) -> by rowid
+    (re.compile(r"^\s*DELETE\s+FROM\s+(\w+)\s+WHERE\s+(.+?)\s+LIMIT\s+(\S+?)\s*$", re.I | re.S),
+     r"DELETE FROM \1 WHERE rowid IN (SELECT rowid FROM \1 WHERE \2 LIMIT \3)"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I), "ON CONFLICT DO UPDATE SET"),
+    # optimizer hints: SQLite's planner picks the same plans from the migrations.py indexes
+    (re.compile(r"\bSELECT\s+STRAIGHT_JOIN\b", re.I), "SELECT"),
+    (re.compile(r"\s+FORCE\s+INDEX\s*\(\s*\w+\s*\)", re.I), ""),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.I), ""),
+    (re.compile(r"^\s*EXPLAIN\s+(?=SELECT)", re.I), "EXPLAIN QUERY PLAN "),
+]
+_UPSERT_VALUES = re.compile(r"\bVALUES\s*\(\s*(\w+)\s*\)", re.I)
+
+
+@functools.lru_cache(maxsize=1024)
+def translate(sql: str) -> str:
+    """MySQL-dialect statement (with %s placeholders) -> SQLite statement with ? placeholders."""
+    for pattern, repl in _REWRITES:
+        sql = pattern.sub(repl, sql)
+    head, sep, tail = sql.partition("ON CONFLICT DO UPDATE SET")
+    if sep:
+        sql = head + sep + _UPSERT_VALUES.sub(r"excluded.\1", tail)
+    return sql.replace("%s", "?")
+
+
+# ---------------------------------------------------------------------------
+# MySQL functions used by the backend's queries
+# ---------------------------------------------------------------------------
+_TIME_FORMAT = re.compile(r"%([HkhIilSsp%])")
+
+
+def _time_format(value, fmt):
+    """TIME_FORMAT for TIME values stored as 'HH:MM[:SS]' text."""
+    if value is None or fmt is None:
+        return None
+    parts = (str(value).split(":") + ["0", "0"])[:3]
+    try:
+        h, m, s = (int(float(p)) for p in parts)
+    except ValueError:
+        return None
+    codes = {"H": f"{h:02d}", "k": str(h), "h": f"{(h % 12) or 12:02d}", "I": f"{(h % 12) or 12:02d}",
+             "i": f"{m:02d}", "S": f"{s:02d}", "s": f"{s:02d}", "p": "AM" if h % 24 < 12 else "PM", "%": "%"}
+    return _TIME_FORMAT.sub(lambda mt: codes[mt.group(1)], fmt)
+
+
+def _field(value, *items):
+    for i, item in enumerate(items, 1):
+        if item == value:
+            return i
+    return 0
+
+
+def _text(value):
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _concat(*values):
+    if any(v is None for v in values):
+        return None
+    return "".join(_text(v) for v in values)
+
+
+def _concat_ws(sep, *values):
+    if sep is None:
+        return None
+    return _text(sep).join(_text(v) for v in values if v is not None)
+
+
+def _crc32(value):
+    if value is None:
+        return None
+    return zlib.crc32(value if isinstance(value, bytes) else _text(value).encode("utf-8"))
+
+
+def _now():
+    # UTC, like SQLite's CURRENT_TIMESTAMP column defaults, so NOW() and created_at compare
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class _BitXor:
+    def __init__(self):
+        self.acc = 0
+
+    def step(self, value):
+        if value is not None:
+            self.acc ^= int(value)
+
+    def finalize(self):
+        return self.acc
+
+
+class _NamedLocks:
+    """
+    GET_LOCK / RELEASE_LOCK for one connection: an flock()ed file next to the
+    database per lock name, so the lock excludes other connections and processes
+    and goes away with the connection, like MySQL's session-scoped locks.
+    """
+
+    _local = {}                      # Windows fallback: name -> threading.Lock
+    _local_guard = threading.Lock()
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.held = {}               # name -> fd, or the threading.Lock without fcntl
+
+    def get(self, name, timeout):
+        if name is None:
+            return None
+        if name in self.held:
+            return 1
+        deadline = None if timeout is None or timeout < 0 else time.monotonic() + float(timeout)
+        if fcntl is None:
+            with self._local_guard:
+                lock = self._local.setdefault(name, threading.Lock())
+            if not lock.acquire(timeout=-1 if deadline is None else max(0.0, deadline - time.monotonic())):
+                return 0
+            self.held[name] = lock
+            return 1
+        safe = re.sub(r"[^\w.-]", "_", str(name))
+        fd = os.open(f"{self.db_path}.{safe}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self.held[name] = fd
+                return 1
+            except BlockingIOError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    return 0
+                time.sleep(0.05)
+
+    def release(self, name):
+        held = self.held.pop(name, None)
+        if held is None:
+            return 0
+        if fcntl is None:
+            held.release()
+        else:
+            fcntl.flock(held, fcntl.LOCK_UN)
+            os.close(held)
+        return 1
+
+    def release_all(self):
+        for name in list(self.held):
+            self.release(name)
+
+
+# ---------------------------------------------------------------------------
+# mysql.connector-shaped connection / cursor
+# ---------------------------------------------------------------------------
+def _mysql_error(e):
+    """sqlite3 error -> the mysql.connector error the callers already handle."""
+    msg = str(e)
+    if isinstance(e, sqlite3.IntegrityError):
+        return errors.IntegrityError(msg=msg, errno=1062 if "UNIQUE" in msg or "PRIMARY KEY" in msg else 1452)
+    if isinstance(e, sqlite3.OperationalError):
+        return errors.OperationalError(msg=msg)
+    if isinstance(e, sqlite3.ProgrammingError):
+        return errors.ProgrammingError(msg=msg)
+    return errors.DatabaseError(msg=msg)
+
+
+class SQLiteCursor:
+    dialect = "sqlite"
+
+    def __init__(self, conn, dictionary=False):
+        self._cursor = conn._raw.cursor()
+        self._dictionary = dictionary
+        self._names = None
+
+    def execute(self, sql, params=None):
+        try:
+            self._cursor.execute(translate(sql), tuple(params) if params is not None else ())
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        self._names = [d[0] for d in self._cursor.description] if self._cursor.description else None
+
+    def executemany(self, sql, seq_params):
+        try:
+            self._cursor.executemany(translate(sql), [tuple(p) for p in seq_params])
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        self._names = None
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self._names, row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(r) for r in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def column_names(self):
+        return tuple(self._names or ())
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    dialect = "sqlite"
+
+    def __init__(self, raw, path):
+        self._raw = raw
+        self.path = path
+        self._locks = _NamedLocks(path)
+        raw.create_function("GET_LOCK", 2, self._locks.get)
+        raw.create_function("RELEASE_LOCK", 1, self._locks.release)
+
+    def cursor(self, dictionary=False, **_kwargs):
+        return SQLiteCursor(self, dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._raw.in_transaction
+
+    def commit(self):
+        try:
+            self._raw.commit()
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def ping(self, reconnect=False):
+        self._raw.execute("SELECT 1").fetchone()
+
+    def close(self):
+        try:
+            self._locks.release_all()
+        finally:
+            self._raw.close()
+
+
+def database_path():
+    return os.environ.get("DB_SQLITE_PATH") or DEFAULT_PATH
+
+
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+
+def _register_functions(raw):
+    raw.create_function("TIME_FORMAT", 2, _time_format, deterministic=True)
+    raw.create_function("FIELD", -1, _field, deterministic=True)
+    raw.create_function("CONCAT", -1, _concat, deterministic=True)
+    raw.create_function("CONCAT_WS", -1, _concat_ws, deterministic=True)
+    raw.create_function("CRC32", 1, _crc32, deterministic=True)
+    raw.create_function("NOW", 0, _now)
+    raw.create_aggregate("BIT_XOR", 1, _BitXor)
+
+
+def connect(read_only=False):
+    """
+    New connection to DB_SQLITE_PATH (WAL, schema created on first use).
+    read_only connections are PRAGMA query_only, like the MySQL replica sessions.
+    """
+    path = database_path()
+    raw = sqlite3.connect(
+        path,
+        timeout=float(os.environ.get("DB_SQLITE_BUSY_TIMEOUT", 10)),
+        isolation_level="IMMEDIATE",   # writers take the write lock at BEGIN: no upgrade deadlocks
+        check_same_thread=False,       # pooled: handed to one request thread at a time
+        cached_statements=int(os.environ.get("DB_SQLITE_STATEMENT_CACHE", 256)),
+    )
+    try:
+        raw.execute("PRAGMA journal_mode = WAL")
+        raw.execute("PRAGMA synchronous = NORMAL")   # durable at checkpoints; no fsync per commit
+        raw.execute("PRAGMA temp_store = MEMORY")
+        raw.execute("PRAGMA mmap_size = 268435456")
+        _register_functions(raw)
+        with _schema_lock:
+            if path not in _schema_ready:
+                raw.executescript(SCHEMA)
+                _schema_ready.add(path)
+        if read_only:
+            raw.execute("PRAGMA query_only = ON")
+    except sqlite3.Error as e:
+        raw.close()
+        raise _mysql_error(e) from e
+    return SQLiteConnection(raw, path)
@@ -0,0 +1,164 @@
+# tests/test_db_connector.py
+# Read-replica routing in db_connector with stand-in servers: _connect is replaced by
+# a factory of fake connections, so the pools, round-robin, saturated-pool fallback,
+# down-replica skipping and the X-Last-Write read-your-writes window run as in
+# production without a MySQL instance. Skipped when mysql-connector is not installed.
+
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+try:
+    import db_connector
+except ImportError:   # mysql-connector missing
+    db_connector = None
+
+
+class FakeConnection:
+    """Just enough of a mysql.connector connection for the pool."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.in_transaction = False
+        self.closed = False
+
+    def ping(self, reconnect=False):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+@unittest.skipIf(db_connector is None, "mysql-connector is not installed")
+class ReplicaRoutingTest(unittest.TestCase):
+    ENV = {
+        "DB_BACKEND": "mysql",
+        "DB_HOST": "primary", "DB_PORT": "3306",
+        "DB_REPLICAS": "replica-a:3307,replica-b:3308",
+        "DB_POOL_SIZE": "1",
+        "DB_READ_YOUR_WRITES": "0.5",
+        "DB_REPLICA_WAIT": "0.05",
+        "DB_REPLICA_RETRY": "30",
+    }
+
+    def setUp(self):
+        self.down = set()   # "host:port" of replicas that refuse connections
+        env = mock.patch.dict(os.environ, self.ENV)
+        env.start()
+        self.addCleanup(env.stop)
+        connect = mock.patch.object(db_connector, "_connect", self._fake_connect)
+        connect.start()
+        self.addCleanup(connect.stop)
+        db_connector._pool = db_connector.ConnectionPool(
+            size=1, connect=self._fake_connect, **db_connector._pool_settings())
+        db_connector._replica_pools = []
+        db_connector._replica_down_until.clear()
+        db_connector._last_write = 0.0
+        db_connector.begin_request(None)
+
+    def tearDown(self):
+        db_connector._pool = None
+        db_connector._replica_pools = []
+        db_connector._replica_down_until.clear()
+
+    def _fake_connect(self, host=None, port=None, read_only=False):
+        host, port = host or os.environ["DB_HOST"], int(port or os.environ["DB_PORT"])
+        if f"{host}:{port}" in self.down:
+            raise ConnectionRefusedError(f"{host}:{port} is down")
+        return FakeConnection(host, port)
+
+    def _hold(self):
+        conn = db_connector.get_db_connection(read_only=True)
+        self.addCleanup(conn.close)
+        return conn
+
+    def _read_role(self):
+        conn = db_connector.get_db_connection(read_only=True)
+        conn.close()
+        return conn.role
+
+    def test_reads_round_robin_over_replicas_and_writes_use_primary(self):
+        roles = set()
+        for _ in range(4):
+            conn = db_connector.get_db_connection(read_only=True)
+            roles.add(conn.role)
+            conn.close()
+        self.assertEqual(roles, {"replica replica-a:3307", "replica replica-b:3308"})
+        self.assertTrue(db_connector.served_by_replica())
+        conn = db_connector.get_db_connection()
+        self.assertEqual(conn.role, "primary")
+        conn.close()
+
+    def test_saturated_replica_pools_fall_back_to_the_primary(self):
+        held = [self._hold(), self._hold()]   # pool size 1: both replicas now busy
+        self.assertEqual({c.role for c in held}, {"replica replica-a:3307", "replica replica-b:3308"})
+        t0 = time.monotonic()
+        conn = self._hold()
+        self.assertEqual(conn.role, "primary")
+        self.assertLess(time.monotonic() - t0, 1.0)   # DB_REPLICA_WAIT per replica, not DB_POOL_TIMEOUT
+
+    def test_down_replica_is_skipped(self):
+        self.down.add("replica-a:3307")
+        roles = set()
+        with mock.patch("builtins.print"):
+            for _ in range(2):   # round-robin reaches replica-a at least once
+                conn = db_connector.get_db_connection(read_only=True)
+                roles.add(conn.role)
+                conn.close()
+        self.assertEqual(roles, {"replica replica-b:3308"})
+        self.assertGreater(db_connector._replica_down_until[0], time.monotonic())
+
+    def test_own_commit_keeps_this_client_on_the_primary(self):
+        conn = db_connector.get_db_connection()
+        conn.commit()
+        conn.close()
+        wrote = db_connector.request_write_time()
+        self.assertIsNotNone(wrote)
+        self.assertEqual(self._read_role(), "primary")
+        self.assertFalse(db_connector.served_by_replica())
+
+    def test_echoed_last_write_routes_to_the_primary_in_any_worker(self):
+        # a different request (e.g. another worker) that echoes the header stays on the primary ...
+        db_connector.begin_request(str(time.time()))
+        self.assertEqual(self._read_role(), "primary")
+        # ... while a client that did not write is read from a replica
+        db_connector.begin_request(None)
+        self.assertTrue(self._read_role().startswith("replica"))
+
+    def test_window_expires_and_junk_headers_are_ignored(self):
+        db_connector.begin_request(str(time.time() - 1.0))   # older than the 0.5s window
+        self.assertTrue(self._read_role().startswith("replica"))
+        db_connector.begin_request(str(time.time() + 60))    # far future: ignored, not pinned for a minute
+        self.assertTrue(self._read_role().startswith("replica"))
+        db_connector.begin_request("not-a-time")
+        self.assertTrue(self._read_role().startswith("replica"))
+
+    def test_request_state_is_per_thread(self):
+        conn = db_connector.get_db_connection()
+        conn.commit()
+        conn.close()
+        roles = []
+
+        def other_request():
+            db_connector.begin_request(None)
+            c = db_connector.get_db_connection(read_only=True)
+            roles.append(c.role)
+            c.close()
+
+        t = threading.Thread(target=other_request)
+        t.start()
+        t.join()
+        self.assertTrue(roles[0].startswith("replica"))
+        self.assertEqual(self._read_role(), "primary")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# tests/test_load.py
+# load_test.py against each storage backend: always the embedded SQLite backend (a
+# seeded temporary file), and MySQL too when LOAD_TEST_MYSQL=1 (the DB_* database,
+# which must already be seeded and have a published timetable; the run only adds
+# and deletes its own LT-* subjects). Also checks that both reject duplicate keys.
+# Skipped when mysql-connector is not installed.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import mysql.connector  # noqa: F401
+except ImportError:
+    mysql = None
+
+
+def _sqlite_env(path):
+    return {"DB_BACKEND": "sqlite", "DB_SQLITE_PATH": path, "DB_POOL_SIZE": "0"}
+
+
+def _mysql_env():
+    return {"DB_BACKEND": "mysql"}
+
+
+class _BackendLoadTest:
+    """Mixin: the same checks for every backend; subclasses set up env and data."""
+
+    make_timetable = False
+
+    def test_mix_runs_without_errors(self):
+        from load_test import DEFAULT_MIX, run_load
+        with mock.patch("builtins.print"):
+            report = run_load(seconds=1.0, threads=4, seed=1, make_timetable=self.make_timetable)
+        self.assertEqual(report["backend"], self.backend)
+        for op in DEFAULT_MIX:
+            self.assertEqual(report["ops"][op]["errors"], 0, op)
+        self.assertGreater(report["ops"]["section_timetable"]["count"], 0)
+        self.assertGreater(report["throughput"], 0)
+
+    def test_duplicate_keys_are_rejected(self):
+        from mysql.connector import Error
+        from db_connector import get_db_connection
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            for table, column, extra in (("timetable_subject", "subject_code", ", subject_name"),
+                                         ("rooms_classroom", "room_name", ", capacity, room_type"),
+                                         ("faculty_faculty", "faculty_id_code", ", name")):
+                cursor.execute(f"SELECT {column}{extra} FROM {table} WHERE {column} IS NOT NULL LIMIT 1")
+                row = cursor.fetchone()
+                self.assertIsNotNone(row, table)
+                with self.subTest(table=table):
+                    with self.assertRaises(Error) as ctx:
+                        cursor.execute(f"INSERT INTO {table} ({column}{extra}) VALUES "
+                                       f"({', '.join(['%s'] * len(row))})", (row[0].lower(),) + tuple(row[1:]))
+                    self.assertEqual(ctx.exception.errno, 1062)
+        finally:
+            conn.rollback()
+            cursor.close()
+            conn.close()
+
+
+@unittest.skipIf(mysql is None, "mysql-connector is not installed")
+class SQLiteLoadTest(_BackendLoadTest, unittest.TestCase):
+    backend = "sqlite"
+    make_timetable = True
+
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls._env = mock.patch.dict(os.environ, _sqlite_env(os.path.join(cls._tmp.name, "load.db")))
+        cls._env.start()
+        from db_connector import get_db_connection
+        from migrations import apply_migrations
+        from seed_synthetic import TABLES, bulk_insert
+        from timetable_ga.synthetic import synthetic_campus
+
+        campus = synthetic_campus(departments=2, sections=20, seed=3)
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        for table, columns, key in TABLES:
+            bulk_insert(cursor, table, columns, campus[key], 1000)
+        conn.commit()
+        cursor.close()
+        with mock.patch("builtins.print"):
+            apply_migrations(conn, log=lambda *_: None)
+        conn.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._env.stop()
+        cls._tmp.cleanup()
+
+
+@unittest.skipIf(mysql is None, "mysql-connector is not installed")
+@unittest.skipUnless(os.environ.get("LOAD_TEST_MYSQL") == "1", "set LOAD_TEST_MYSQL=1 to run against MySQL")
+class MySQLLoadTest(_BackendLoadTest, unittest.TestCase):
+    backend = "mysql"
+
+    @classmethod
+    def setUpClass(cls):
+        cls._env = mock.patch.dict(os.environ, _mysql_env())
+        cls._env.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._env.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
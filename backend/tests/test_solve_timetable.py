@@ -0,0 +1,114 @@
+# tests/test_solve_timetable.py
+# Smoke run of manage.py solve_timetable on the embedded backend (DB_BACKEND=sqlite):
+# a synthetic campus is seeded into a temporary database file, the command solves
+# it and the saved version, its entries and occupancy are read back.
+# Skipped when Django is not installed.
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import django
+except ImportError:
+    django = None
+
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+_tmp = None
+_env = None
+
+
+def setUpModule():
+    global _tmp, _env
+    if django is None:
+        raise unittest.SkipTest("Django is not installed")
+    _tmp = tempfile.TemporaryDirectory()
+    _env = mock.patch.dict(os.environ, {
+        "DB_BACKEND": "sqlite",
+        "DB_SQLITE_PATH": os.path.join(_tmp.name, "solve.db"),
+        "DB_POOL_SIZE": "0",
+        "GA_RUN_HISTORY_PATH": os.path.join(_tmp.name, "runs.jsonl"),
+        "DJANGO_SETTINGS_MODULE": "samay_sudarshan_backend.settings",
+    })
+    _env.start()
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    django.setup()
+
+    from db_connector import get_db_connection
+    from seed_synthetic import TABLES, bulk_insert
+    from timetable_ga.synthetic import synthetic_campus
+
+    campus = synthetic_campus(departments=1, sections=2, subjects_per_section=4, lab_ratio=0.25,
+                              lecture_rooms=4, lab_rooms=2, unavailability_rate=0.0, seed=5)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    for table, columns, key in TABLES:
+        bulk_insert(cursor, table, columns, campus[key], 1000)
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def tearDownModule():
+    if _env is not None:
+        _env.stop()
+    if _tmp is not None:
+        _tmp.cleanup()
+
+
+def _query(sql, params=()):
+    from db_connector import get_db_connection
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _solve(*args):
+    from django.core.management import call_command
+    out = io.StringIO()
+    call_command("solve_timetable", "--time-limit", "2", "--seed", "1", *args, stdout=out, stderr=io.StringIO())
+    return out.getvalue()
+
+
+class SolveTimetableCommandTest(unittest.TestCase):
+    def test_publishes_a_complete_version(self):
+        out = _solve()
+        self.assertIn("published", out)
+        live = _query("""
+            SELECT V.version_id, V.status, V.entry_count FROM timetable_publish AS PUB
+            JOIN timetable_version AS V ON V.version_id = PUB.version_id WHERE PUB.id = 1
+        """)[0]
+        self.assertEqual(live["status"], "published")
+        entries = _query("SELECT COUNT(*) AS n FROM timetable_timetableentry WHERE version_id = %s",
+                         (live["version_id"],))[0]["n"]
+        self.assertGreater(entries, 0)
+        self.assertEqual(entries, live["entry_count"])
+        self.assertTrue(_query("SELECT 1 FROM timetable_occupancy WHERE version_id = %s", (live["version_id"],)))
+
+    def test_no_publish_keeps_the_live_version(self):
+        _solve()
+        before = _query("SELECT version_id FROM timetable_publish WHERE id = 1")[0]["version_id"]
+        out = _solve("--no-publish")
+        self.assertIn("saved (not published)", out)
+        self.assertEqual(_query("SELECT version_id FROM timetable_publish WHERE id = 1")[0]["version_id"], before)
+        newest = _query("SELECT status FROM timetable_version ORDER BY version_id DESC LIMIT 1")[0]
+        self.assertEqual(newest["status"], "ready")
+
+    def test_dry_run_writes_nothing(self):
+        count = len(_query("SELECT version_id FROM timetable_version"))
+        _solve("--dry-run")
+        self.assertEqual(len(_query("SELECT version_id FROM timetable_version")), count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,14 @@ timetable_ga: Genetic Algorithm for weekly timetable scheduling.
 
 Public API:
 - run_ga: main GA entrypoint
+- resume_ga: continue a checkpointed run_ga from its latest checkpoint
+- run_portfolio: K independent run_ga runs in a process pool, best-of selection
 - GAInput, Gene, Subject, Section, Room, Faculty: core dataclasses
 - chromosome_to_rows: encode GA result to API/DB rows
 """
 
-from .ga import run_ga
+from .ga import run_ga, resume_ga
+from .portfolio import run_portfolio
 from .models import (
     GAInput,
     Gene,
@@ -21,6 +24,8 @@ from .encoder import chromosome_to_rows
 
 __all__ = [
     "run_ga",
+    "resume_ga",
+    "run_portfolio",
     "GAInput",
     "Gene",
     "Subject",
@@ -0,0 +1,159 @@
+# timetable_ga/__main__.py
+"""
+Offline solver CLI (no Flask, no MySQL). Problems come from snapshot files
+written by snapshot.save_snapshot / backend/export_snapshot.py.
+
+    python -m timetable_ga info  problem.json.gz
+    python -m timetable_ga solve problem.json.gz --out result.json --seed 7 --time-limit 60
+    python -m timetable_ga solve problem.json.gz --portfolio 4 --population-size 40
+    python -m timetable_ga resume problem.json.gz --checkpoint run.ckpt.gz --out result.json
+    python -m timetable_ga synth --sections 300 --out synth300.json.gz
+
+Run from backend/. The result file holds the timetable rows (same shape the
+generate endpoint returns as timetable_json) plus fitness, breakdowns and run stats.
+"""
+import argparse
+import json
+import sys
+import time
+
+from .ga import run_ga, resume_ga
+from .portfolio import run_portfolio
+from .encoder import chromosome_to_rows
+from .fingerprint import input_fingerprint
+from .presets import preset_for
+from .snapshot import load_snapshot, save_snapshot, snapshot_meta
+from .synthetic import synthetic_campus, campus_to_gainput
+
+# run_ga keyword arguments exposed as --flags (None = take the size-aware preset)
+ENGINE_ARGS = (
+    ("population_size", int), ("generations", int), ("tournament_k", int),
+    ("crossover_rate", float), ("mutate_rate", float), ("elitism_fraction", float),
+)
+
+
+def _write_result(result, data, path, extra):
+    out = {
+        "fingerprint": input_fingerprint(data),
+        "fitness": result["fitness"],
+        "hard_breakdown": (result.get("eval") or {}).get("hard_breakdown", {}),
+        "soft_breakdown": (result.get("eval") or {}).get("soft_breakdown", {}),
+        **{k: result.get(k) for k in ("generations", "elapsed", "phases", "params", "init", "portfolio", "seed")},
+        "curve": result.get("curve", []),
+        "lunch_slots": sorted(data.lunch_slots),
+        "rows": chromosome_to_rows(result["best_chromosome"]),
+        **extra,
+    }
+    if path == "-":
+        json.dump(out, sys.stdout, indent=1, default=list)
+        sys.stdout.write("\n")
+    else:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(out, fh, indent=1, default=list)
+    return out
+
+
+def _summary(result):
+    bd = (result.get("eval") or {}).get("hard_breakdown") or {}
+    hard = ", ".join(f"{k}={v}" for k, v in bd.items() if v) or "none"
+    return (f"fitness={result['fitness']} generations={result.get('generations')} "
+            f"elapsed={result.get('elapsed')}s hard={hard}")
+
+
+def cmd_info(args):
+    data = load_snapshot(args.snapshot)
+    chosen = preset_for(data)
+    print(json.dumps({**snapshot_meta(args.snapshot), "size": chosen["size"],
+                      "preset": chosen["preset"], "params": chosen["params"]}, indent=2))
+
+
+def cmd_solve(args):
+    data = load_snapshot(args.snapshot)
+    ga_kwargs = {name: getattr(args, name) for name, _t in ENGINE_ARGS if getattr(args, name) is not None}
+    ga_kwargs.update(init_strategy=args.init, graded_hard=not args.strict_hard, adaptive=not args.fixed_rates,
+                     init_workers=args.init_workers, checkpoint_path=args.checkpoint)
+    t0 = time.monotonic()
+    if args.portfolio > 1:
+        result = run_portfolio(data, runs=args.portfolio, time_limit=args.time_limit,
+                               max_workers=args.workers, seed=args.seed, **ga_kwargs)
+    else:
+        result = run_ga(data, seed=args.seed, time_limit=args.time_limit, **ga_kwargs)
+        result.setdefault("seed", args.seed)
+    print(_summary(result), file=sys.stderr)
+    _write_result(result, data, args.out, {"snapshot": args.snapshot, "wall": round(time.monotonic() - t0, 3)})
+
+
+def cmd_resume(args):
+    data = load_snapshot(args.snapshot)
+    overrides = {}
+    if args.generations is not None:
+        overrides["generations"] = args.generations
+    if args.time_limit is not None:
+        overrides["time_limit"] = args.time_limit
+    result = resume_ga(args.checkpoint, data, **overrides)
+    print(_summary(result), file=sys.stderr)
+    _write_result(result, data, args.out, {"snapshot": args.snapshot, "resumed_from": args.checkpoint})
+
+
+def cmd_synth(args):
+    campus = synthetic_campus(departments=args.departments, sections=args.sections,
+                              lab_ratio=args.lab_ratio, seed=args.seed)
+    fp = save_snapshot(campus_to_gainput(campus), args.out,
+                       meta={"source": "synthetic", "sections": args.sections, "seed": args.seed})
+    print(f"Wrote {args.out} ({fp[:12]})")
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="python -m timetable_ga", description="Offline timetable GA solver.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("info", help="show snapshot size class and the preset it would use")
+    p.add_argument("snapshot")
+    p.set_defaults(func=cmd_info)
+
+    p = sub.add_parser("solve", help="solve a snapshot and write rows + stats")
+    p.add_argument("snapshot")
+    p.add_argument("--out", default="-", help="result JSON path ('-' = stdout)")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--time-limit", type=float, default=None, help="seconds (shared deadline for --portfolio)")
+    p.add_argument("--portfolio", type=int, default=1, help="independent runs, best-of")
+    p.add_argument("--workers", type=int, default=None, help="processes for --portfolio")
+    p.add_argument("--init", default="constructive", choices=("constructive", "random"))
+    p.add_argument("--init-workers", type=int, default=1)
+    p.add_argument("--strict-hard", action="store_true", help="flat hard-violation penalty instead of graded")
+    p.add_argument("--fixed-rates", action="store_true", help="disable adaptive crossover/mutation rates")
+    p.add_argument("--checkpoint", default=None, help="checkpoint file (resume with the resume command)")
+    for name, typ in ENGINE_ARGS:
+        p.add_argument("--" + name.replace("_", "-"), dest=name, type=typ, default=None)
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser("resume", help="continue a checkpointed solve")
+    p.add_argument("snapshot")
+    p.add_argument("--checkpoint", required=True)
+    p.add_argument("--out", default="-")
+    p.add_argument("--generations", type=int, default=None)
+    p.add_argument("--time-limit", type=float, default=None)
+    p.set_defaults(func=cmd_resume)
+
+    p = sub.add_parser("synth", help="write a synthetic campus snapshot")
+    p.add_argument("--sections", type=int, default=40)
+    p.add_argument("--departments", type=int, default=4)
+    p.add_argument("--lab-ratio", type=float, default=0.25)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--out", required=True)
+    p.set_defaults(func=cmd_synth)
+    return ap
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
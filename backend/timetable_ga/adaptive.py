@@ -0,0 +1,98 @@
+# timetable_ga/adaptive.py
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+def population_diversity(fits: List[float]) -> float:
+    """Cheap diversity proxy: share of distinct fitness values in the population (0..1]."""
+    if not fits:
+        return 0.0
+    return len(set(fits)) / len(fits)
+
+
+@dataclass(slots=True)
+class AdaptiveController:
+    """
+    Self-adaptive operator control for run_ga.
+
+    - While the best fitness keeps improving, mutation decays toward its base
+      rate (less disruption once good structure is found).
+    - When the run stalls or diversity collapses, mutation strength rises and
+      more mutations become cross-day relocations (larger moves); crossover is
+      damped, since recombining near-identical parents is wasted work.
+    - Every generation's rates are appended to `trajectory` for the run result.
+    """
+    mutate_rate: float
+    crossover_rate: float
+    relocate_prob: float = 0.1
+    stall_window: int = 8
+    low_diversity: float = 0.25
+    max_mutate: float = 0.35
+    min_crossover: float = 0.5
+    max_relocate: float = 0.8
+
+    base_mutate: float = 0.0
+    base_crossover: float = 0.0
+    base_relocate: float = 0.0
+    stall: int = 0
+    trajectory: List[Dict] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.base_mutate = self.mutate_rate
+        self.base_crossover = self.crossover_rate
+        self.base_relocate = self.relocate_prob
+
+    def to_dict(self) -> Dict:
+        """Full controller state (for checkpoints)."""
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "AdaptiveController":
+        ctrl = cls(mutate_rate=state["mutate_rate"], crossover_rate=state["crossover_rate"])
+        for name, value in state.items():
+            setattr(ctrl, name, value)
+        return ctrl
+
+    def update(self, gen: int, improved: bool, diversity: float) -> None:
+        """Adjust rates after generation `gen` has been evaluated."""
+        if improved:
+            self.stall = 0
+            # success: drift back toward base settings
+            self.mutate_rate = max(self.base_mutate, self.mutate_rate * 0.85)
+            self.crossover_rate = min(self.base_crossover, self.crossover_rate + 0.05)
+            self.relocate_prob = max(self.base_relocate, self.relocate_prob * 0.8)
+        else:
+            self.stall += 1
+
+        stalled = self.stall >= self.stall_window
+        converged = diversity < self.low_diversity
+        if stalled or converged:
+            self.mutate_rate = min(self.max_mutate, self.mutate_rate * 1.5)
+            self.relocate_prob = min(self.max_relocate, self.relocate_prob + 0.1)
+            if converged:
+                self.crossover_rate = max(self.min_crossover, self.crossover_rate - 0.1)
+            if stalled:
+                # restart the stall window so escalation happens in steps
+                self.stall = 0
+
+        self.trajectory.append({
+            "gen": gen,
+            "mutate_rate": round(self.mutate_rate, 4),
+            "crossover_rate": round(self.crossover_rate, 4),
+            "relocate_prob": round(self.relocate_prob, 4),
+            "diversity": round(diversity, 4),
+        })
+
+
+def summarize_trajectory(trajectory: List[Dict]) -> Dict:
+    """First/last entry and per-rate min/max of a rate trajectory (the full one goes to run history)."""
+    if not trajectory:
+        return {}
+    keys = [k for k in trajectory[0] if k != "gen"]
+    return {
+        "generations": len(trajectory),
+        "first": trajectory[0],
+        "last": trajectory[-1],
+        "min": {k: min(t[k] for t in trajectory) for k in keys},
+        "max": {k: max(t[k] for t in trajectory) for k in keys},
+    }
@@ -0,0 +1,80 @@
+# timetable_ga/checkpoint.py
+import gzip
+import json
+import os
+import random
+import tempfile
+from typing import Dict, List
+
+from .models import Gene, GAInput
+from .encoder import chromosome_to_tuples, chromosome_from_tuples
+
+CHECKPOINT_VERSION = 1
+
+
+def _rng_state_to_json(state) -> List:
+    # random.getstate() -> (version, tuple_of_625_ints, gauss_next)
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def _rng_state_from_json(raw: List):
+    version, internal, gauss_next = raw
+    return (version, tuple(internal), gauss_next)
+
+
+def save_checkpoint(path: str, *, generation: int, population: List[Dict[int, List[Gene]]],
+                    fits: List[float], best: tuple, params: Dict, fingerprint: str,
+                    controller: Dict = None, init_report: Dict = None, curve: List = None,
+                    completed: bool = False) -> None:
+    """
+    Write a gzip-compressed JSON checkpoint of a GA run: generation counter,
+    population (gene tuples), fitness list, best-so-far, RNG state, adaptive
+    controller state, convergence curve and the run parameters. The file is replaced atomically, so a
+    crash mid-write leaves the previous checkpoint intact.
+    """
+    best_fitness, best_chrom, best_eval = best
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "generation": generation,
+        "completed": completed,
+        "fingerprint": fingerprint,
+        "params": params,
+        "rng_state": _rng_state_to_json(random.getstate()),
+        "population": [chromosome_to_tuples(c) for c in population],
+        "fits": list(fits),
+        "best": {"fitness": best_fitness, "chromosome": chromosome_to_tuples(best_chrom), "eval": best_eval},
+        "controller": controller,
+        "init": init_report,
+        "curve": curve or [],
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)   # unique name; gzip reopens it
+    try:
+        with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def load_checkpoint(path: str, data: GAInput) -> Dict:
+    """
+    Read a checkpoint written by save_checkpoint and rebuild chromosomes against `data`.
+    Returns the payload with 'population' and 'best.chromosome' as chromosome dicts.
+    The RNG state is NOT applied here; run_ga restores it when resuming.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        payload = json.load(fh)
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {payload.get('version')}")
+    payload["population"] = [chromosome_from_tuples(rows, data) for rows in payload["population"]]
+    payload["best"]["chromosome"] = chromosome_from_tuples(payload["best"]["chromosome"], data)
+    payload["rng_state"] = _rng_state_from_json(payload["rng_state"])
+    return payload
@@ -27,11 +27,41 @@ def _build_slot_day_map(data: GAInput) -> Dict[int, int]:
     # last resort: map slot -> 0
     return {}
 
-def violates_hard(g: List[Gene], data: GAInput) -> Dict[str, int]:
+# Per-type weights used when hard violations are counted (graded mode).
+# Overlaps and structural errors weigh most; quota/daily-repeat issues least,
+# since mutation repairs those most easily.
+HARD_WEIGHTS: Dict[str, int] = {
+    "missing_reference": 10,
+    "missing_section": 10,
+    "slot_not_usable": 10,
+    "teacher_overlap": 10,
+    "room_overlap": 10,
+    "section_overlap": 10,
+    "lab_block_size_wrong": 10,
+    "lab_block_size_mismatch": 10,
+    "lab_crosses_day": 10,
+    "faculty_unavailable": 8,
+    "room_type_mismatch": 5,
+    "room_capacity": 5,
+    "subject_weekly_quota": 5,
+    "subject_daily_repeat": 3,
+    "lab_multiple_per_day": 3,
+    "subject_multiple_per_day": 3,
+}
+
+def hard_weighted_total(breakdown: Dict[str, int], weights: Dict[str, int] = None) -> int:
+    """Weighted sum of a hard-violation breakdown (unknown keys weigh 1)."""
+    wei = dict(HARD_WEIGHTS)
+    wei.update(weights or {})
+    return sum(wei.get(k, 1) * cnt for k, cnt in (breakdown or {}).items())
+
+def violates_hard(g: List[Gene], data: GAInput, graded: bool = False) -> Dict[str, int]:
     """
     Returns dict of hard-constraint violation counts.
-    NOTE: For certain violations we return immediately with a very large count
-    (effectively rejecting the chromosome) to enforce 'hard' semantics.
+    NOTE: By default, for certain violations we return immediately with a very large
+    count (effectively rejecting the chromosome) to enforce 'hard' semantics.
+    With graded=True every violation is counted and scanning continues, so that
+    infeasible chromosomes can be ranked ("one clash" < "two hundred clashes").
     """
     v = defaultdict(int)
 
@@ -64,7 +94,9 @@ def violates_hard(g: List[Gene], data: GAInput) -> Dict[str, int]:
             for s in gene.occupied_slots():
                 if s in data.faculty_unavailability[gene.faculty_id]:
                     # hard fail candidate (faculty scheduled when unavailable)
-                    return {"faculty_unavailable": 999999}
+                    if not graded:
+                        return {"faculty_unavailable": 999999}
+                    v["faculty_unavailable"] += 1
 
         # Usable slot check
         usable_set = getattr(data, "timeslots_usable", None)
@@ -72,28 +104,35 @@ def violates_hard(g: List[Gene], data: GAInput) -> Dict[str, int]:
             for s in gene.occupied_slots():
                 if s not in usable_set:
                     # hard fail: using unusable slot
-                    return {"slot_not_usable": 999999}
+                    if not graded:
+                        return {"slot_not_usable": 999999}
+                    v["slot_not_usable"] += 1
 
         # Room type mismatch
         rtype = getattr(room, "rtype", None) or getattr(room, "room_type", None) or getattr(room, "type", None) or "LECTURE"
         rtype = str(rtype).upper()
-        if subj.subj_type == 'LAB' and rtype != 'LAB':
-            return {"room_type_mismatch": 999999}
-        if subj.subj_type == 'THEORY' and rtype != 'LECTURE':
-            return {"room_type_mismatch": 999999}
+        if (subj.subj_type == 'LAB' and rtype != 'LAB') or (subj.subj_type == 'THEORY' and rtype != 'LECTURE'):
+            if not graded:
+                return {"room_type_mismatch": 999999}
+            v["room_type_mismatch"] += 1
 
         # Room capacity
         sec_obj = data.sections.get(gene.section_id)
         section_size = getattr(sec_obj, "student_count", None) if sec_obj is not None else None
         if section_size is None:
             # missing section mapping -> hard fail
-            return {"missing_section": 999999}
+            if not graded:
+                return {"missing_section": 999999}
+            v["missing_section"] += 1
         else:
             try:
-                if int(getattr(room, "capacity", 0) or 0) < int(section_size or 0):
-                    return {"room_capacity": 999999}
+                too_small = int(getattr(room, "capacity", 0) or 0) < int(section_size or 0)
             except Exception:
-                return {"room_capacity": 999999}
+                too_small = True
+            if too_small:
+                if not graded:
+                    return {"room_capacity": 999999}
+                v["room_capacity"] += 1
 
         # Contiguity for labs (must be consecutive slots within the same day)
         if subj.subj_type == 'LAB':
@@ -102,12 +141,16 @@ def violates_hard(g: List[Gene], data: GAInput) -> Dict[str, int]:
             gene_block = int(getattr(gene, "block_size", 1) or 1)
             if gene_block != expected_block:
                 # hard fail: gene uses wrong block size
-                return {"lab_block_size_wrong": 999999}
+                if not graded:
+                    return {"lab_block_size_wrong": 999999}
+                v["lab_block_size_wrong"] += 1
 
             # ensure occupied_slots length matches block_size
             occ = gene.occupied_slots()
             if len(occ) != gene_block:
-                return {"lab_block_size_mismatch": 999999}
+                if not graded:
+                    return {"lab_block_size_mismatch": 999999}
+                v["lab_block_size_mismatch"] += 1
 
             # day boundary check: all occupied slots must be in same day (use slot_to_day mapping)
             try:
@@ -118,7 +161,10 @@ def violates_hard(g: List[Gene], data: GAInput) -> Dict[str, int]:
             for s in occ:
                 s_day = slot_to_day.get(s, (s - 1) // pday if pday else 0)
                 if s_day != day:
-                    return {"lab_crosses_day": 999999}
+                    if not graded:
+                        return {"lab_crosses_day": 999999}
+                    v["lab_crosses_day"] += 1
+                    break
 
         # Overlaps (teacher/room/section) per occupied slot
         for s in gene.occupied_slots():
@@ -127,17 +173,23 @@ def violates_hard(g: List[Gene], data: GAInput) -> Dict[str, int]:
             key_sec = (gene.section_id, s)
             if key_t in teacher_at_slot:
                 # immediate reject: teacher double-booked
-                return {"teacher_overlap": 999999}
+                if not graded:
+                    return {"teacher_overlap": 999999}
+                v["teacher_overlap"] += 1
             else:
                 teacher_at_slot[key_t] = 1
             if key_r in room_at_slot:
                 # immediate reject: room double-booked
-                return {"room_overlap": 999999}
+                if not graded:
+                    return {"room_overlap": 999999}
+                v["room_overlap"] += 1
             else:
                 room_at_slot[key_r] = 1
             if key_sec in section_at_slot:
                 # immediate reject: section double-booked
-                return {"section_overlap": 999999}
+                if not graded:
+                    return {"section_overlap": 999999}
+                v["section_overlap"] += 1
             else:
                 section_at_slot[key_sec] = 1
 
@@ -156,12 +208,16 @@ def violates_hard(g: List[Gene], data: GAInput) -> Dict[str, int]:
     for (sec, subj, day), cnt in subj_day_count.items():
         if cnt > 1:
             # immediate reject: subject scheduled more than once in same day
-            return {"subject_daily_repeat": 999999}
+            if not graded:
+                return {"subject_daily_repeat": 999999}
+            v["subject_daily_repeat"] += cnt - 1
 
     for (sec, subj, day), cnt in subj_day_lab_count.items():
         if cnt > 1:
             # immediate reject: more than one lab-block of same subject on same day
-            return {"lab_multiple_per_day": 999999}
+            if not graded:
+                return {"lab_multiple_per_day": 999999}
+            v["lab_multiple_per_day"] += cnt - 1
 
     # Subject weekly quota (count sessions per (section,subject))
     # need = required periods; have = scheduled periods (theory=1 per gene, lab=block_size)
@@ -14,4 +14,16 @@ def chromosome_to_rows(chrom: Dict[int, List[Gene]]):
                 "slot_id": g.slot_id,
                 "duration": g.block_size
             })
-    return rows
\ No newline at end of file
+    return rows
+
+def chromosome_to_tuples(chrom: Dict[int, List[Gene]]) -> List[List[int]]:
+    """Compact serialisable form: one [section, subject, faculty, room, slot, block] list per gene."""
+    return [list(g.to_tuple()) for arr in chrom.values() for g in arr]
+
+def chromosome_from_tuples(rows: List[List[int]], data: GAInput) -> Dict[int, List[Gene]]:
+    """Inverse of chromosome_to_tuples (gene order per section is preserved)."""
+    chrom: Dict[int, List[Gene]] = {sec_id: [] for sec_id in data.sections.keys()}
+    for r in rows:
+        g = Gene(*[int(x) for x in r])
+        chrom.setdefault(g.section_id, []).append(g)
+    return chrom
@@ -0,0 +1,18 @@
+# timetable_ga/fingerprint.py
+import hashlib
+import json
+from typing import Dict, Optional
+from .models import GAInput
+
+
+def input_fingerprint(data: GAInput, extra: Optional[Dict] = None) -> str:
+    """
+    Stable SHA-256 of the canonical GAInput (see GAInput.to_dict), optionally mixed
+    with `extra` (e.g. solver parameters). Identical inputs hash identically
+    regardless of dict/set ordering.
+    """
+    payload = {"input": data.to_dict()}
+    if extra:
+        payload["extra"] = extra
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
@@ -1,14 +1,16 @@
 # timetable_ga/fitness.py
 from typing import List, Dict
 from .models import Gene, GAInput
-from .constraints import violates_hard, soft_penalty
+from .constraints import violates_hard, soft_penalty, hard_weighted_total
 
 HARD_HUGE_PENALTY = 1_000_000
 
-def evaluate(chromosome: Dict[int, List[Gene]], data: GAInput) -> Dict:
+def evaluate(chromosome: Dict[int, List[Gene]], data: GAInput, graded: bool = False) -> Dict:
     """
     Chromosome: { section_id: [Gene, ...], ... }
     Returns dict with 'fitness', 'hard_breakdown', 'soft_breakdown'
+    graded=True counts every hard violation (weighted by constraints.HARD_WEIGHTS)
+    instead of rejecting at the first one, so infeasible chromosomes are ranked.
     """
 
     # Flatten genes list
@@ -17,7 +19,7 @@ def evaluate(chromosome: Dict[int, List[Gene]], data: GAInput) -> Dict:
         genes.extend(arr)
 
     # --- existing hard constraint checks ---
-    hard_v = violates_hard(genes, data) or {}
+    hard_v = violates_hard(genes, data, graded=graded) or {}
     # --- NEW: hard check - same subject more than once per section per day ---
     # Build map: (section_id, day_index, subject_id) -> count
     subj_day_counts = {}
@@ -56,11 +58,16 @@ def evaluate(chromosome: Dict[int, List[Gene]], data: GAInput) -> Dict:
         if cnt > 1:
             multi_day_violations += (cnt - 1)
 
-    if multi_day_violations:
+    # graded violates_hard already counts each same-day repeat as subject_daily_repeat;
+    # adding it here too would weigh one repeat twice
+    if multi_day_violations and not graded:
         hard_v = dict(hard_v)  # copy to modify
         hard_v["subject_multiple_per_day"] = hard_v.get("subject_multiple_per_day", 0) + multi_day_violations
 
-    hard_count = sum(hard_v.values()) if hard_v else 0
+    if graded:
+        hard_count = hard_weighted_total(hard_v) if hard_v else 0
+    else:
+        hard_count = sum(hard_v.values()) if hard_v else 0
 
     # If any hard violations -> very negative fitness
     if hard_count > 0:
@@ -1,10 +1,17 @@
 # timetable_ga/ga.py
 import random
+import time
 from typing import Dict, List, Set, Tuple
 from copy import deepcopy
 from .models import Gene, GAInput
-from .initializer import random_chromosome, random_room_for
+from .initializer import random_room_for
+from .population import init_population, load_seed_pool, save_seed_pool
+from .fingerprint import input_fingerprint
+from .encoder import chromosome_to_tuples
+from .checkpoint import save_checkpoint, load_checkpoint
 from .fitness import evaluate
+from .adaptive import AdaptiveController, population_diversity
+from .presets import preset_for
 from collections import defaultdict
 
 # ---------------- SAFE HELPERS ---------------- #
@@ -91,16 +98,19 @@ def safe_sectionwise_crossover(p1: Dict[int, List[Gene]],
 
 # ---------------- SAFE MUTATION ---------------- #
 
-def mutate_safe(chrom: Dict[int, List[Gene]], data: GAInput, rate: float = 0.05) -> Dict[int, List[Gene]]:
+def mutate_safe(chrom: Dict[int, List[Gene]], data: GAInput, rate: float = 0.05,
+                relocate_prob: float = 0.0) -> Dict[int, List[Gene]]:
     """
     Safe mutation:
      - creates new Gene objects (models.Gene is frozen)
      - tries to nudge start within same day and/or change room
+     - with probability relocate_prob, moves the block to a random day instead (larger move)
      - checks conflicts using usage tables
      - prevents same subject more than once per day for a section and multiple lab-blocks per day
     """
     used_sec, used_fac, used_room, subj_day = rebuild_usage_table(chrom, data)
     pday = int(getattr(data, "periods_per_day", 0) or 0)
+    n_days = int(getattr(data, "days", 0) or 0)
 
     for sec, arr in chrom.items():
         for idx, g in enumerate(arr):
@@ -108,8 +118,10 @@ def mutate_safe(chrom: Dict[int, List[Gene]], data: GAInput, rate: float = 0.05)
                 continue
 
             # choose a day-preserving new start (nudge) and a candidate room
-            # determine base day
+            # determine base day (or a random day for a relocation move)
             base_day = _slot_day(g.slot_id, data)
+            if relocate_prob and n_days > 1 and random.random() < relocate_prob:
+                base_day = random.randrange(n_days)
             max_start_in_day = max(1, pday - g.block_size + 1)
             new_start = base_day * pday + random.randint(1, max_start_in_day)
 
@@ -175,26 +187,113 @@ def mutate_safe(chrom: Dict[int, List[Gene]], data: GAInput, rate: float = 0.05)
 # ---------------- GA MAIN ---------------- #
 
 def run_ga(data: GAInput,
-           population_size: int = 80,
-           generations: int = 300,
-           tournament_k: int = 3,
-           crossover_rate: float = 0.9,
-           mutate_rate: float = 0.05,
-           elitism_fraction: float = 0.08,
-           seed = None):
-
-    if seed is not None:
-        random.seed(seed)
-
-    # initialize
-    population = [random_chromosome(data) for _ in range(population_size)]
-    evals = [evaluate(c, data) for c in population]
-    fits = [e["fitness"] for e in evals]
-
+           population_size: int = None,
+           generations: int = None,
+           tournament_k: int = None,
+           crossover_rate: float = None,
+           mutate_rate: float = None,
+           elitism_fraction: float = None,
+           seed = None,
+           init_strategy: str = "constructive",
+           graded_hard: bool = True,
+           adaptive: bool = True,
+           time_limit: float = None,
+           init_workers: int = 1,
+           init_cache_dir: str = None,
+           init_cache_size: int = 16,
+           checkpoint_path: str = None,
+           checkpoint_every: int = 25,
+           resume: Dict = None):
+    """
+    population_size .. elitism_fraction: any left as None is taken from the size-aware
+                 preset for this instance (see presets.preset_for / tuning.py).
+    init_strategy: 'constructive' (most-constrained-first, see initializer.constructive_chromosome)
+                   or 'random' (random_chromosome).
+    graded_hard: count and weight every hard violation (see fitness.evaluate) so
+                 selection can move infeasible populations toward feasibility.
+    adaptive: let adaptive.AdaptiveController tune crossover/mutation rates and the
+              share of cross-day relocation moves from improvement and diversity;
+              crossover_rate/mutate_rate are then the starting values.
+    time_limit: optional wall-clock budget in seconds; no new generation starts once
+                it has expired ('generations' reports how many actually ran).
+    init_workers: build the initial population across this many processes.
+    init_cache_dir: if set, seed the population from (and afterwards store the best
+                    init_cache_size chromosomes into) a pool keyed by the input fingerprint.
+    checkpoint_path: if set, write a checkpoint (see checkpoint.save_checkpoint) every
+                     checkpoint_every generations and when the run ends.
+    resume: checkpoint payload to continue from; use resume_ga() rather than passing it.
+    """
+    started = time.monotonic()
+
+    # fill unspecified GA parameters from the size-aware preset
+    preset = preset_for(data)
+    given = dict(population_size=population_size, generations=generations, tournament_k=tournament_k,
+                 crossover_rate=crossover_rate, mutate_rate=mutate_rate, elitism_fraction=elitism_fraction)
+    resolved = {k: (v if v is not None else preset["params"][k]) for k, v in given.items()}
+    population_size, generations, tournament_k = resolved["population_size"], resolved["generations"], resolved["tournament_k"]
+    crossover_rate, mutate_rate, elitism_fraction = resolved["crossover_rate"], resolved["mutate_rate"], resolved["elitism_fraction"]
+
+    params = dict(population_size=population_size, generations=generations, tournament_k=tournament_k,
+                  crossover_rate=crossover_rate, mutate_rate=mutate_rate, elitism_fraction=elitism_fraction,
+                  init_strategy=init_strategy, graded_hard=graded_hard, adaptive=adaptive,
+                  checkpoint_every=checkpoint_every)
+    fingerprint = input_fingerprint(data) if (init_cache_dir or checkpoint_path or resume) else None
+
+    if resume is not None:
+        if resume.get("fingerprint") != fingerprint:
+            raise ValueError("Checkpoint was written for different input data (fingerprint mismatch).")
+        population = resume["population"]
+        fits = list(resume["fits"])
+        evals = [None] * len(population)  # recomputed after the next generation
+        best = (resume["best"]["fitness"], resume["best"]["chromosome"], resume["best"]["eval"])
+        init_report = resume.get("init") or {}
+        start_gen = int(resume["generation"])
+        curve = [list(pt) for pt in resume.get("curve") or []]
+        ctrl = AdaptiveController.from_dict(resume["controller"]) if resume.get("controller") else None
+        if ctrl is not None:
+            mutate_rate, crossover_rate = ctrl.mutate_rate, ctrl.crossover_rate
+        random.setstate(resume["rng_state"])
+    else:
+        if seed is not None:
+            random.seed(seed)
+
+        # initialize (cached seed pool first, then fresh chromosomes, possibly in parallel)
+        init_stats = {"blocks": 0, "fallbacks": 0}
+        population = load_seed_pool(init_cache_dir, fingerprint, data)[:population_size] if init_cache_dir else []
+        n_cached = len(population)
+        population += init_population(data, population_size - n_cached, init_strategy,
+                                      workers=init_workers, stats=init_stats)
+        evals = [evaluate(c, data, graded=graded_hard) for c in population]
+        fits = [e["fitness"] for e in evals]
+        init_report = {
+            "strategy": "random" if init_strategy == "random" else "constructive",
+            "workers": init_workers,
+            "cached": n_cached,
+            "blocks": init_stats["blocks"],
+            "fallbacks": init_stats["fallbacks"],
+            "fallback_rate": (init_stats["fallbacks"] / init_stats["blocks"]) if init_stats["blocks"] else 0.0,
+            "infeasible_individuals": sum(1 for e in evals if e["hard_breakdown"]),
+        }
+        best = max(zip(fits, population, evals), key=lambda x: x[0])
+        start_gen = 0
+        curve = [[0, max(fits), sum(fits) / len(fits)]] if fits else []
+        ctrl = AdaptiveController(mutate_rate=mutate_rate, crossover_rate=crossover_rate) if adaptive else None
+
+    init_done = time.monotonic()
     elite_n = max(1, int(elitism_fraction * population_size))
-    best = max(zip(fits, population, evals), key=lambda x: x[0])
-
-    for gen in range(generations):
+    relocate_prob = ctrl.relocate_prob if (ctrl is not None and resume is not None) else 0.0
+    gens_run = start_gen
+
+    def _checkpoint(completed: bool = False):
+        save_checkpoint(checkpoint_path, generation=gens_run, population=population, fits=fits, best=best,
+                        params=params, fingerprint=fingerprint,
+                        controller=ctrl.to_dict() if ctrl is not None else None,
+                        init_report=init_report, curve=curve, completed=completed)
+
+    for gen in range(start_gen, generations):
+        if time_limit is not None and time.monotonic() - started >= time_limit:
+            break
+        gens_run = gen + 1
         new_pop = []
 
         # Elitism
@@ -217,24 +316,75 @@ def run_ga(data: GAInput,
             c1, c2 = safe_sectionwise_crossover(p1, p2, data, rate=crossover_rate)
 
             # mutate safely
-            mutate_safe(c1, data, rate=mutate_rate)
-            mutate_safe(c2, data, rate=mutate_rate)
+            mutate_safe(c1, data, rate=mutate_rate, relocate_prob=relocate_prob)
+            mutate_safe(c2, data, rate=mutate_rate, relocate_prob=relocate_prob)
 
             new_pop.extend([c1, c2])
 
         population = new_pop[:population_size]
-        evals = [evaluate(c, data) for c in population]
+        evals = [evaluate(c, data, graded=graded_hard) for c in population]
         fits = [e["fitness"] for e in evals]
 
         # track best
         cand = max(zip(fits, population, evals), key=lambda x: x[0])
-        if cand[0] > best[0]:
+        improved = cand[0] > best[0]
+        if improved:
             best = cand
+        # convergence curve: [generation, best-so-far, population mean]
+        curve.append([gens_run, best[0], sum(fits) / len(fits)])
+
+        # adapt operator rates for the next generation
+        if ctrl is not None:
+            ctrl.update(gen, improved, population_diversity(fits))
+            mutate_rate, crossover_rate, relocate_prob = ctrl.mutate_rate, ctrl.crossover_rate, ctrl.relocate_prob
+
+        if checkpoint_path and checkpoint_every > 0 and gens_run % checkpoint_every == 0:
+            _checkpoint()
+
+    if checkpoint_path:
+        _checkpoint(completed=gens_run >= generations)
 
     best_fitness, best_chrom, best_eval = best
+
+    if init_cache_dir:
+        # keep the best distinct chromosomes as next run's starting pool
+        ranked = sorted(zip(fits, population), key=lambda x: x[0], reverse=True)
+        pool, pool_fits, seen = [], [], set()
+        for f, c in [(best_fitness, best_chrom)] + ranked:
+            key = tuple(map(tuple, chromosome_to_tuples(c)))
+            if key in seen:
+                continue
+            seen.add(key)
+            pool.append(c); pool_fits.append(f)
+            if len(pool) >= init_cache_size:
+                break
+        try:
+            save_seed_pool(init_cache_dir, fingerprint, pool, pool_fits)
+        except OSError:
+            pass  # cache is best-effort
     return {
         "best_chromosome": best_chrom,
         "fitness": best_fitness,
         "eval": best_eval,
-        "generations": generations
-    }
\ No newline at end of file
+        "generations": gens_run,
+        "elapsed": round(time.monotonic() - started, 3),
+        "phases": {"init": round(init_done - started, 3), "evolve": round(time.monotonic() - init_done, 3)},
+        "curve": curve,
+        "init": init_report,
+        "params": {**params, "preset": preset["preset"] if any(v is None for v in given.values()) else None,
+                   "size": preset["size"]},
+        "rate_trajectory": ctrl.trajectory if ctrl is not None else [],
+    }
+
+def resume_ga(checkpoint_path: str, data: GAInput, **overrides):
+    """
+    Continue a run from its latest checkpoint (written by run_ga(checkpoint_path=...)).
+    The original run parameters are restored from the checkpoint; `overrides` may
+    change e.g. generations or time_limit. Checkpointing continues to the same file.
+    A checkpoint of a finished run returns its result without running further.
+    """
+    state = load_checkpoint(checkpoint_path, data)
+    params = dict(state["params"])
+    params.update(overrides)
+    params.setdefault("checkpoint_path", checkpoint_path)
+    return run_ga(data, resume=state, **params)
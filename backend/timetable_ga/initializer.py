@@ -1,6 +1,6 @@
 # timetable_ga/initializer.py
 import random
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 from collections import defaultdict
 from .models import GAInput, Gene
 
@@ -95,13 +95,14 @@ def random_slot_start(block_size: int, data: GAInput) -> int:
         return min(usable)
     return 1
 
-def random_chromosome(data: GAInput) -> Dict[int, List[Gene]]:
+def random_chromosome(data: GAInput, stats: Optional[Dict[str, int]] = None) -> Dict[int, List[Gene]]:
     """
     Build initial chromosome honoring:
       - contiguous_block_size for labs (exactly),
       - at most one occurrence of same subject per section per day,
       - no section/faculty/room overlaps,
       - attempts many starts before fallback.
+    If `stats` is given, 'blocks' and 'fallbacks' counters are accumulated in it.
     """
     chrom: Dict[int, List[Gene]] = {sec_id: [] for sec_id in data.sections.keys()}
 
@@ -140,6 +141,8 @@ def random_chromosome(data: GAInput) -> Dict[int, List[Gene]]:
         # For each required block, try to find a non-conflicting placement
         for _ in range(blocks):
             placed = False
+            if stats is not None:
+                stats["blocks"] = stats.get("blocks", 0) + 1
             random.shuffle(starts)
             for s in starts:
                 day_idx = _slot_day(s, data)
@@ -194,6 +197,8 @@ def random_chromosome(data: GAInput) -> Dict[int, List[Gene]]:
 
             if not placed:
                 # last-resort fallback: choose random usable start and room (will be penalized by fitness)
+                if stats is not None:
+                    stats["fallbacks"] = stats.get("fallbacks", 0) + 1
                 s = random_slot_start(block_size, data)
                 r = random_room_for("LAB" if is_lab else "THEORY", data, int(getattr(sec, "student_count", 0) or 0))
                 gene = Gene(section_id=sec_id, subject_id=subj_id, faculty_id=fac_id, room_id=r, slot_id=s, block_size=block_size)
@@ -206,4 +211,130 @@ def random_chromosome(data: GAInput) -> Dict[int, List[Gene]]:
                     used_slots_faculty[fac_id].add(slot)
                     used_slots_room[r].add(slot)
 
-    return chrom
\ No newline at end of file
+    return chrom
+
+# ---------------- CONSTRUCTIVE (most-constrained-first) ---------------- #
+
+def _curriculum_blocks(data: GAInput) -> List[Tuple[int, int, int, int, bool, int]]:
+    """Expand curriculum into (section_id, subject_id, faculty_id, block_size, is_lab, blocks) rows."""
+    out = []
+    for (sec_id, subj_id, fac_id) in data.curriculum:
+        subj = data.subjects.get(subj_id)
+        if subj is None or data.sections.get(sec_id) is None:
+            continue
+        total_lectures = int(getattr(subj, "lecture_count", 0) or 0)
+        is_lab = (getattr(subj, "subj_type", "THEORY") or "THEORY").upper() == "LAB"
+        block_size = max(1, int(getattr(subj, "contiguous_block_size", 1) or 1) if is_lab else 1)
+        blocks = max(0, total_lectures) if block_size == 1 else max(0, total_lectures // block_size)
+        if blocks:
+            out.append((sec_id, subj_id, fac_id, block_size, is_lab, blocks))
+    return out
+
+def constructive_chromosome(data: GAInput, stats: Optional[Dict[str, int]] = None) -> Dict[int, List[Gene]]:
+    """
+    DSatur-style constructive initializer.
+
+    Blocks are placed most-constrained-first: labs, then rows whose faculty carry
+    the most periods / unavailability, then rows with the fewest suitable rooms.
+    Each block takes the least-constraining feasible placement: the start that
+    leaves the most matching rooms free, in the smallest room that fits.
+    Only fully feasible placements (type, capacity, availability, no overlaps) are
+    accepted; otherwise the block falls back to a random placement like
+    random_chromosome and is counted in stats['fallbacks'].
+    """
+    chrom: Dict[int, List[Gene]] = {sec_id: [] for sec_id in data.sections.keys()}
+    usable = set(getattr(data, "timeslots_usable", set()) or set())
+    pday = int(getattr(data, "periods_per_day", 0) or 0)
+    unavail = getattr(data, "faculty_unavailability", {}) or {}
+    slot_day = {int(sid): idx // pday for idx, sid in enumerate(data.slot_order or [])} if pday else {}
+
+    rows = list(enumerate(_curriculum_blocks(data)))
+
+    # Static difficulty measures
+    fac_load = defaultdict(int)  # faculty_id -> periods demanded
+    for _i, (sec_id, subj_id, fac_id, block_size, is_lab, blocks) in rows:
+        fac_load[fac_id] += block_size * blocks
+
+    room_pool: Dict[Tuple[bool, int], List[int]] = {}  # (is_lab, min_cap) -> room_ids, smallest first
+
+    def _pool(is_lab: bool, need_cap: int) -> List[int]:
+        key = (is_lab, need_cap)
+        if key not in room_pool:
+            desired = "LAB" if is_lab else "LECTURE"
+            fits = [r for r in data.rooms.values() if _rtype(r) == desired and _rcap(r) >= need_cap]
+            fits.sort(key=_rcap)
+            room_pool[key] = [r.room_id for r in fits]
+        return room_pool[key]
+
+    def _difficulty(item):
+        sec_id, subj_id, fac_id, block_size, is_lab, blocks = item[1]
+        need_cap = int(getattr(data.sections[sec_id], "student_count", 0) or 0)
+        return (
+            1 if is_lab else 0,
+            fac_load[fac_id] + len(unavail.get(fac_id, ())),
+            -len(_pool(is_lab, need_cap)),
+            random.random(),  # tie-break keeps the population diverse
+        )
+
+    rows.sort(key=_difficulty, reverse=True)
+
+    used_sec = defaultdict(set)
+    used_fac = defaultdict(set)
+    used_room = defaultdict(set)
+    subject_days = defaultdict(set)
+
+    starts_by_block: Dict[int, List[int]] = {}
+    placed: Dict[int, List[Gene]] = defaultdict(list)  # curriculum row index -> genes
+
+    for row_ix, (sec_id, subj_id, fac_id, block_size, is_lab, blocks) in rows:
+        sec = data.sections[sec_id]
+        need_cap = int(getattr(sec, "student_count", 0) or 0)
+        pool = _pool(is_lab, need_cap)
+        blocked = unavail.get(fac_id, set())
+        if block_size not in starts_by_block:
+            starts_by_block[block_size] = list(_block_starts(usable, pday, block_size))
+        starts = starts_by_block[block_size][:]
+
+        for _ in range(blocks):
+            if stats is not None:
+                stats["blocks"] = stats.get("blocks", 0) + 1
+            random.shuffle(starts)
+
+            best = None  # (free_rooms_left, start, room_id)
+            for s in starts:
+                day_idx = slot_day.get(s, (s - 1) // pday if pday else 0)
+                if day_idx in subject_days[(sec_id, subj_id)]:
+                    continue
+                occ = [s + k for k in range(block_size)]
+                if any(x in used_sec[sec_id] or x in used_fac[fac_id] or x in blocked for x in occ):
+                    continue
+                free = [r for r in pool if not any(x in used_room[r] for x in occ)]
+                if not free:
+                    continue
+                # least-constraining: keep the most matching rooms free after placing
+                if best is None or len(free) > best[0]:
+                    best = (len(free), s, free[0])
+
+            if best is None:
+                if stats is not None:
+                    stats["fallbacks"] = stats.get("fallbacks", 0) + 1
+                s = random_slot_start(block_size, data)
+                room_id = random_room_for("LAB" if is_lab else "THEORY", data, need_cap)
+            else:
+                _, s, room_id = best
+
+            placed[row_ix].append(Gene(section_id=sec_id, subject_id=subj_id, faculty_id=fac_id,
+                                       room_id=room_id, slot_id=s, block_size=block_size))
+            subject_days[(sec_id, subj_id)].add(slot_day.get(s, (s - 1) // pday if pday else 0))
+            for k in range(block_size):
+                used_sec[sec_id].add(s + k)
+                used_fac[fac_id].add(s + k)
+                used_room[room_id].add(s + k)
+
+    # Emit genes in curriculum order so sectionwise crossover cut points line up
+    # with chromosomes from random_chromosome.
+    for row_ix in sorted(placed):
+        for gene in placed[row_ix]:
+            chrom[gene.section_id].append(gene)
+
+    return chrom
@@ -69,3 +69,38 @@ class GAInput:
 
     # NEW: lunch window slots (set of slot_id that fall into lunch window)
     lunch_slots: Set[int] = field(default_factory=set)
+
+    def to_dict(self) -> Dict:
+        """Canonical JSON-friendly form (sorted, ints as keys become lists) for hashing/snapshots."""
+        return {
+            "sections": [[s.section_id, s.name, s.student_count] for _k, s in sorted(self.sections.items())],
+            "subjects": [[s.subject_id, s.lecture_count, s.subj_type, s.contiguous_block_size]
+                         for _k, s in sorted(self.subjects.items())],
+            "curriculum": sorted([int(a), int(b), int(c)] for (a, b, c) in self.curriculum),
+            "rooms": [[r.room_id, r.rtype, r.capacity] for _k, r in sorted(self.rooms.items())],
+            "faculty": [[f.faculty_id, f.max_load] for _k, f in sorted(self.faculty.items())],
+            "faculty_unavailability": [[int(fid), sorted(int(x) for x in slots)]
+                                       for fid, slots in sorted(self.faculty_unavailability.items())],
+            "timeslots_usable": sorted(int(x) for x in self.timeslots_usable),
+            "periods_per_day": int(self.periods_per_day),
+            "days": int(self.days),
+            "slot_order": [int(x) for x in self.slot_order],
+            "lunch_slots": sorted(int(x) for x in self.lunch_slots),
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "GAInput":
+        """Inverse of to_dict()."""
+        return cls(
+            sections={r[0]: Section(r[0], r[1], r[2]) for r in d["sections"]},
+            subjects={r[0]: Subject(r[0], r[1], r[2], r[3]) for r in d["subjects"]},
+            curriculum=[tuple(r) for r in d["curriculum"]],
+            rooms={r[0]: Room(r[0], r[1], r[2]) for r in d["rooms"]},
+            faculty={r[0]: Faculty(r[0], r[1]) for r in d["faculty"]},
+            faculty_unavailability={r[0]: set(r[1]) for r in d["faculty_unavailability"]},
+            timeslots_usable=set(d["timeslots_usable"]),
+            periods_per_day=d["periods_per_day"],
+            days=d["days"],
+            slot_order=list(d["slot_order"]),
+            lunch_slots=set(d.get("lunch_slots", [])),
+        )
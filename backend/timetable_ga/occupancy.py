@@ -0,0 +1,125 @@
+# timetable_ga/occupancy.py
+"""
+Compact per-faculty and per-room occupancy of a solved timetable.
+
+Built from the same usage maps the GA repairs with (ga.rebuild_usage_table),
+re-keyed from slot ids to week positions (index in GAInput.slot_order, so
+day = pos // periods_per_day). Each entity gets an int bitmask of busy
+positions plus its cells, which answers "where is faculty X", "what is in
+room Y" and "which rooms are free at day d, period p" without touching the
+entries table.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .models import GAInput, Gene
+from .ga import rebuild_usage_table
+
+FORMAT_VERSION = 1
+
+
+@dataclass(slots=True)
+class Occupancy:
+    days: int
+    periods_per_day: int
+    slot_order: List[int]
+    # entity id -> [(pos, section_id, subject_id, other_id)]; other = room for faculty, faculty for rooms
+    faculty_cells: Dict[int, List[Tuple[int, int, int, int]]]
+    room_cells: Dict[int, List[Tuple[int, int, int, int]]]
+    room_meta: Dict[int, Tuple[str, int]]        # room_id -> (rtype, capacity), GA-eligible rooms
+    faculty_mask: Dict[int, int] = field(default_factory=dict)
+    room_mask: Dict[int, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.faculty_mask:
+            self.faculty_mask = {k: _mask(c) for k, c in self.faculty_cells.items()}
+        if not self.room_mask:
+            self.room_mask = {k: _mask(c) for k, c in self.room_cells.items()}
+
+    def slot_at(self, pos: int) -> Optional[int]:
+        return self.slot_order[pos] if 0 <= pos < len(self.slot_order) else None
+
+    def faculty_week(self, faculty_id: int) -> List[Tuple[int, int, int, int]]:
+        return self.faculty_cells.get(faculty_id, [])
+
+    def room_week(self, room_id: int) -> List[Tuple[int, int, int, int]]:
+        return self.room_cells.get(room_id, [])
+
+    def free_rooms(self, day: int, period: int, span: int = 1, rtype: Optional[str] = None,
+                   min_capacity: int = 0) -> List[int]:
+        """
+        Room ids free for `span` consecutive periods starting at (day, period), both
+        0-based, smallest fitting room first. Empty if the span runs past the day.
+        """
+        pday = self.periods_per_day
+        if span < 1 or not (0 <= day < self.days) or period < 0 or period + span > pday:
+            return []
+        want = ((1 << span) - 1) << (day * pday + period)
+        free = [rid for rid, (rt, cap) in self.room_meta.items()
+                if not (self.room_mask.get(rid, 0) & want)
+                and (rtype is None or rt == rtype) and cap >= min_capacity]
+        free.sort(key=lambda rid: (self.room_meta[rid][1], rid))
+        return free
+
+    def to_dict(self) -> Dict:
+        return {
+            "format": FORMAT_VERSION,
+            "days": self.days,
+            "periods_per_day": self.periods_per_day,
+            "slot_order": self.slot_order,
+            "faculty": [[k, [list(c) for c in v]] for k, v in sorted(self.faculty_cells.items())],
+            "rooms": [[k, [list(c) for c in v]] for k, v in sorted(self.room_cells.items())],
+            "room_meta": [[k, rt, cap] for k, (rt, cap) in sorted(self.room_meta.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "Occupancy":
+        if d.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported occupancy format {d.get('format')!r}")
+        return cls(
+            days=int(d["days"]),
+            periods_per_day=int(d["periods_per_day"]),
+            slot_order=[int(s) for s in d["slot_order"]],
+            faculty_cells={int(k): [tuple(c) for c in v] for k, v in d["faculty"]},
+            room_cells={int(k): [tuple(c) for c in v] for k, v in d["rooms"]},
+            room_meta={int(k): (rt, int(cap)) for k, rt, cap in d["room_meta"]},
+        )
+
+
+def _mask(cells) -> int:
+    m = 0
+    for c in cells:
+        m |= 1 << c[0]
+    return m
+
+
+def build_occupancy(data: GAInput, chrom: Dict[int, List[Gene]]) -> Occupancy:
+    """Occupancy of a chromosome (dict section_id -> genes); lab blocks mark every slot they cover."""
+    pos = {s: i for i, s in enumerate(data.slot_order)}
+    _used_sec, used_fac, used_room, _subj_day = rebuild_usage_table(chrom, data)
+    # which gene holds each (faculty, slot) / (room, slot) the usage maps report busy
+    fac_at: Dict[Tuple[int, int], Gene] = {}
+    room_at: Dict[Tuple[int, int], Gene] = {}
+    for arr in chrom.values():
+        for g in arr:
+            for s in g.occupied_slots():
+                fac_at.setdefault((g.faculty_id, s), g)
+                room_at.setdefault((g.room_id, s), g)
+
+    def cells(used, at, other):
+        out = {}
+        for eid, slots in used.items():
+            row = [(pos[s], at[(eid, s)].section_id, at[(eid, s)].subject_id, other(at[(eid, s)]))
+                   for s in slots if s in pos]
+            out[int(eid)] = sorted(row)
+        return out
+
+    return Occupancy(
+        days=int(data.days),
+        periods_per_day=int(data.periods_per_day),
+        slot_order=list(data.slot_order),
+        faculty_cells=cells(used_fac, fac_at, lambda g: g.room_id),
+        room_cells=cells(used_room, room_at, lambda g: g.faculty_id),
+        room_meta={rid: (r.rtype, int(r.capacity)) for rid, r in data.rooms.items()},
+    )
@@ -0,0 +1,113 @@
+# timetable_ga/population.py
+import json
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .models import Gene, GAInput
+from .initializer import random_chromosome, constructive_chromosome
+from .encoder import chromosome_to_tuples, chromosome_from_tuples
+
+Chromosome = Dict[int, List[Gene]]
+
+
+def _init_fn(strategy: str):
+    return random_chromosome if strategy == "random" else constructive_chromosome
+
+
+def _build_chunk(data: GAInput, count: int, strategy: str, seed: int) -> Tuple[List[Chromosome], Dict[str, int]]:
+    """Worker: build `count` chromosomes with a private RNG seed."""
+    random.seed(seed)
+    stats = {"blocks": 0, "fallbacks": 0}
+    fn = _init_fn(strategy)
+    return [fn(data, stats=stats) for _ in range(count)], stats
+
+
+def init_population(data: GAInput, size: int, strategy: str = "constructive",
+                    workers: int = 1, stats: Optional[Dict[str, int]] = None) -> List[Chromosome]:
+    """
+    Build `size` initial chromosomes, spread over `workers` processes when > 1.
+    Chunk seeds are drawn from the global RNG, so a seeded run_ga stays reproducible.
+    Block/fallback counters are accumulated into `stats`.
+    """
+    if stats is None:
+        stats = {}
+    if size <= 0:
+        return []
+    if workers <= 1 or size < 2 * workers:
+        fn = _init_fn(strategy)
+        return [fn(data, stats=stats) for _ in range(size)]
+
+    base, extra = divmod(size, workers)
+    counts = [base + (1 if i < extra else 0) for i in range(workers)]
+    seeds = [random.randrange(2**31) for _ in counts]
+
+    population: List[Chromosome] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_build_chunk, data, n, strategy, s) for n, s in zip(counts, seeds)]
+        for fut in futures:
+            chroms, st = fut.result()
+            population.extend(chroms)
+            for k, v in st.items():
+                stats[k] = stats.get(k, 0) + v
+    return population
+
+
+# ---------------- Seed-pool cache ---------------- #
+
+def _pool_path(cache_dir: str, fingerprint: str) -> str:
+    return os.path.join(cache_dir, f"seedpool_{fingerprint}.json")
+
+
+def load_seed_pool(cache_dir: str, fingerprint: str, data: GAInput) -> List[Chromosome]:
+    """
+    Load cached starting chromosomes for this input fingerprint ([] if none).
+    Genes are re-ordered to the current curriculum order so sectionwise crossover
+    cut points line up with freshly built chromosomes.
+    """
+    path = _pool_path(cache_dir, fingerprint)
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            payload = json.load(fh)
+    except (OSError, ValueError):
+        return []
+
+    order = {}
+    for ix, (sec_id, subj_id, _fac) in enumerate(data.curriculum):
+        order.setdefault((int(sec_id), int(subj_id)), ix)
+
+    pool = []
+    for rows in payload.get("chromosomes", []):
+        chrom = chromosome_from_tuples(rows, data)
+        for sec_id, arr in chrom.items():
+            arr.sort(key=lambda g: order.get((g.section_id, g.subject_id), len(order)))
+        pool.append(chrom)
+    return pool
+
+
+def save_seed_pool(cache_dir: str, fingerprint: str, chromosomes: List[Chromosome],
+                   fitnesses: List[float]) -> None:
+    """Persist chromosomes (best first) as the seed pool for this fingerprint; atomic replace."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _pool_path(cache_dir, fingerprint)
+    payload = {
+        "fingerprint": fingerprint,
+        "fitness": list(fitnesses),
+        "chromosomes": [chromosome_to_tuples(c) for c in chromosomes],
+    }
+    # a private temp file per writer: concurrent saves of the same fingerprint never share one
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=f"seedpool_{fingerprint}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
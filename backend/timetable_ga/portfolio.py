@@ -0,0 +1,108 @@
+# timetable_ga/portfolio.py
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from .models import GAInput
+from .ga import run_ga
+
+
+def _portfolio_worker(data: GAInput, params: Dict, seed: int, deadline: Optional[float]) -> Dict:
+    """Run one GA inside a worker process, honouring the shared wall-clock deadline."""
+    kwargs = dict(params)
+    if deadline is not None:
+        remaining = max(0.0, deadline - time.time())
+        kwargs["time_limit"] = min(kwargs.get("time_limit") or remaining, remaining)
+    result = run_ga(data, seed=seed, **kwargs)
+    result["seed"] = seed  # result["params"] already holds the resolved run parameters
+    return result
+
+
+def run_portfolio(data: GAInput,
+                  runs: int = 4,
+                  param_sets: Optional[List[Dict]] = None,
+                  time_limit: Optional[float] = None,
+                  max_workers: Optional[int] = None,
+                  seed: Optional[int] = None,
+                  **ga_kwargs) -> Dict:
+    """
+    Launch `runs` independent GA runs with different seeds in a process pool and
+    return the best one plus summary statistics across the portfolio.
+
+    param_sets: optional list of run_ga keyword dicts; run i uses
+                param_sets[i % len(param_sets)] layered over ga_kwargs.
+    time_limit: one shared deadline (seconds) for the whole portfolio.
+    max_workers: pool size (defaults to min(runs, cpu count)); 1 runs serially.
+    seed: base seed; run seeds are drawn from it so a portfolio is reproducible.
+
+    The returned dict has the same keys as run_ga's result (best run), plus
+    'portfolio' with per-run summaries and fitness statistics.
+    """
+    runs = max(1, int(runs))
+    rng = random.Random(seed)
+    seeds = [rng.randrange(2**31) for _ in range(runs)]
+    sets = param_sets or [{}]
+    plans = [({**ga_kwargs, **sets[i % len(sets)]}, seeds[i]) for i in range(runs)]
+    for i, (params, _s) in enumerate(plans):
+        if params.get("checkpoint_path"):
+            # one checkpoint file per run, never shared between workers
+            params["checkpoint_path"] = f"{params['checkpoint_path']}.run{i}"
+
+    deadline = time.time() + time_limit if time_limit is not None else None
+    workers = max_workers or min(runs, os.cpu_count() or 1)
+    started = time.monotonic()
+
+    results: List[Dict] = []
+    if workers <= 1:
+        for params, s in plans:
+            try:
+                results.append(_portfolio_worker(data, params, s, deadline))
+            except Exception as e:
+                # same as a crashed pool worker: record it and keep going
+                results.append({"fitness": None, "error": str(e), "seed": s})
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_portfolio_worker, data, params, s, deadline) for params, s in plans]
+            for fut, (_params, s) in zip(futures, plans):
+                try:
+                    results.append(fut.result())
+                except Exception as e:
+                    # a crashed run must not sink the whole portfolio
+                    results.append({"fitness": None, "error": str(e), "seed": s})
+
+    ok = [r for r in results if r.get("fitness") is not None]
+    if not ok:
+        raise RuntimeError("All portfolio runs failed: " + "; ".join(r.get("error", "") for r in results))
+
+    best = max(ok, key=lambda r: r["fitness"])
+    fits = [r["fitness"] for r in ok]
+    summary = {
+        "runs": runs,
+        "completed": len(ok),
+        "workers": workers,
+        "elapsed": round(time.monotonic() - started, 3),
+        "best_fitness": best["fitness"],
+        "mean_fitness": statistics.mean(fits),
+        "stdev_fitness": statistics.pstdev(fits),
+        "worst_fitness": min(fits),
+        "feasible_runs": sum(1 for r in ok if not (r.get("eval") or {}).get("hard_breakdown")),
+        "best_seed": best["seed"],
+        "per_run": [
+            {
+                "seed": r.get("seed"),
+                "params": r.get("params"),
+                "fitness": r.get("fitness"),
+                "generations": r.get("generations"),
+                "elapsed": r.get("elapsed"),
+                "error": r.get("error"),
+            }
+            for r in results
+        ],
+    }
+
+    out = dict(best)
+    out["portfolio"] = summary
+    return out
@@ -0,0 +1,107 @@
+# timetable_ga/presets.py
+import json
+import os
+from typing import Dict, Optional
+
+from .models import GAInput
+
+# Parameters a preset may set (everything else stays a run_ga default).
+PRESET_KEYS = ("population_size", "generations", "tournament_k",
+               "crossover_rate", "mutate_rate", "elitism_fraction")
+
+# Size classes by gene and section count (upper bounds inclusive; an instance takes the
+# first class both fit). Sections count on their own because crossover swaps whole
+# sections: many small sections recombine differently from a few large ones.
+# Tight instances get their own preset.
+SIZE_CLASSES = (("small", 300, 20), ("medium", 2000, 120), ("large", 10000, 600), ("xlarge", None, None))
+TIGHT_THRESHOLD = 0.85
+
+# Built-in presets; a tuned presets.json (see tuning.py) overrides them per key.
+DEFAULT_PRESETS: Dict[str, Dict] = {
+    "small":        dict(population_size=80, generations=300, tournament_k=3, crossover_rate=0.9, mutate_rate=0.05, elitism_fraction=0.08),
+    "small-tight":  dict(population_size=80, generations=400, tournament_k=3, crossover_rate=0.85, mutate_rate=0.08, elitism_fraction=0.08),
+    "medium":       dict(population_size=60, generations=250, tournament_k=3, crossover_rate=0.9, mutate_rate=0.04, elitism_fraction=0.08),
+    "medium-tight": dict(population_size=60, generations=300, tournament_k=3, crossover_rate=0.85, mutate_rate=0.06, elitism_fraction=0.08),
+    "large":        dict(population_size=40, generations=150, tournament_k=4, crossover_rate=0.9, mutate_rate=0.03, elitism_fraction=0.1),
+    "large-tight":  dict(population_size=40, generations=200, tournament_k=4, crossover_rate=0.85, mutate_rate=0.05, elitism_fraction=0.1),
+    "xlarge":       dict(population_size=24, generations=80, tournament_k=4, crossover_rate=0.9, mutate_rate=0.02, elitism_fraction=0.1),
+    "xlarge-tight": dict(population_size=24, generations=120, tournament_k=4, crossover_rate=0.85, mutate_rate=0.04, elitism_fraction=0.1),
+}
+
+PRESETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "presets.json")
+
+_loaded: Optional[Dict[str, Dict]] = None
+
+
+def problem_size(data: GAInput) -> Dict:
+    """
+    Size features used to pick a preset:
+      sections, genes (blocks to place) and tightness = the highest utilisation of
+      lecture rooms, lab rooms, or a single section's week (1.0 = no slack at all).
+    """
+    slots = len(data.timeslots_usable) or 1
+    genes = 0
+    theory = lab = 0
+    per_section: Dict[int, int] = {}
+    for (sec_id, subj_id, _fac) in data.curriculum:
+        subj = data.subjects.get(subj_id)
+        if subj is None:
+            continue
+        periods = int(subj.lecture_count or 0)
+        is_lab = (subj.subj_type or "").upper() == "LAB"
+        block = max(1, int(subj.contiguous_block_size or 1)) if is_lab else 1
+        genes += periods // block
+        if is_lab:
+            lab += periods
+        else:
+            theory += periods
+        per_section[sec_id] = per_section.get(sec_id, 0) + periods
+
+    lec_rooms = sum(1 for r in data.rooms.values() if (r.rtype or "").upper() != "LAB")
+    lab_rooms = sum(1 for r in data.rooms.values() if (r.rtype or "").upper() == "LAB")
+    util = [
+        theory / (lec_rooms * slots) if lec_rooms else (1.0 if theory else 0.0),
+        lab / (lab_rooms * slots) if lab_rooms else (1.0 if lab else 0.0),
+        max(per_section.values()) / slots if per_section else 0.0,
+    ]
+    return {"sections": len(data.sections), "genes": genes, "tightness": round(max(util), 3)}
+
+
+def size_class(size: Dict) -> str:
+    """Preset key for a problem_size() dict, e.g. 'medium' or 'large-tight'."""
+    name = SIZE_CLASSES[-1][0]
+    for cls, max_genes, max_sections in SIZE_CLASSES:
+        if ((max_genes is None or size["genes"] <= max_genes)
+                and (max_sections is None or size["sections"] <= max_sections)):
+            name = cls
+            break
+    return f"{name}-tight" if size["tightness"] >= TIGHT_THRESHOLD else name
+
+
+def load_presets(path: Optional[str] = None, reload: bool = False) -> Dict[str, Dict]:
+    """Built-in presets overlaid with a tuned JSON file (GA_PRESETS_PATH or timetable_ga/presets.json)."""
+    global _loaded
+    if path is None and _loaded is not None and not reload:
+        return _loaded
+    presets = {k: dict(v) for k, v in DEFAULT_PRESETS.items()}
+    file_path = path or os.environ.get("GA_PRESETS_PATH") or PRESETS_PATH
+    if os.path.exists(file_path):
+        try:
+            with open(file_path, "r", encoding="utf-8") as fh:
+                tuned = json.load(fh).get("presets", {})
+            for key, params in tuned.items():
+                presets.setdefault(key, {}).update({k: v for k, v in params.items() if k in PRESET_KEYS})
+        except (OSError, ValueError):
+            pass  # a broken tuning file must not break generation
+    if path is None:
+        _loaded = presets
+    return presets
+
+
+def preset_for(data: GAInput) -> Dict:
+    """Preset parameters for this instance plus the 'preset' name and size features."""
+    size = problem_size(data)
+    key = size_class(size)
+    presets = load_presets()
+    params = dict(presets.get(key) or presets[key.replace("-tight", "")])
+    return {"preset": key, "size": size, "params": params}
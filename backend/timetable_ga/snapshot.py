@@ -0,0 +1,80 @@
+# timetable_ga/snapshot.py
+"""
+Portable problem snapshots: a GAInput as a self-contained JSON document, so a
+production instance can be solved offline (python -m timetable_ga solve ...).
+
+Paths ending in .gz are gzip-compressed (typically ~10x smaller); anything else
+is plain JSON. The document carries a format version and the input fingerprint,
+which is checked on load to catch truncated or hand-edited files.
+"""
+import gzip
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+from .models import GAInput
+from .fingerprint import input_fingerprint
+
+SNAPSHOT_VERSION = 1
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def save_snapshot(data: GAInput, path: str, meta: Optional[Dict] = None) -> str:
+    """
+    Write `data` to `path` (atomically) and return its fingerprint.
+    `meta` is free-form provenance (source DB, exported_by, ...) stored alongside.
+    """
+    problem = data.to_dict()
+    # to_dict() sorts the curriculum for hashing; keep the DB order so an offline
+    # solve builds chromosomes exactly like the live endpoint does.
+    problem["curriculum"] = [[int(a), int(b), int(c)] for (a, b, c) in data.curriculum]
+    fp = input_fingerprint(data)
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "fingerprint": fp,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "meta": meta or {},
+        "problem": problem,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".",
+                               suffix=".tmp" + (".gz" if path.endswith(".gz") else ""))
+    os.close(fd)   # unique name; _open reopens it (gzip or plain by suffix)
+    try:
+        with _open(tmp, "w") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return fp
+
+
+def load_snapshot(path: str, verify: bool = True) -> GAInput:
+    """Read a snapshot written by save_snapshot. Raises ValueError on version/fingerprint mismatch."""
+    with _open(path, "r") as fh:
+        payload = json.load(fh)
+    if payload.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {payload.get('version')}")
+    data = GAInput.from_dict(payload["problem"])
+    if verify and payload.get("fingerprint") and input_fingerprint(data) != payload["fingerprint"]:
+        raise ValueError(f"Snapshot fingerprint mismatch in {path}")
+    return data
+
+
+def snapshot_meta(path: str) -> Dict:
+    """Header fields of a snapshot (version, fingerprint, created_at, meta) without building the GAInput."""
+    with _open(path, "r") as fh:
+        payload = json.load(fh)
+    return {k: payload.get(k) for k in ("version", "fingerprint", "created_at", "meta")}
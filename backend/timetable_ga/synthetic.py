@@ -0,0 +1,178 @@
+# timetable_ga/synthetic.py
+"""
+Synthetic campus generator for load tests and GA benchmarks.
+
+synthetic_campus() returns plain row lists shaped like the tables app.py reads
+(sections, timetable_subject, faculty_faculty, rooms_classroom, curriculum,
+timetable_timeslot, faculty_unavailability); campus_to_gainput() turns the same
+rows into a GAInput without a database.
+"""
+import random
+from typing import Dict, List, Optional
+
+from .models import GAInput, Section, Subject, Room, Faculty
+
+DAY_NAMES = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY"]
+
+
+def synthetic_campus(departments: int = 4,
+                     sections: int = 40,
+                     subjects_per_section: int = 7,
+                     lab_ratio: float = 0.25,
+                     faculty_per_department: Optional[int] = None,
+                     lecture_rooms: Optional[int] = None,
+                     lab_rooms: Optional[int] = None,
+                     days: int = 5,
+                     periods_per_day: int = 7,
+                     unavailability_rate: float = 0.1,
+                     seed: Optional[int] = None) -> Dict[str, List[Dict]]:
+    """
+    Generate a realistic campus. Resource counts default to values that keep the
+    instance feasible-ish (rooms ~ sections/periods ratio, faculty load <= max_load).
+    Ids are 1-based and contiguous per table; timeslot ids are 1..days*periods_per_day
+    in day/period order, which is what the GA's slot arithmetic assumes.
+    """
+    rnd = random.Random(seed)
+    departments = max(1, departments)
+    sections = max(1, sections)
+
+    dept_rows = [{"dept_id": f"D{d + 1:02d}", "dept_name": f"Department {d + 1}"} for d in range(departments)]
+
+    # Timeslots
+    slot_rows = []
+    sid = 1
+    for d in range(days):
+        for p in range(periods_per_day):
+            h, m = divmod(9 * 60 + p * 55, 60)
+            eh, em = divmod(9 * 60 + p * 55 + 50, 60)
+            slot_rows.append({"slot_id": sid, "day_of_week": DAY_NAMES[d % len(DAY_NAMES)],
+                              "start_time": f"{h:02d}:{m:02d}:00", "end_time": f"{eh:02d}:{em:02d}:00"})
+            sid += 1
+    total_slots = len(slot_rows)
+
+    # Sections (spread across departments)
+    sec_rows = []
+    for i in range(sections):
+        dept = dept_rows[i % departments]["dept_id"]
+        sec_rows.append({"section_id": i + 1, "section_name": f"{dept}-S{i // departments + 1:03d}",
+                         "dept_id": dept, "student_count": rnd.choice([40, 45, 50, 55, 60, 60, 65])})
+
+    # Subjects per department: a pool a bit larger than subjects_per_section
+    sub_rows = []
+    pool_size = subjects_per_section + 3
+    by_dept_subjects: Dict[str, List[Dict]] = {}
+    subj_id = 1
+    for dept in dept_rows:
+        pool = []
+        for k in range(pool_size):
+            is_lab = rnd.random() < lab_ratio
+            block = rnd.choice([2, 2, 3]) if is_lab else 1
+            lectures = block * rnd.choice([1, 2]) if is_lab else rnd.choice([2, 3, 3, 4])
+            row = {"subject_id": subj_id,
+                   "subject_code": f"{dept['dept_id']}{'L' if is_lab else 'T'}{k + 1:03d}",
+                   "subject_name": f"{'Lab' if is_lab else 'Theory'} {dept['dept_id']}-{k + 1}",
+                   "lecture_count": lectures, "department_id": dept["dept_id"],
+                   "type": "LAB" if is_lab else "THEORY", "contiguous_block_size": block}
+            pool.append(row)
+            sub_rows.append(row)
+            subj_id += 1
+        by_dept_subjects[dept["dept_id"]] = pool
+
+    # Curriculum subjects per section (periods capped below the weekly slot count)
+    sec_subjects: Dict[int, List[Dict]] = {}
+    for sec in sec_rows:
+        chosen, periods = [], 0
+        for row in rnd.sample(by_dept_subjects[sec["dept_id"]], k=min(subjects_per_section, pool_size)):
+            if periods + row["lecture_count"] > int(total_slots * 0.8):
+                continue
+            chosen.append(row)
+            periods += row["lecture_count"]
+        sec_subjects[sec["section_id"]] = chosen
+
+    # Faculty: enough per department to cover demand at ~14 periods each
+    demand = {d["dept_id"]: 0 for d in dept_rows}
+    for sec in sec_rows:
+        demand[sec["dept_id"]] += sum(r["lecture_count"] for r in sec_subjects[sec["section_id"]])
+    fac_rows = []
+    fac_by_dept: Dict[str, List[Dict]] = {}
+    fid = 1
+    for dept in dept_rows:
+        n = faculty_per_department or max(2, -(-demand[dept["dept_id"]] // 14))
+        fac_by_dept[dept["dept_id"]] = []
+        for k in range(n):
+            row = {"faculty_id": fid, "name": f"Prof. {dept['dept_id']}-{k + 1}",
+                   "faculty_id_code": f"F{fid:05d}", "designation": rnd.choice(["Professor", "Asst. Prof", "Assoc. Prof"]),
+                   "email": f"f{fid}@campus.example", "department_id": dept["dept_id"],
+                   "max_load": rnd.choice([14, 16, 18])}
+            fac_rows.append(row)
+            fac_by_dept[dept["dept_id"]].append(row)
+            fid += 1
+
+    # Curriculum: assign the least-loaded department faculty
+    load = {f["faculty_id"]: 0 for f in fac_rows}
+    cur_rows = []
+    for sec in sec_rows:
+        for subj in sec_subjects[sec["section_id"]]:
+            fac = min(fac_by_dept[sec["dept_id"]], key=lambda f: (load[f["faculty_id"]], rnd.random()))
+            load[fac["faculty_id"]] += subj["lecture_count"]
+            cur_rows.append({"section_id": sec["section_id"], "subject_id": subj["subject_id"],
+                             "faculty_id": fac["faculty_id"]})
+
+    # Rooms: lecture rooms sized to the busiest-period demand, labs likewise
+    sub_by_id = {r["subject_id"]: r for r in sub_rows}
+    theory_periods = sum(sub_by_id[c["subject_id"]]["lecture_count"] for c in cur_rows
+                         if sub_by_id[c["subject_id"]]["type"] == "THEORY")
+    lab_periods = sum(sub_by_id[c["subject_id"]]["lecture_count"] for c in cur_rows
+                      if sub_by_id[c["subject_id"]]["type"] == "LAB")
+    n_lec = lecture_rooms or max(1, -(-theory_periods // int(total_slots * 0.7)))
+    n_lab = lab_rooms or max(1, -(-lab_periods // int(total_slots * 0.6)))
+    room_rows = []
+    for k in range(n_lec):
+        room_rows.append({"room_id": k + 1, "room_name": f"CR-{k + 1:04d}", "capacity": rnd.choice([60, 65, 70, 80]),
+                          "room_type": "LECTURE", "is_available": 1})
+    for k in range(n_lab):
+        room_rows.append({"room_id": n_lec + k + 1, "room_name": f"LAB-{k + 1:04d}", "capacity": rnd.choice([60, 65, 70]),
+                          "room_type": "LAB", "is_available": 1})
+
+    # Faculty unavailability: a few random slots for a share of faculty
+    fu_rows = []
+    for f in fac_rows:
+        if rnd.random() < unavailability_rate:
+            for s in rnd.sample(range(1, total_slots + 1), k=min(total_slots, rnd.randint(1, periods_per_day))):
+                fu_rows.append({"faculty_id": f["faculty_id"], "slot_id": s})
+
+    return {
+        "departments": dept_rows,
+        "sections": sec_rows,
+        "subjects": sub_rows,
+        "faculty": fac_rows,
+        "rooms": room_rows,
+        "timeslots": slot_rows,
+        "curriculum": cur_rows,
+        "faculty_unavailability": fu_rows,
+        "periods_per_day": periods_per_day,
+        "days": days,
+    }
+
+
+def campus_to_gainput(campus: Dict, lunch_start: str = "10:50", lunch_end: str = "13:55") -> GAInput:
+    """Build a GAInput from synthetic_campus() rows (same rules app.py applies to DB rows)."""
+    slot_order = [r["slot_id"] for r in campus["timeslots"]]
+    lunch = {r["slot_id"] for r in campus["timeslots"] if lunch_start <= r["start_time"][:5] <= lunch_end}
+    fu: Dict[int, set] = {}
+    for r in campus["faculty_unavailability"]:
+        fu.setdefault(r["faculty_id"], set()).add(r["slot_id"])
+    return GAInput(
+        sections={r["section_id"]: Section(r["section_id"], r["section_name"], r["student_count"]) for r in campus["sections"]},
+        subjects={r["subject_id"]: Subject(r["subject_id"], r["lecture_count"], r["type"], r["contiguous_block_size"])
+                  for r in campus["subjects"]},
+        curriculum=[(r["section_id"], r["subject_id"], r["faculty_id"]) for r in campus["curriculum"]],
+        rooms={r["room_id"]: Room(r["room_id"], r["room_type"], r["capacity"]) for r in campus["rooms"] if r["is_available"]},
+        faculty={r["faculty_id"]: Faculty(r["faculty_id"], r["max_load"]) for r in campus["faculty"]},
+        faculty_unavailability=fu,
+        timeslots_usable=set(slot_order),
+        periods_per_day=campus["periods_per_day"],
+        days=campus["days"],
+        slot_order=slot_order,
+        lunch_slots=lunch,
+    )
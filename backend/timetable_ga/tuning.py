@@ -0,0 +1,143 @@
+# timetable_ga/tuning.py
+"""
+GA parameter auto-tuning by racing.
+
+Candidate configurations race over a set of benchmark instances of one size
+class under a fixed per-run time budget (successive halving: every round each
+surviving config runs once more on every instance, the worse half by mean rank
+is dropped). The winner's parameters, with `generations` set to what it reached
+inside the budget, become the preset for that class. Results are written to a
+presets JSON file that presets.load_presets() picks up, so run_ga uses them
+whenever the caller leaves GA parameters unset.
+
+    python -m timetable_ga.tuning --time-budget 20 --configs 12 --out timetable_ga/presets.json
+    python -m timetable_ga.tuning --classes medium --snapshots prod.json.gz
+"""
+import argparse
+import itertools
+import json
+import random
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from .models import GAInput
+from .ga import run_ga
+from .presets import problem_size, size_class, PRESETS_PATH, PRESET_KEYS
+from .synthetic import synthetic_campus, campus_to_gainput
+from .snapshot import load_snapshot
+
+SEARCH_SPACE = {
+    "population_size": [16, 24, 40, 60, 80],
+    "tournament_k": [2, 3, 4, 5],
+    "crossover_rate": [0.7, 0.8, 0.9],
+    "mutate_rate": [0.02, 0.05, 0.08, 0.12],
+    "elitism_fraction": [0.05, 0.08, 0.12],
+}
+
+# Synthetic benchmark instances per size class (campus sizes roughly hitting each class).
+BENCHMARK_SECTIONS = {"small": [6, 10], "medium": [40, 60], "large": [200, 300], "xlarge": [800]}
+
+
+def sample_configs(n: int, seed: Optional[int] = None) -> List[Dict]:
+    """n distinct configurations drawn from SEARCH_SPACE."""
+    rnd = random.Random(seed)
+    grid = list(itertools.product(*SEARCH_SPACE.values()))
+    rnd.shuffle(grid)
+    return [dict(zip(SEARCH_SPACE.keys(), combo)) for combo in grid[:max(1, n)]]
+
+
+def race(instances: List[GAInput], configs: List[Dict], time_budget: float,
+         seed: Optional[int] = None, log=print) -> Dict:
+    """
+    Successive-halving race of `configs` over `instances`, time_budget seconds per run.
+    Fitness scales differ between instances, so configs are compared by mean rank.
+    Returns {'winner', 'generations', 'scores', 'rounds'}.
+    """
+    rnd = random.Random(seed)
+    alive = list(range(len(configs)))
+    fitness: Dict[int, List[List[float]]] = {i: [[] for _ in instances] for i in alive}
+    gens: Dict[int, List[int]] = {i: [] for i in alive}
+    rounds = 0
+
+    while True:
+        rounds += 1
+        run_seed = rnd.randrange(2**31)  # same seed for all configs within a round
+        for i in alive:
+            for j, inst in enumerate(instances):
+                r = run_ga(inst, seed=run_seed, generations=10**6, time_limit=time_budget, **configs[i])
+                fitness[i][j].append(r["fitness"])
+                gens[i].append(r["generations"])
+
+        # mean rank across instances (rank 0 = best mean fitness on that instance)
+        ranks = {i: 0.0 for i in alive}
+        for j in range(len(instances)):
+            order = sorted(alive, key=lambda i: statistics.mean(fitness[i][j]), reverse=True)
+            for pos, i in enumerate(order):
+                ranks[i] += pos / len(instances)
+        alive.sort(key=lambda i: ranks[i])
+        log(f"  round {rounds}: " + ", ".join(f"#{i}={ranks[i]:.2f}" for i in alive))
+        alive = alive[:max(1, len(alive) // 2)]
+        if len(alive) <= 1:
+            break
+
+    winner = alive[0]
+    return {
+        "winner": configs[winner],
+        "generations": int(statistics.median(gens[winner])) if gens[winner] else None,
+        "scores": {json.dumps(configs[i], sort_keys=True): [statistics.mean(f) for f in fitness[i]] for i in fitness},
+        "rounds": rounds,
+    }
+
+
+def tune_presets(instances_by_class: Dict[str, List[GAInput]], n_configs: int = 8,
+                 time_budget: float = 10.0, seed: Optional[int] = None, log=print) -> Dict[str, Dict]:
+    """Race configurations per size class; returns {class_key: preset_params}."""
+    presets: Dict[str, Dict] = {}
+    for key, instances in instances_by_class.items():
+        if not instances:
+            continue
+        log(f"[{key}] racing {n_configs} configs over {len(instances)} instances, {time_budget}s per run")
+        result = race(instances, sample_configs(n_configs, seed), time_budget, seed=seed, log=log)
+        params = {k: v for k, v in result["winner"].items() if k in PRESET_KEYS}
+        params["generations"] = max(1, result["generations"] or 1)
+        presets[key] = params
+        log(f"[{key}] winner: {params}")
+    return presets
+
+
+def benchmark_instances(classes: List[str], seed: Optional[int] = None) -> Dict[str, List[GAInput]]:
+    """Synthetic benchmark instances grouped by the preset key they actually fall in."""
+    grouped: Dict[str, List[GAInput]] = {}
+    for cls in classes:
+        for n in BENCHMARK_SECTIONS.get(cls, []):
+            data = campus_to_gainput(synthetic_campus(sections=n, seed=(seed or 0) + n))
+            grouped.setdefault(size_class(problem_size(data)), []).append(data)
+    return grouped
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Race GA parameter configs and write size-aware presets.")
+    ap.add_argument("--classes", default="small,medium", help="comma list of: small,medium,large,xlarge")
+    ap.add_argument("--configs", type=int, default=8, help="configurations sampled per class")
+    ap.add_argument("--time-budget", type=float, default=10.0, help="seconds per GA run")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--snapshots", nargs="*", default=[], help="extra instances (snapshot files, e.g. exported production cases)")
+    ap.add_argument("--out", default=PRESETS_PATH)
+    args = ap.parse_args(argv)
+
+    grouped = benchmark_instances([c.strip() for c in args.classes.split(",") if c.strip()], seed=args.seed)
+    for path in args.snapshots:
+        data = load_snapshot(path)
+        grouped.setdefault(size_class(problem_size(data)), []).append(data)
+
+    t0 = time.monotonic()
+    presets = tune_presets(grouped, n_configs=args.configs, time_budget=args.time_budget, seed=args.seed)
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                   "time_budget": args.time_budget, "presets": presets}, fh, indent=2)
+    print(f"Wrote {len(presets)} presets to {args.out} in {time.monotonic() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# The tables are created and migrated by the Flask backend (backend/migrations.py,
+# services/timetable_versions.py), so these models are unmanaged views of them.
+from django.db import models
+
+
+class Department(models.Model):
+    dept_id = models.CharField(max_length=16, primary_key=True)
+    dept_name = models.CharField(max_length=100)
+
+    class Meta:
+        managed = False
+        db_table = 'faculty_department'
+
+    def __str__(self):
+        return self.dept_name
+
+
+class Faculty(models.Model):
+    faculty_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    faculty_id_code = models.CharField(max_length=32, null=True)
+    designation = models.CharField(max_length=64, null=True)
+    email = models.CharField(max_length=100, null=True)
+    department_id = models.CharField(max_length=16, null=True)
+    max_load = models.IntegerField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'faculty_faculty'
+
+    def __str__(self):
+        return self.name
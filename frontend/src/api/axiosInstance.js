@@ -11,6 +11,9 @@ const axiosInstance = axios.create({
   },
 });
 
+// backend commit time from X-Last-Write (see backend/db_connector.py)
+const LAST_WRITE_KEY = "lastWrite";
+
 // 2️⃣ Request interceptor — har API call ke saath token lagana
 axiosInstance.interceptors.request.use(
   (config) => {
@@ -24,6 +27,10 @@ axiosInstance.interceptors.request.use(
       config.headers.Authorization = `Bearer ${token}`;
     }
 
+    // read-your-writes: echo our last write time so the backend reads from the primary
+    const lastWrite = sessionStorage.getItem(LAST_WRITE_KEY);
+    if (lastWrite) config.headers["X-Last-Write"] = lastWrite;
+
     return config;
   },
   (error) => Promise.reject(error)
@@ -31,7 +38,11 @@ axiosInstance.interceptors.request.use(
 
 // 3️⃣ Response interceptor — 401/403 aate hi logout + redirect
 axiosInstance.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const lastWrite = response.headers?.["x-last-write"];
+    if (lastWrite) sessionStorage.setItem(LAST_WRITE_KEY, lastWrite);
+    return response;
+  },
   (error) => {
     const status = error?.response?.status;
     if (status === 401 || status === 403) {
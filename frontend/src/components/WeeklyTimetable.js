@@ -29,10 +29,6 @@ const colorFor = (key = "") => {
 };
 
 // utils
-const toHHMM = (t) => {
-  const s = String(t ?? "");
-  return s.length >= 5 ? s.slice(0,5) : s;
-};
 const pick = (obj, keys, def = undefined) => {
   for (const k of keys) {
     if (obj && Object.prototype.hasOwnProperty.call(obj, k) && obj[k] != null) return obj[k];
@@ -41,58 +37,32 @@ const pick = (obj, keys, def = undefined) => {
   return def;
 };
 
-// detect LAB (robust – room_type, room_name, subject_code/name)
-const looksLikeLab = (entry) => {
-  const rt = String(entry.room_type || "").toLowerCase();
-  const rn = String(entry.room_name || "").toLowerCase();
-  const sc = String(entry.subject_code || "").toLowerCase();
-  const sn = String(entry.subject_name || "").toLowerCase();
-  return (
-    /lab|laborat/.test(rt) ||
-    /lab/.test(rn) ||
-    /\blab\b|\bpract/.test(sn) ||
-    /l\d*$/.test(sc) || 
-    /lab/.test(sc)
-  );
+// grid cell markers (backend: services/timetable_grid.py)
+const LUNCH = "L";
+const COVERED = "<";   // covered by the lab block to its left
+
+// one grid entry [subject, faculty, room, span] -> display fields via the grid's lookup tables
+const decodeEntry = (grid, [s, f, r, span]) => {
+  const [subject_code, subject_name, kind] = grid.subjects[s] || [];
+  const [room_name, room_type] = grid.rooms[r] || [];
+  return { subject_code, subject_name, faculty_name: grid.faculty[f], room_name, room_type, isLab: kind === "LAB", span };
 };
 
-// supports number, numeric-string and names
-const useDayKey = () => useCallback((d) => {
-  if (d == null) return "";
-  if (typeof d === "number") {
-    if (d >= 1 && d <= 7) return DAYS[d - 1] || "";
-    if (d >= 0 && d < 7)  return DAYS[d] || "";
-    return "";
-  }
-  const s = String(d).trim();
-  if (/^-?\d+$/.test(s)) {
-    const n = parseInt(s, 10);
-    if (n >= 1 && n <= 7) return DAYS[n - 1] || "";
-    if (n >= 0 && n < 7)  return DAYS[n] || "";
-    return "";
-  }
-  const up = s.toUpperCase();
-  const short = { MON: "MONDAY", TUE: "TUESDAY", WED: "WEDNESDAY", THU: "THURSDAY", FRI: "FRIDAY", SAT: "SATURDAY" };
-  return short[up.slice(0,3)] || up;
-}, []);
+// number of periods a cell spans: itself plus the COVERED cells right after it
+const spanAt = (dayCells, p) => {
+  let n = 1;
+  while (dayCells[p + n] === COVERED) n++;
+  return n;
+};
 
 export default function WeeklyTimetable() {
   const [sections, setSections] = useState([]);
   const [selectedId, setSelectedId] = useState("");
-  const [rows, setRows] = useState([]);
+  const [grid, setGrid] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const printRef = useRef(null);
 
-  // MOCK LUNCH TIMES: Hardcode to ensure the display works consistently
-  const lunchTimes = useMemo(() => ({ start: '12:05:00', end: '13:00:00' }), []);
-  const lunchSlotString = useMemo(() => {
-      // 12:05:00 -> 12:05
-      return `${toHHMM(lunchTimes.start)}-${toHHMM(lunchTimes.end)}`;
-  }, [lunchTimes]);
-
-  const dayKey = useDayKey();
-
   // fetch sections
   useEffect(() => {
     let live = true;
@@ -118,109 +88,50 @@ export default function WeeklyTimetable() {
     [sections, selectedId]
   );
 
-  // fetch timetable
+  // fetch timetable (pre-rendered grid: days x periods, lunch and lab spans already marked)
   const fetchTimetable = useCallback(() => {
     if (!selected) return;
     setLoading(true); setError("");
-    const dept = String(selected.dept_id ?? "1");
-    const sec  = String(selected.section_id);
-    axiosInstance.get(`/api/timetable/${dept}/${sec}`)
-      .then(res => {
-        const data = Array.isArray(res.data) ? res.data : (res.data?.rows || res.data?.data || res.data?.result || []);
-        console.log("[Timetable] fetched", { count: data.length, sample: data[0] });
-        setRows(data || []);
-      })
-      .catch(() => { setRows([]); setError("Failed to fetch timetable. Generate from admin panel first."); })
+    const sec = String(selected.section_id);
+    axiosInstance.get(`/api/timetable/section/${sec}`, { params: { format: "grid" } })
+      .then(res => setGrid(res.data?.format === "grid" ? res.data : null))
+      .catch(() => { setGrid(null); setError("Failed to fetch timetable. Generate from admin panel first."); })
       .finally(() => setLoading(false));
   }, [selected]);
 
   useEffect(() => { fetchTimetable(); }, [fetchTimetable]);
 
-  // headers (unique slots)
-  const timeSlots = useMemo(() => {
-    const m = new Map();
-    (rows || []).forEach(r => {
-      const start = toHHMM(pick(r, ["start_time","startTime","start"], ""));
-      const end   = toHHMM(pick(r, ["end_time","endTime","end"], ""));
-      if (!start || !end) return;
-      const key = `${start}-${end}`;
-      if (!m.has(key)) m.set(key, { start, end });
-    });
-    
-    // Add LUNCH SLOT to the list if the current timetable slots do not contain it
-    const allSlots = Array.from(m.values()).sort((a,b) => (a.start > b.start ? 1 : -1));
-    const lunchSlotObj = { start: toHHMM(lunchTimes.start), end: toHHMM(lunchTimes.end) };
-    const lunchKey = `${lunchSlotObj.start}-${lunchSlotObj.end}`;
-
-    if (!m.has(lunchKey)) {
-        // If the GA didn't generate an entry for lunch, we must manually insert the slot for the header.
-        allSlots.push(lunchSlotObj);
-        allSlots.sort((a,b) => (a.start > b.start ? 1 : -1)); // Sort again after insertion
-    }
-
-    return allSlots;
-  }, [rows, lunchTimes]);
-
-  // grid + LAB mirror
-  const mapByDayTime = useMemo(() => {
-    const map = {};
-
-    // base map
-    (rows || []).forEach(r => {
-      const d = dayKey(pick(r, ["day_of_week","dayOfWeek","day","dayName"], null));
-      if (!d) return;
-      const start = toHHMM(pick(r, ["start_time","startTime","start"], ""));
-      const end   = toHHMM(pick(r, ["end_time","endTime","end"], ""));
-      if (!start || !end) return;
-
-      const key = `${start}-${end}`;
-      const entry = {
-        subject_code: pick(r, ["subject_code","subjectCode","subject","code"], "-"),
-        subject_name: pick(r, ["subject_name","subjectName","subjectTitle","name"], ""),
-        faculty_name: pick(r, ["faculty_name","facultyName","teacher","instructor"], "-"),
-        room_name:      pick(r, ["room_name","roomName","room"], "-"),
-        room_type:      String(pick(r, ["room_type","roomType","type"], "")).toUpperCase(),
-      };
-
-      map[d] = map[d] || {};
-      (map[d][key] ||= []).push(entry);
-    });
-
-    // mirror LAB into next empty slot (2-slot labs) - Logic remains the same
-    DAYS.forEach(day => {
-      if (!map[day]) return;
-      for (let i = 0; i < timeSlots.length - 1; i++) {
-        const key    = `${timeSlots[i].start}-${timeSlots[i].end}`;
-        const nextKey = `${timeSlots[i + 1].start}-${timeSlots[i + 1].end}`;
-
-        const entries = map[day][key];
-        if (!entries || entries.length === 0) continue;
-
-        const labEntries = entries.filter(looksLikeLab);
-        // copy only if next cell is truly empty/undefined
-        if (labEntries.length && (!map[day][nextKey] || map[day][nextKey].length === 0)) {
-          map[day][nextKey] = labEntries.map(e => ({ ...e })); // shallow clone
-        }
-      }
-    });
-
-    return map;
-  }, [rows, dayKey, timeSlots]);
+  const days = grid?.days?.length ? grid.days : DAYS;
+  const dayPeriods = grid?.day_periods || [];
+  // shared time headers when every day has the same periods, else "P1".. with times in each cell
+  const timeSlots = grid?.periods || Array.from(
+    { length: Math.max(0, ...dayPeriods.map(dp => dp.length)) }, (_, p) => ({ label: `P${p + 1}` })
+  );
+  const slotLabel = t => (t.label || `${t.start}-${t.end}`);
+  const hasEntries = !!grid && grid.entries > 0;
 
   // export CSV
   const handleExport = () => {
     // ... (CSV export logic remains the same) ...
     if (!selected) return;
-    const header = ["Day", ...timeSlots.map(t => `${t.start}-${t.end}`)];
+    const header = ["Day", ...timeSlots.map(slotLabel)];
     const lines = [header.join(",")];
-    DAYS.forEach(day => {
+    days.forEach((day, d) => {
+      const dayCells = grid?.cells?.[d] || [];
       const row = [day];
-      timeSlots.forEach(t => {
-        const key = `${t.start}-${t.end}`;
-        const list = (mapByDayTime[day]?.[key] || []).map(e =>
+      let last = "";
+      timeSlots.forEach((t, p) => {
+        const cell = dayCells[p] ?? null;
+        let text = "";
+        if (!grid.periods && !dayPeriods[d]?.[p]) text = "";   // day has fewer periods
+        else if (cell === COVERED) text = last;           // lab continues from the left
+        else if (cell === LUNCH) text = "LUNCH";
+        else if (Array.isArray(cell)) text = cell.map(e => decodeEntry(grid, e)).map(e =>
           `${e.subject_code || "-"} / ${e.faculty_name || "-"} / ${e.room_name || "-"}`
         ).join(" | ");
-        row.push(list.replaceAll(",", ";"));
+        last = text;
+        const own = !grid.periods && dayPeriods[d]?.[p] ? `${slotLabel(dayPeriods[d][p])} ` : "";
+        row.push((text ? own + text : "").replaceAll(",", ";"));
       });
       lines.push(row.join(","));
     });
@@ -314,22 +225,19 @@ export default function WeeklyTimetable() {
   };
 
   // cell
-  const Cell = ({ entries, slotKey }) => {
-    // 1. DYNAMIC LUNCH BREAK OVERRIDE (The Fix)
-    if (slotKey === lunchSlotString) {
-        return (
-            <Box sx={{ 
-                bgcolor: '#fffae0', color: '#b05f00', p: 1, borderRadius: 1.5, fontWeight: 800,
-                border: '1px solid #f9a825', minHeight: 48, display: 'flex', alignItems: 'center', justifyContent: 'center'
-            }}>
-                <Typography variant="body2" sx={{ fontWeight: 800 }}>
-                    🍴 LUNCH BREAK
-                </Typography>
-            </Box>
-        );
-    }
-    
-    // 2. Class Content
+  const LunchCell = () => (
+    <Box sx={{
+        bgcolor: '#fff3cd', color: '#b05f00', p: 1, borderRadius: 1.5, fontWeight: 800,
+        border: '1px solid #f9a825', minHeight: 48, display: 'flex', alignItems: 'center', justifyContent: 'center'
+    }}>
+        <Typography variant="body2" sx={{ fontWeight: 800 }}>
+            🍴 LUNCH BREAK
+        </Typography>
+    </Box>
+  );
+
+  const Cell = ({ entries }) => {
+    // class content
     if (!entries || !entries.length) {
       return <Typography variant="caption" color="text.disabled">—</Typography>;
     }
@@ -337,7 +245,7 @@ export default function WeeklyTimetable() {
       <Box sx={{ display: "grid", gap: 0.5 }}>
         {entries.map((e, i) => {
           const { bg, fg } = colorFor(e.subject_code || "");
-          const isLab = looksLikeLab(e);
+          const isLab = e.isLab;
           return (
             <Box
               key={i}
@@ -422,7 +330,7 @@ export default function WeeklyTimetable() {
       {error && <Alert severity="error" sx={{ mb: 2 }}>{error}</Alert>}
 
       {/* table */}
-      {!loading && !error && rows && rows.length > 0 && (
+      {!loading && !error && hasEntries && (
         <Paper
           elevation={1}
           sx={{ overflowX: "auto", borderRadius: 3, border: "1px solid #e5e7eb", boxShadow: "0 8px 24px rgba(0,0,0,0.06)" }}
@@ -439,23 +347,23 @@ export default function WeeklyTimetable() {
                 >
                   Day
                 </TableCell>
-                {timeSlots.map(t => (
+                {timeSlots.map((t, p) => (
                   <TableCell
-                    key={`${t.start}-${t.end}`}
+                    key={p}
                     align="center"
                     sx={{
                       bgcolor: "#f8fafc", fontWeight: 800, textTransform: "uppercase",
                       letterSpacing: 0.4, color: "#334155", whiteSpace: "nowrap"
                     }}
                   >
-                    {t.start}–{t.end}
+                    {t.label || `${t.start}–${t.end}`}
                   </TableCell>
                 ))}
               </TableRow>
             </TableHead>
 
             <TableBody>
-              {DAYS.map((day, idx) => (
+              {days.map((day, idx) => (
                 <TableRow
                   key={day}
                   sx={{
@@ -473,26 +381,26 @@ export default function WeeklyTimetable() {
                     {day.charAt(0) + day.slice(1).toLowerCase()}
                   </TableCell>
 
-                  {timeSlots.map(t => {
-                    const key = `${t.start}-${t.end}`;
-                    const entries = mapByDayTime[day]?.[key];
-                    
-                    const isLunchSlot = key === lunchSlotString; // Check lunch slot string
-
+                  {timeSlots.map((t, p) => {
+                    const dayCells = grid.cells[idx] || [];
+                    const cell = dayCells[p] ?? null;
+                    if (cell === COVERED) return null; // drawn by the lab cell's colSpan
+                    const key = p;
+                    const own = grid.periods ? null : dayPeriods[idx]?.[p];
+                    if (!grid.periods && !own) return <TableCell key={key} />;  // day has fewer periods
+                    const time = own && (
+                      <Typography variant="caption" sx={{ display: "block", color: "#64748b" }}>
+                        {own.start}–{own.end}
+                      </Typography>
+                    );
+                    if (cell === LUNCH) {
+                      return <TableCell key={key} align="center">{time}<LunchCell /></TableCell>;
+                    }
+                    const entries = Array.isArray(cell) ? cell.map(e => decodeEntry(grid, e)) : [];
                     return (
-                      <TableCell key={key} align="center">
-                        {isLunchSlot ? (
-                            <Box sx={{ 
-                                bgcolor: '#fff3cd', color: '#b05f00', p: 1, borderRadius: 1.5, fontWeight: 800,
-                                border: '1px solid #f9a825', minHeight: 48, display: 'flex', alignItems: 'center', justifyContent: 'center'
-                            }}>
-                                <Typography variant="body2" sx={{ fontWeight: 800 }}>
-                                    🍴 LUNCH BREAK
-                                </Typography>
-                            </Box>
-                        ) : (
-                            <Cell entries={entries} slotKey={key} />
-                        )}
+                      <TableCell key={key} align="center" colSpan={spanAt(dayCells, p)}>
+                        {time}
+                        <Cell entries={entries} />
                       </TableCell>
                     );
                   })}
@@ -504,7 +412,7 @@ export default function WeeklyTimetable() {
       )}
 
       {/* empty state */}
-      {!loading && !error && (!rows || rows.length === 0) && (
+      {!loading && !error && !hasEntries && (
         <Alert severity="info" sx={{ mt: 2, borderRadius: 2 }}>
           No timetable entries found for this selection. Tip: verify backend returns records for
           <strong> dept_id={String(selected?.dept_id || "")} </strong> and <strong> section_id={String(selected?.section_id || "")} </strong>.
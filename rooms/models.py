@@ -0,0 +1,17 @@
+# Unmanaged: the table belongs to the Flask backend (see faculty/models.py).
+from django.db import models
+
+
+class Classroom(models.Model):
+    room_id = models.AutoField(primary_key=True)
+    room_name = models.CharField(max_length=64)
+    capacity = models.IntegerField()
+    room_type = models.CharField(max_length=32)
+    is_available = models.BooleanField(default=True)
+
+    class Meta:
+        managed = False
+        db_table = 'rooms_classroom'
+
+    def __str__(self):
+        return self.room_name
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -72,17 +73,25 @@ WSGI_APPLICATION = 'samay_sudarshan_backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Same DB_* variables as the Flask backend (backend/db_connector.py)
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.mysql',
-        'NAME': 'samay_sudarshan_db',
-        'USER': 'SamaySudarshan',
-        'PASSWORD': '1212',  # <--- Use your actual password
-        'HOST': 'localhost',
-        'PORT': '3306',
+        'NAME': os.environ.get('DB_NAME', 'samay_sudarshan_db'),
+        'USER': os.environ.get('DB_USER', 'SamaySudarshan'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', '1212'),  # <--- Use your actual password
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '3306'),
     }
 }
 
+# DB_BACKEND=sqlite: the backend's embedded database file (backend/sqlite_backend.py)
+if os.environ.get('DB_BACKEND', 'mysql').strip().lower() == 'sqlite':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('DB_SQLITE_PATH') or str(BASE_DIR / 'backend' / 'samay_sudarshan.db'),
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,306 @@
+"""
+manage.py solve_timetable: regenerate the timetable outside the Flask request path
+(nightly cron, one-off batch runs).
+
+    python manage.py solve_timetable                       # every section
+    python manage.py solve_timetable --departments CSE,ECE --runs 4 --workers 4
+
+Loads the problem with the backend's loader (backend/services/ga_input.py), solves
+with timetable_ga (a process-pool portfolio when --runs > 1) and saves the rows as a
+new timetable version with TimetableEntry.objects.bulk_create, one commit per batch,
+before publishing it. Everything else (named lock, loading, version bookkeeping,
+occupancy, publish, GC) goes through the backend's own connection (db_connector:
+MySQL, or the SQLite file with DB_BACKEND=sqlite), which its helpers are written
+for. Runs under the same named lock as the generate endpoint, so the two never
+overlap. Flask workers pick the new version up on their next read:
+timetable cache keys carry the published version_id, and the occupancy view rechecks it.
+
+With --departments only those departments' sections are re-solved; every other
+section keeps its published entries. Their faculty periods are blocked for the
+solver (and counted against max_load), and new sessions that land in a room a kept
+entry holds are moved to a free room of the same type. If that is impossible nothing
+is saved.
+
+Exit status is non-zero when the run fails or the timetable has hard violations. As
+with the generate endpoint (timetable_versions.publishable), an infeasible timetable
+is saved as an unpublished version for inspection.
+"""
+
+import os
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BACKEND_DIR = Path(settings.BASE_DIR) / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from db_connector import get_db_connection  # noqa: E402
+from run_history import record_run  # noqa: E402
+from services.ga_input import GAInputError, load_ga_input  # noqa: E402
+from services.occupancy import save_occupancy  # noqa: E402
+from services.timetable_versions import (  # noqa: E402
+    GENERATE_LOCK_NAME, INSERT_BATCH, ensure_schema, create_version, mark_ready, mark_failed,
+    publish_version, published_version_id, publishable, gc_versions,
+)
+from timetable_ga import run_ga, run_portfolio, Faculty, Gene  # noqa: E402
+from timetable_ga.encoder import chromosome_from_tuples  # noqa: E402
+from timetable_ga.fingerprint import input_fingerprint  # noqa: E402
+from timetable_ga.occupancy import build_occupancy  # noqa: E402
+
+from timetable.models import TimetableEntry  # noqa: E402
+
+
+def _block(data, subject_id):
+    sub = data.subjects.get(subject_id)
+    return int(sub.contiguous_block_size or 1) if sub is not None and sub.kind() == "LAB" else 1
+
+
+class Command(BaseCommand):
+    help = "Solve the timetable for all or selected departments and save it as a new published version."
+
+    # the project's URLconf needs apps this command does not use
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--departments", default="",
+                            help="Comma-separated dept_ids to re-solve (default: every section).")
+        parser.add_argument("--runs", type=int, default=int(os.environ.get("GA_PORTFOLIO_RUNS", 1)),
+                            help="Independent GA runs, best one wins (default GA_PORTFOLIO_RUNS or 1).")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Processes for the portfolio runs (default min(runs, CPU count)).")
+        parser.add_argument("--time-limit", type=float, default=None,
+                            help="Seconds for the whole solve (default GA_TIME_LIMIT, else none).")
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=INSERT_BATCH,
+                            help="Rows per bulk_create / commit (default TIMETABLE_INSERT_BATCH or 1000).")
+        parser.add_argument("--lock-wait", type=float, default=60,
+                            help="Seconds to wait for a generation already running (default 60).")
+        parser.add_argument("--no-publish", action="store_true",
+                            help="Save the version but leave the current one live.")
+        parser.add_argument("--dry-run", action="store_true", help="Solve and report without saving.")
+
+    def handle(self, *args, **opts):
+        departments = [d.strip() for d in opts["departments"].split(",") if d.strip()]
+        time_limit = opts["time_limit"]
+        if time_limit is None and os.environ.get("GA_TIME_LIMIT"):
+            time_limit = float(os.environ["GA_TIME_LIMIT"])
+
+        conn = get_db_connection()
+        if conn is None:
+            raise CommandError("Database connection failed.")
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (GENERATE_LOCK_NAME, opts["lock_wait"]))
+            if cursor.fetchone()[0] != 1:
+                raise CommandError("Another timetable generation is running; try again when it has finished.")
+            try:
+                self._solve_and_save(conn, departments, time_limit, opts)
+            finally:
+                conn.rollback()
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (GENERATE_LOCK_NAME,))
+                cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _solve_and_save(self, conn, departments, time_limit, opts):
+        t_start = time.monotonic()
+        ensure_schema(conn)
+        dict_cursor = conn.cursor(dictionary=True)
+        try:
+            try:
+                data = load_ga_input(dict_cursor)
+            except GAInputError as e:
+                raise CommandError(str(e))
+            carried = []
+            problem = data
+            if departments:
+                problem, carried = self._department_problem(dict_cursor, data, departments)
+        finally:
+            dict_cursor.close()
+        t_loaded = time.monotonic()
+
+        # same solver settings as the generate endpoint (app.py)
+        ga_params = dict(
+            init_strategy="constructive",
+            graded_hard=True,
+            adaptive=True,
+            init_workers=int(os.environ.get("GA_INIT_WORKERS", 1)),
+            init_cache_dir=os.environ.get("GA_SEED_POOL_DIR") or None,
+        )
+        scope = ", ".join(departments) if departments else "all departments"
+        self.stdout.write(f"Solving {len(problem.sections)} sections ({scope}), "
+                          f"{len(problem.curriculum)} curriculum rows, {opts['runs']} run(s)...")
+        if opts["runs"] > 1:
+            result = run_portfolio(problem, runs=opts["runs"], max_workers=opts["workers"],
+                                   time_limit=time_limit, seed=opts["seed"], **ga_params)
+        else:
+            result = run_ga(problem, seed=opts["seed"], time_limit=time_limit, **ga_params)
+        t_solved = time.monotonic()
+
+        genes = [g for arr in result["best_chromosome"].values() for g in arr]
+        if carried:
+            moved, stuck = self._reroom(data, genes, carried)
+            if stuck:
+                raise CommandError(f"{stuck} new sessions clash with kept entries of other departments and no "
+                                   f"free room fits them; nothing saved. Re-run without --departments.")
+            if moved:
+                self.stdout.write(f"Moved {moved} sessions to rooms not used by other departments.")
+        genes += carried
+
+        eval_bd = result.get("eval") or {}
+        hard = eval_bd.get("hard_breakdown") or {}
+        self.stdout.write(f"Fitness {result['fitness']}, {len(genes)} sessions, "
+                          f"hard violations: {hard or 'none'} ({t_solved - t_loaded:.1f}s).")
+        if opts["dry_run"]:
+            return
+
+        values = [(g.subject_id, g.faculty_id, g.room_id, g.slot_id, g.section_id) for g in genes]
+        fingerprint = input_fingerprint(data)
+        version_id = create_version(conn, fitness=result["fitness"], fingerprint=fingerprint)
+        self._bulk_write(conn, version_id, values, max(1, opts["batch_size"]))
+        try:
+            chrom = chromosome_from_tuples([list(g.to_tuple()) for g in genes], data)
+            save_occupancy(conn, version_id, build_occupancy(data, chrom))
+        except Exception as e:
+            conn.rollback()
+            self.stderr.write(f"Occupancy save failed (rebuilt on first read): {e}")
+
+        publish = not opts["no_publish"] and publishable(hard)
+        if publish:
+            publish_version(conn, version_id)
+            try:
+                gc_versions(conn)
+            except Exception as e:
+                conn.rollback()
+                self.stderr.write(f"Timetable version GC failed: {e}")
+        t_saved = time.monotonic()
+
+        try:
+            record_run({
+                "source": "solve_timetable",
+                "departments": departments or None,
+                "fingerprint": fingerprint,
+                "version_id": version_id,
+                "params": {**(result.get("params") or ga_params), "portfolio_runs": opts["runs"],
+                           "time_limit": time_limit},
+                "size": {"sections": len(problem.sections), "curriculum": len(problem.curriculum),
+                         "genes": len(values), "rooms": len(data.rooms), "faculty": len(data.faculty),
+                         "slots": len(data.timeslots_usable)},
+                "fitness": result["fitness"],
+                "generations": result.get("generations"),
+                "phases": {
+                    "load": round(t_loaded - t_start, 3),
+                    "solve": round(t_solved - t_loaded, 3),
+                    "save": round(t_saved - t_solved, 3),
+                    **{f"ga_{k}": v for k, v in (result.get("phases") or {}).items()},
+                },
+                "hard_breakdown": hard,
+                "soft_breakdown": eval_bd.get("soft_breakdown", {}),
+                "init": result.get("init", {}),
+                "portfolio": result.get("portfolio"),
+                "curve": result.get("curve", []),
+            })
+        except Exception as e:
+            self.stderr.write(f"Run history write failed: {e}")
+
+        if hard:
+            raise CommandError(f"Timetable has hard violations {hard}; saved as version {version_id} "
+                               f"but not published.")
+        state = "published" if publish else "saved (not published)"
+        self.stdout.write(self.style.SUCCESS(f"Version {version_id} {state}: {len(values)} sessions "
+                                             f"in {t_saved - t_start:.1f}s."))
+
+    def _department_problem(self, cursor, data, departments):
+        """
+        GAInput restricted to the departments' sections, plus the published genes of
+        every other section, which stay as they are.
+        """
+        cursor.execute("SELECT section_id, dept_id FROM sections")
+        dept_of = {int(r["section_id"]): str(r["dept_id"]) for r in cursor.fetchall()}
+        unknown = set(departments) - set(dept_of.values())
+        if unknown:
+            raise CommandError(f"No sections in department(s): {', '.join(sorted(unknown))}.")
+        target = {sid for sid, dept in dept_of.items() if dept in departments and sid in data.sections}
+
+        carried = []
+        version_id = published_version_id(cursor)
+        if version_id is not None:
+            cursor.execute("""
+                SELECT student_batch_id, subject_id, faculty_id, classroom_id, time_slot_id
+                FROM timetable_timetableentry
+                WHERE version_id = %s
+            """, [version_id])
+            for r in cursor.fetchall():
+                sec, sub = int(r["student_batch_id"]), int(r["subject_id"])
+                if sec not in target and sec in data.sections:
+                    carried.append(Gene(sec, sub, int(r["faculty_id"]), int(r["classroom_id"]),
+                                        int(r["time_slot_id"]), _block(data, sub)))
+
+        busy = {fid: set(slots) for fid, slots in data.faculty_unavailability.items()}
+        load = {}
+        for g in carried:
+            busy.setdefault(g.faculty_id, set()).update(g.occupied_slots())
+            load[g.faculty_id] = load.get(g.faculty_id, 0) + g.block_size
+        problem = replace(
+            data,
+            sections={sid: s for sid, s in data.sections.items() if sid in target},
+            curriculum=[c for c in data.curriculum if c[0] in target],
+            faculty={fid: Faculty(fid, max(0, f.max_load - load.get(fid, 0))) for fid, f in data.faculty.items()},
+            faculty_unavailability=busy,
+        )
+        return problem, carried
+
+    @staticmethod
+    def _reroom(data, genes, carried):
+        """
+        Move new genes off rooms the carried entries occupy: same room type, enough
+        capacity, smallest room first. Returns (moved, still clashing).
+        """
+        used = {}
+        for g in carried:
+            used.setdefault(g.room_id, set()).update(g.occupied_slots())
+        clashing = []
+        for g in genes:
+            slots = g.occupied_slots()
+            if used.get(g.room_id, set()).intersection(slots):
+                clashing.append(g)
+            else:
+                used.setdefault(g.room_id, set()).update(slots)
+        by_size = sorted(data.rooms.values(), key=lambda r: (r.capacity, r.room_id))
+        moved = 0
+        for g in clashing:
+            rtype = data.rooms[g.room_id].rtype if g.room_id in data.rooms else None
+            need = data.sections[g.section_id].student_count
+            slots = g.occupied_slots()
+            room = next((r for r in by_size if r.rtype == rtype and r.capacity >= need
+                         and not used.get(r.room_id, set()).intersection(slots)), None)
+            if room is None:
+                continue
+            g.room_id = room.room_id
+            used.setdefault(room.room_id, set()).update(slots)
+            moved += 1
+        return moved, len(clashing) - moved
+
+    @staticmethod
+    def _bulk_write(conn, version_id, values, batch_size):
+        """
+        bulk_create in batches, each committed on its own (Django autocommit, see
+        write_entries); the version row is updated over the backend connection.
+        """
+        try:
+            for i in range(0, len(values), batch_size):
+                TimetableEntry.objects.bulk_create([
+                    TimetableEntry(subject_id=sub, faculty_id=fac, classroom_id=room, time_slot_id=slot,
+                                   student_batch_id=sec, version_id=version_id)
+                    for sub, fac, room, slot, sec in values[i:i + batch_size]
+                ])
+            mark_ready(conn, version_id, len(values))
+        except Exception:
+            mark_failed(conn, version_id)
+            raise
@@ -0,0 +1,43 @@
+# Unmanaged: the tables belong to the Flask backend (see faculty/models.py).
+# Foreign keys are plain integer columns, as the backend's raw SQL uses them.
+from django.db import models
+
+
+class Subject(models.Model):
+    subject_id = models.AutoField(primary_key=True)
+    subject_code = models.CharField(max_length=32)
+    subject_name = models.CharField(max_length=100)
+    lecture_count = models.IntegerField(null=True)
+    department_id = models.CharField(max_length=16, null=True)
+    type = models.CharField(max_length=16, null=True)
+    contiguous_block_size = models.IntegerField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'timetable_subject'
+
+
+class TimeSlot(models.Model):
+    slot_id = models.AutoField(primary_key=True)
+    day_of_week = models.CharField(max_length=16)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'timetable_timeslot'
+
+
+class TimetableEntry(models.Model):
+    """One scheduled session of a timetable version (lab blocks store their first slot)."""
+    entry_id = models.AutoField(primary_key=True)
+    subject_id = models.IntegerField()
+    faculty_id = models.IntegerField()
+    classroom_id = models.IntegerField()
+    time_slot_id = models.IntegerField()
+    student_batch_id = models.IntegerField()
+    version_id = models.IntegerField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'timetable_timetableentry'